@@ -0,0 +1,190 @@
+"""
+性能测试：多线程并发下单
+多个线程同时调用 RiskEngine.send_order，测试吞吐量，并校验并发下的计数和上限是否精确
+"""
+import time
+from itertools import count
+from threading import Thread, Barrier
+from collections.abc import Callable
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.event import EVENT_ORDER
+from vnpy.trader.object import OrderRequest, OrderData, ContractData
+from vnpy.trader.constant import Exchange, Direction, Offset, OrderType, Product, Status
+
+
+class MockMainEngine:
+    """模拟主引擎（委托发出后推送未成交状态）"""
+
+    def __init__(self, event_engine: EventEngine) -> None:
+        self.event_engine: EventEngine = event_engine
+        self.orderid_count: count = count(1)
+
+        self.contract: ContractData = ContractData(
+            symbol="rb2501",
+            exchange=Exchange.SHFE,
+            name="螺纹钢2501",
+            product=Product.FUTURES,
+            size=10,
+            pricetick=1,
+            gateway_name="CTP"
+        )
+
+    def send_order(self, req: OrderRequest, gateway_name: str) -> str:
+        """发送委托"""
+        order: OrderData = req.create_order_data(str(next(self.orderid_count)), gateway_name)
+        order.status = Status.NOTTRADED
+        self.event_engine.put(Event(EVENT_ORDER, order))
+        return order.vt_orderid
+
+    def write_log(self, msg: str, source: str = "") -> None:
+        """输出日志"""
+        pass
+
+    def get_contract(self, vt_symbol: str) -> ContractData:
+        """查询合约"""
+        return self.contract
+
+    def get_all_positions(self) -> list:
+        """查询持仓"""
+        return []
+
+    def get_all_accounts(self) -> list:
+        """查询资金"""
+        return []
+
+
+def create_engine(rule_names: list[str]) -> tuple:
+    """创建风控引擎，只启用指定规则"""
+    from vnpy_riskmanager.engine import RiskEngine
+
+    event_engine: EventEngine = EventEngine()
+    main_engine: MockMainEngine = MockMainEngine(event_engine)
+    risk_engine: RiskEngine = RiskEngine(main_engine, event_engine)     # type: ignore
+
+    for rule in risk_engine.rules.values():
+        rule.active = rule.name in rule_names
+
+    event_engine.start()
+    return main_engine, event_engine, risk_engine
+
+
+def create_request(price: float, reference: str) -> OrderRequest:
+    """创建委托请求"""
+    return OrderRequest(
+        symbol="rb2501",
+        exchange=Exchange.SHFE,
+        direction=Direction.LONG,
+        type=OrderType.LIMIT,
+        volume=1,
+        price=price,
+        offset=Offset.OPEN,
+        reference=reference
+    )
+
+
+def run_threads(thread_count: int, func: Callable[[int], None]) -> float:
+    """多线程同时执行，返回耗时"""
+    barrier: Barrier = Barrier(thread_count + 1)
+
+    def target(n: int) -> None:
+        barrier.wait()
+        func(n)
+
+    threads: list[Thread] = [Thread(target=target, args=(n,)) for n in range(thread_count)]
+    for thread in threads:
+        thread.start()
+
+    barrier.wait()
+    start_time: float = time.perf_counter()
+
+    for thread in threads:
+        thread.join()
+
+    return time.perf_counter() - start_time
+
+
+def test_throughput(thread_count: int, order_count: int) -> bool:
+    """吞吐量测试：每个线程发出不同价格的委托，全部应通过"""
+    _, event_engine, risk_engine = create_engine(["重复报单检查", "策略上限检查"])
+
+    rule = risk_engine.rules["策略上限检查"]
+    rule.strategy_order_limit = order_count
+    rule.strategy_active_limit = 1_000_000
+
+    requests: list[list[OrderRequest]] = [
+        [create_request(1000 + n * order_count + i, f"strategy_{n}") for i in range(order_count)]
+        for n in range(thread_count)
+    ]
+
+    def send_orders(n: int) -> None:
+        for req in requests[n]:
+            risk_engine.send_order(req, "CTP")
+
+    elapsed_time: float = run_threads(thread_count, send_orders)
+    event_engine.stop()
+
+    total: int = thread_count * order_count
+    duplicate_count: int = len(risk_engine.rules["重复报单检查"].duplicate_order_count)
+    order_total: int = sum(risk_engine.reference_order_count.values())
+
+    passed: bool = (
+        risk_engine.check_count == total
+        and risk_engine.reject_count == 0
+        and duplicate_count == total
+        and order_total == total
+    )
+
+    print(
+        f"{thread_count:>4}线程{total:>10,}笔{elapsed_time / total * 1_000_000_000:>12,.0f} 纳秒/笔"
+        f"{total / elapsed_time:>14,.0f} 笔/秒    计数校验: {'通过' if passed else '失败'}"
+    )
+    return passed
+
+
+def test_contention(thread_count: int, order_count: int, limit: int) -> bool:
+    """竞争测试：所有线程共享同一个策略上限，通过的委托数量应精确等于上限"""
+    _, event_engine, risk_engine = create_engine(["策略上限检查"])
+
+    rule = risk_engine.rules["策略上限检查"]
+    rule.strategy_order_limit = limit
+    rule.strategy_active_limit = 1_000_000
+
+    accepted: list[int] = [0] * thread_count
+
+    def send_orders(n: int) -> None:
+        for i in range(order_count):
+            if risk_engine.send_order(create_request(1000 + i, "shared"), "CTP"):
+                accepted[n] += 1
+
+    run_threads(thread_count, send_orders)
+    event_engine.stop()
+
+    passed: bool = sum(accepted) == limit and risk_engine.reference_order_count["shared"] == limit
+    print(f"{thread_count:>4}线程 共享上限{limit:,}，通过{sum(accepted):,}笔    上限校验: {'通过' if passed else '失败'}")
+    return passed
+
+
+def main() -> None:
+    """主测试流程"""
+    order_count = 20000
+
+    print("=" * 80)
+    print("多线程并发下单性能基准测试")
+    print("=" * 80)
+
+    results: list[bool] = []
+
+    print("\n[吞吐量]")
+    for thread_count in [1, 2, 4, 8]:
+        results.append(test_throughput(thread_count, order_count // thread_count))
+
+    print("\n[竞争]")
+    for thread_count in [2, 4, 8]:
+        results.append(test_contention(thread_count, 5000, 5000))
+
+    print("\n" + ("全部校验通过" if all(results) else "存在校验失败"))
+
+
+if __name__ == "__main__":
+    main()
@@ -29,6 +29,14 @@ class MockRiskEngine:
         """记录日志"""
         self.logs.append(msg)
 
+    def get_shared_counter(self) -> Any:
+        """获取共享计数器"""
+        return None
+
+    def get_time(self) -> float:
+        """获取当前时间戳"""
+        return time.time()
+
     def put_rule_event(self, rule: Any) -> None:
         """推送规则事件"""
         pass
@@ -71,6 +79,16 @@ class MockOrderRequest:
         return self.reference
 
 
+class MockTickData:
+    """模拟行情数据"""
+
+    def __init__(self, symbol: str = "IF2401", last_price: float = 4000.0) -> None:
+        self.vt_symbol: str = symbol
+        self.last_price: float = last_price
+        self.limit_up: float = last_price * 1.1
+        self.limit_down: float = last_price * 0.9
+
+
 def benchmark_rule(
     rule_class: type,
     rule_name: str,
@@ -210,6 +228,8 @@ def main() -> bool:
         from vnpy_riskmanager.rules.order_size_rule_cy import OrderSizeRule as CyOrderSizeRule
         from vnpy_riskmanager.rules.order_validity_rule import OrderValidityRule as PyOrderValidityRule
         from vnpy_riskmanager.rules.order_validity_rule_cy import OrderValidityRule as CyOrderValidityRule
+        from vnpy_riskmanager.rules.price_band_rule import PriceBandRule as PyPriceBandRule
+        from vnpy_riskmanager.rules.price_band_rule_cy import PriceBandRule as CyPriceBandRule
         print("\n[OK] 成功导入所有规则模块 (Python 和 Cython)")
     except ImportError as e:
         print(f"\n[FAIL] 无法导入规则模块: {e}")
@@ -271,6 +291,16 @@ def main() -> bool:
             "setup_fail": lambda rule: None,
             "requests_fail": [MockOrderRequest(price=4000.15)], # Invalid pricetick
         },
+        {
+            "name": "价格偏离检查",
+            "py_class": PyPriceBandRule,
+            "cy_class": CyPriceBandRule,
+            "settings": {"price_band_percent": 2.0},
+            "setup_pass": lambda rule: rule.on_tick(MockTickData()),
+            "requests_pass": [MockOrderRequest(price=4010)],
+            "setup_fail": lambda rule: rule.on_tick(MockTickData()),
+            "requests_fail": [MockOrderRequest(price=4200)],    # Exceeds band
+        },
     ]
 
     print(f"\n测试配置: {iterations:,} 次迭代/场景")
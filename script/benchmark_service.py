@@ -0,0 +1,172 @@
+"""
+性能测试：风控服务模式
+在本机启动风控服务端和客户端，测试单线程检查延迟分位数、多线程流水线吞吐量，
+以及服务断开后的放行/拦截策略
+"""
+import time
+from itertools import count
+from threading import Thread
+from typing import Any
+
+from vnpy.event import EventEngine
+from vnpy.trader.object import OrderRequest, ContractData
+from vnpy.trader.constant import Exchange, Direction, Offset, OrderType, Product
+
+
+CONTRACT: ContractData = ContractData(
+    symbol="rb2501",
+    exchange=Exchange.SHFE,
+    name="螺纹钢2501",
+    product=Product.FUTURES,
+    size=10,
+    pricetick=1,
+    gateway_name="CTP"
+)
+
+
+class MockMainEngine:
+    """模拟主引擎"""
+
+    def __init__(self) -> None:
+        self.orderid_count: count = count(1)
+
+    def send_order(self, req: OrderRequest, gateway_name: str) -> str:
+        """发送委托"""
+        return f"{gateway_name}.{next(self.orderid_count)}"
+
+    def write_log(self, msg: str, source: str = "") -> None:
+        """输出日志"""
+        pass
+
+    def get_contract(self, vt_symbol: str) -> ContractData:
+        """查询合约"""
+        return CONTRACT
+
+    def get_all_contracts(self) -> list[ContractData]:
+        """查询全部合约"""
+        return [CONTRACT]
+
+    def get_all_positions(self) -> list:
+        """查询持仓"""
+        return []
+
+    def get_all_accounts(self) -> list:
+        """查询资金"""
+        return []
+
+
+def create_request(price: float) -> OrderRequest:
+    """创建委托请求"""
+    return OrderRequest(
+        symbol="rb2501",
+        exchange=Exchange.SHFE,
+        direction=Direction.LONG,
+        type=OrderType.LIMIT,
+        volume=1,
+        price=price,
+        offset=Offset.OPEN,
+        reference="benchmark"
+    )
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """计算分位数"""
+    ix: int = min(int(len(values) * percent / 100), len(values) - 1)
+    return values[ix]
+
+
+def main() -> None:
+    """主测试流程"""
+    from vnpy_riskmanager.engine import RiskEngine
+    from vnpy_riskmanager.service import RiskServer, RiskClientEngine
+
+    iterations = 20000
+
+    print("=" * 70)
+    print("风控服务模式性能基准测试")
+    print("=" * 70)
+
+    # 服务端：只启用无状态的委托检查规则，保证全部委托通过
+    server_event_engine = EventEngine()
+    risk_engine = RiskEngine(MockMainEngine(), server_event_engine)     # type: ignore
+    for rule in risk_engine.rules.values():
+        rule.active = rule.name in {"委托规模检查", "委托指令检查"}
+    server_event_engine.start()
+
+    server = RiskServer(risk_engine, port=0, secret="benchmark")
+    server.start()
+
+    # 客户端
+    client_event_engine = EventEngine()
+    client_main_engine: Any = MockMainEngine()
+    client = RiskClientEngine(client_main_engine, client_event_engine)
+    client_event_engine.start()
+
+    client.host, client.port = server.address
+    client.secret = server.secret
+    client.timeout = 1
+    if not client.connected:
+        client.connect()
+
+    # 单线程延迟
+    requests = [create_request(3000 + i % 100) for i in range(iterations)]
+    latencies: list[float] = []
+
+    start_time = time.perf_counter()
+    for req in requests:
+        t = time.perf_counter_ns()
+        client_main_engine.send_order(req, "CTP")
+        latencies.append((time.perf_counter_ns() - t) / 1000)
+    elapsed_time = time.perf_counter() - start_time
+
+    latencies.sort()
+    print("\n[单线程]")
+    print(f"吞吐量: {iterations / elapsed_time:,.0f} 笔/秒")
+    print(
+        f"延迟(微秒): p50={percentile(latencies, 50):.1f}  p90={percentile(latencies, 90):.1f}  "
+        f"p99={percentile(latencies, 99):.1f}  max={latencies[-1]:.1f}"
+    )
+
+    # 多线程流水线
+    print("\n[多线程流水线]")
+    for thread_count in [2, 4, 8]:
+        start_checks = client.check_count
+
+        def send_orders(thread_requests: list[OrderRequest]) -> None:
+            for req in thread_requests:
+                client_main_engine.send_order(req, "CTP")
+
+        thread_requests = requests[:iterations // thread_count]
+        threads = [Thread(target=send_orders, args=(thread_requests,)) for _ in range(thread_count)]
+
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed_time = time.perf_counter() - start_time
+
+        checks = client.check_count - start_checks
+        print(f"{thread_count}线程  {checks:,}笔  吞吐量: {checks / elapsed_time:,.0f} 笔/秒")
+
+    print(
+        f"\n客户端检查{client.check_count:,}次，拦截{client.reject_count:,}次，超时{client.timeout_count:,}次；"
+        f"服务端检查{risk_engine.check_count:,}次"
+    )
+
+    # 断线后的放行/拦截策略
+    server.stop()
+    time.sleep(0.5)
+
+    print("\n[服务断开]")
+    for fail_open in [False, True]:
+        client.fail_open = fail_open
+        vt_orderid = client_main_engine.send_order(requests[0], "CTP")
+        print(f"fail_open={fail_open}: {'放行' if vt_orderid else '拦截'}")
+
+    client_event_engine.stop()
+    server_event_engine.stop()
+
+
+if __name__ == "__main__":
+    main()
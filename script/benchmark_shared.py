@@ -0,0 +1,151 @@
+"""
+性能测试：多进程共享计数器
+多个进程同时对共享内存中的计数进行原子增加，校验汇总结果是否精确，
+并测试启用共享计数器后每日上限检查规则 check_allowed 的延迟
+"""
+import os
+import time
+import multiprocessing
+from typing import Any
+
+from vnpy.trader.constant import Status
+
+
+class MockRiskEngine:
+    """模拟风控引擎"""
+
+    def __init__(self, shared_counter: Any) -> None:
+        self.shared_counter: Any = shared_counter
+
+    def write_log(self, msg: str) -> None:
+        """记录日志"""
+        pass
+
+    def get_shared_counter(self) -> Any:
+        """获取共享计数器"""
+        return self.shared_counter
+
+    def put_rule_event(self, rule: Any) -> None:
+        """推送规则事件"""
+        pass
+
+
+class MockOrderRequest:
+    """模拟委托请求"""
+
+    def __init__(self, vt_symbol: str) -> None:
+        self.vt_symbol: str = vt_symbol
+
+
+class MockOrderData:
+    """模拟委托数据"""
+
+    def __init__(self, vt_orderid: str, vt_symbol: str) -> None:
+        self.vt_orderid: str = vt_orderid
+        self.vt_symbol: str = vt_symbol
+        self.status: Status = Status.NOTTRADED
+
+
+def run_worker(name: str, worker_id: int, iterations: int, barrier: Any, queue: Any) -> None:
+    """子进程：原子增加计数，并测试规则检查延迟"""
+    from vnpy_riskmanager.shared import SharedCounter
+    from vnpy_riskmanager.rules.daily_limit_rule_cy import DailyLimitRule
+
+    counter = SharedCounter(name)
+    rule = DailyLimitRule(MockRiskEngine(counter), {"total_order_limit": 100_000_000})
+
+    orders = [MockOrderData(f"CTP.{worker_id}_{i}", "rb2501.SHFE") for i in range(iterations)]
+    req = MockOrderRequest("rb2501.SHFE")
+
+    barrier.wait()
+
+    # 使用进程CPU时间统计，避免进程数超过CPU核数时计入其他进程的运行时间
+
+    # 并发增加计数（通过规则的委托推送）
+    start_time = time.process_time()
+    for order in orders:
+        rule.on_order(order)
+    add_ns = (time.process_time() - start_time) / iterations * 1_000_000_000
+
+    # 并发读取汇总计数并检查
+    start_time = time.process_time()
+    for _ in range(iterations):
+        rule.check_allowed(req, "CTP")
+    check_ns = (time.process_time() - start_time) / iterations * 1_000_000_000
+
+    counter.close()
+    queue.put((worker_id, add_ns, check_ns))
+
+
+def main() -> None:
+    """主测试流程"""
+    try:
+        from vnpy_riskmanager.shared import SharedCounter
+    except ImportError:
+        print("共享计数器需要编译Cython扩展，请先运行: python setup.py build_ext --inplace")
+        return
+
+    iterations = 50000
+    name = f"vnpy_risk_benchmark_{os.getpid()}"
+
+    print("=" * 70)
+    print("多进程共享计数器性能基准测试")
+    print("=" * 70)
+
+    # 单进程基础操作延迟
+    counter = SharedCounter(name)
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        counter.add("benchmark|key", 1)
+    print(f"\n{'add':<24}{(time.perf_counter() - start_time) / iterations * 1_000_000_000:>10,.0f} 纳秒/次")
+
+    start_time = time.perf_counter()
+    for _ in range(iterations):
+        counter.get("benchmark|key")
+    print(f"{'get':<24}{(time.perf_counter() - start_time) / iterations * 1_000_000_000:>10,.0f} 纳秒/次")
+
+    # 多进程并发
+    context = multiprocessing.get_context("spawn")
+    results: list[bool] = []
+
+    for process_count in [2, 4, 8]:
+        counter.unlink()
+        counter.close()
+        counter = SharedCounter(name)
+
+        barrier = context.Barrier(process_count)
+        queue = context.Queue()
+
+        processes = [
+            context.Process(target=run_worker, args=(name, n, iterations, barrier, queue))
+            for n in range(process_count)
+        ]
+        for process in processes:
+            process.start()
+
+        stats = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        total = counter.get("daily|total_order")
+        passed = total == process_count * iterations
+        results.append(passed)
+
+        add_ns = sum(s[1] for s in stats) / process_count
+        check_ns = sum(s[2] for s in stats) / process_count
+        print(
+            f"\n{process_count}进程  汇总委托笔数{total:,}（预期{process_count * iterations:,}）  "
+            f"计数校验: {'通过' if passed else '失败'}"
+        )
+        print(f"  on_order(发布计数)     {add_ns:>10,.0f} 纳秒/次")
+        print(f"  check_allowed(读取汇总){check_ns:>10,.0f} 纳秒/次")
+
+    counter.unlink()
+    counter.close()
+
+    print("\n" + ("全部校验通过" if all(results) else "存在校验失败"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+性能测试：情景压力测试规则
+对比增量重估与全量重估的耗时，并测试 check_allowed 的延迟（5000个持仓 x 50个情景）
+"""
+import time
+import random
+from typing import Any
+
+import numpy as np
+
+from vnpy.trader.constant import Direction, Offset
+
+
+class MockContract:
+    """模拟合约对象"""
+
+    def __init__(self) -> None:
+        self.size: float = 10.0
+
+
+class MockRiskEngine:
+    """模拟风控引擎"""
+
+    def __init__(self) -> None:
+        self.logs: list[str] = []
+        self.contract = MockContract()
+
+    def write_log(self, msg: str) -> None:
+        """记录日志"""
+        self.logs.append(msg)
+
+    def put_rule_event(self, rule: Any) -> None:
+        """推送规则事件"""
+        pass
+
+    def get_contract(self, vt_symbol: str) -> Any | None:
+        """查询合约"""
+        return self.contract
+
+    def get_all_positions(self) -> list:
+        """查询持仓"""
+        return []
+
+
+class MockTickData:
+    """模拟行情数据"""
+
+    def __init__(self, vt_symbol: str, last_price: float) -> None:
+        self.vt_symbol: str = vt_symbol
+        self.last_price: float = last_price
+        self.limit_up: float = round(last_price * 1.1, 2)
+        self.limit_down: float = round(last_price * 0.9, 2)
+
+
+class MockTradeData:
+    """模拟成交数据"""
+
+    def __init__(self, vt_symbol: str, direction: Direction, price: float, volume: float) -> None:
+        self.vt_symbol: str = vt_symbol
+        self.direction: Direction = direction
+        self.offset: Offset = Offset.OPEN
+        self.price: float = price
+        self.volume: float = volume
+
+
+class MockOrderRequest:
+    """模拟委托请求"""
+
+    def __init__(self, vt_symbol: str, direction: Direction, price: float, volume: float) -> None:
+        self.vt_symbol: str = vt_symbol
+        self.direction: Direction = direction
+        self.price: float = price
+        self.volume: float = volume
+
+    def __str__(self) -> str:
+        return f"MockOrderRequest({self.vt_symbol}, {self.volume}@{self.price})"
+
+
+def measure(name: str, func: Any, iterations: int) -> float:
+    """测试函数耗时，返回每次调用纳秒数"""
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        func(i)
+    elapsed_time = time.perf_counter() - start_time
+
+    time_per_call_ns = (elapsed_time / iterations) * 1_000_000_000
+    print(f"{name:<24}{time_per_call_ns:>14,.0f} 纳秒/次{iterations / elapsed_time:>14,.0f} 次/秒")
+    return time_per_call_ns
+
+
+def main() -> None:
+    """主测试流程"""
+    from vnpy_riskmanager.rules.scenario_stress_rule import ScenarioStressRule
+
+    position_count = 5000
+    iterations = 20000
+
+    print("=" * 60)
+    print("情景压力测试规则性能基准测试")
+    print(f"持仓数量: {position_count:,}  情景数量: {ScenarioStressRule.scenario_count}")
+    print("=" * 60)
+
+    random.seed(0)
+    rule = ScenarioStressRule(MockRiskEngine(), {"active": True, "loss_limit": 1e12})
+
+    symbols = [f"SYM{i}.TEST" for i in range(position_count)]
+    prices = [random.uniform(10, 5000) for _ in symbols]
+
+    # 建立持仓
+    start_time = time.perf_counter()
+    for vt_symbol, price in zip(symbols, prices, strict=True):
+        rule.on_tick(MockTickData(vt_symbol, price))
+        direction = random.choice([Direction.LONG, Direction.SHORT])
+        rule.on_trade(MockTradeData(vt_symbol, direction, price, random.randint(1, 10)))
+    print(f"\n建立{position_count:,}个持仓耗时: {time.perf_counter() - start_time:.3f} 秒")
+    print(f"最差情景亏损: {rule.worst_loss:,.0f}\n")
+
+    trades = [
+        MockTradeData(symbols[i % position_count], Direction.LONG, prices[i % position_count], 1)
+        for i in range(iterations)
+    ]
+    ticks = [
+        MockTickData(symbols[i % position_count], prices[i % position_count] * (1.02 if i % 2 else 0.98))
+        for i in range(iterations)
+    ]
+    requests = [
+        MockOrderRequest(symbols[i % position_count], Direction.LONG, prices[i % position_count], 5)
+        for i in range(iterations)
+    ]
+
+    n = rule.symbol_count
+
+    def full_recompute(i: int) -> None:
+        """全量重估（对照组）"""
+        pnl = (rule.positions[:n] * rule.prices[:n] * rule.sizes[:n])[:, np.newaxis] * rule.shocks[:n]
+        pnl.sum(axis=0).min()
+
+    measure("全量重估(对照组)", full_recompute, 200)
+    measure("成交增量重估", lambda i: rule.on_trade(trades[i]), iterations)
+    measure("行情增量重估", lambda i: rule.on_tick(ticks[i]), iterations)
+    measure("check_allowed(快速路径)", lambda i: rule.check_allowed(requests[i], "CTP"), iterations)
+
+    # 上限贴近当前最差亏损，强制走完整情景评估
+    rule.loss_limit = rule.worst_loss + 1
+    measure("check_allowed(完整评估)", lambda i: rule.check_allowed(requests[i], "CTP"), iterations)
+
+    # 校验增量结果与全量结果一致
+    full_pnl = rule.pnl[:n].sum(axis=0)
+    error = float(np.abs(full_pnl - rule.scenario_pnl).max())
+    print(f"\n增量与全量情景盈亏最大误差: {error:.6f}")
+
+
+if __name__ == "__main__":
+    main()
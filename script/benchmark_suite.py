@@ -0,0 +1,422 @@
+"""
+性能测试：回归基准套件
+覆盖全部规则的每个回调函数、加载全部规则后RiskEngine.send_order的完整路径、
+模拟交易日的事件分发吞吐量以及内存增长，结果输出为JSON，并可与保存的基准结果对比，
+超出容差时以非零状态码退出（用于升级前后的性能回归检查）
+
+用法：
+    python benchmark_suite.py --output baseline.json
+    python benchmark_suite.py --baseline baseline.json --tolerance 0.2
+"""
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tracemalloc
+from datetime import datetime
+from collections.abc import Callable
+from typing import Any
+
+from vnpy.event import Event
+from vnpy.trader.event import EVENT_TICK, EVENT_ORDER, EVENT_TRADE, EVENT_POSITION, EVENT_ACCOUNT, EVENT_TIMER
+from vnpy.trader.object import (
+    OrderRequest,
+    OrderData,
+    TradeData,
+    TickData,
+    PositionData,
+    AccountData,
+    ContractData
+)
+from vnpy.trader.constant import Exchange, Direction, Offset, OrderType, Product, Status
+
+
+SYMBOLS: list[str] = [f"rb25{i:02d}" for i in range(1, 11)]
+
+# 放宽全部上限，保证测试委托全部通过检查（只测量检查本身的开销）
+BENCHMARK_SETTING: dict[str, dict] = {
+    "活动委托检查": {"active_order_limit": 100_000_000},
+    "每日上限检查": {
+        "total_order_limit": 100_000_000,
+        "total_cancel_limit": 100_000_000,
+        "total_trade_limit": 100_000_000,
+        "contract_order_limit": 100_000_000,
+        "contract_cancel_limit": 100_000_000,
+        "contract_trade_limit": 100_000_000
+    },
+    "策略上限检查": {
+        "strategy_order_limit": 100_000_000,
+        "strategy_cancel_limit": 100_000_000,
+        "strategy_trade_limit": 100_000_000,
+        "strategy_active_limit": 100_000_000
+    },
+    "持仓上限检查": {
+        "contract_position_limit": 100_000_000,
+        "contract_exposure_limit": 1e15,
+        "total_exposure_limit": 1e15
+    },
+    "委托规模检查": {"order_volume_limit": 1000, "order_value_limit": 1e12},
+    "重复报单检查": {"duplicate_order_limit": 100_000_000},
+    "报撤成交比检查": {"order_trade_ratio_limit": 1e9, "cancel_order_ratio_limit": 1.0},
+    "资金使用率检查": {"capital_usage_limit": 1.0},
+    "组合VaR检查": {"var_limit": 1e15},
+    "压力测试检查": {"loss_limit": 1e15},
+    "自动熔断检查": {"reject_rate_limit": 0, "loss_limit": 0},
+}
+
+# 规则回调函数
+CALLBACKS: list[str] = ["check_allowed", "on_send_order", "on_send_result", "on_tick", "on_order", "on_trade", "on_position", "on_account", "on_timer"]
+
+
+class SampleData:
+    """测试数据（按迭代次数预先生成，避免计入创建对象的开销）"""
+
+    def __init__(self, count: int) -> None:
+        """构造函数"""
+        random.seed(0)
+
+        self.contracts: list[ContractData] = [
+            ContractData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                name=symbol,
+                product=Product.FUTURES,
+                size=10,
+                pricetick=1,
+                gateway_name="CTP"
+            )
+            for symbol in SYMBOLS
+        ]
+
+        self.account: AccountData = AccountData(
+            accountid="000001",
+            balance=1_000_000_000_000,
+            frozen=0,
+            gateway_name="CTP"
+        )
+
+        self.ticks: list[TickData] = []
+        self.requests: list[OrderRequest] = []
+        self.orders: list[OrderData] = []
+        self.trades: list[TradeData] = []
+        self.positions: list[PositionData] = []
+
+        for i in range(count):
+            symbol: str = SYMBOLS[i % len(SYMBOLS)]
+            price: float = 3000 + random.randint(-20, 20)
+
+            self.ticks.append(TickData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                datetime=datetime.now(),
+                last_price=price,
+                limit_up=price * 1.1,
+                limit_down=price * 0.9,
+                gateway_name="CTP"
+            ))
+
+            # 全部为低于最新价的买单，不会触发自成交和价格偏离检查
+            req: OrderRequest = OrderRequest(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                direction=Direction.LONG,
+                type=OrderType.LIMIT,
+                volume=random.randint(1, 5),
+                price=price - random.randint(1, 10),
+                offset=Offset.OPEN,
+                reference=f"strategy_{i % 5}"
+            )
+            self.requests.append(req)
+
+            order: OrderData = req.create_order_data(str(i + 1), "CTP")
+            order.status = Status.NOTTRADED
+            self.orders.append(order)
+
+            self.trades.append(TradeData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                orderid=order.orderid,
+                tradeid=order.orderid,
+                direction=order.direction,
+                offset=order.offset,
+                price=order.price,
+                volume=order.volume,
+                datetime=datetime.now(),
+                gateway_name="CTP"
+            ))
+
+            self.positions.append(PositionData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                direction=Direction.LONG,
+                volume=i % 100,
+                price=price,
+                gateway_name="CTP"
+            ))
+
+
+def create_engine(data: SampleData) -> Any:
+    """创建加载全部规则的风控引擎（同步事件引擎，不连接共享计数器）"""
+    from vnpy_riskmanager.replay import ReplayEventEngine, ReplayMainEngine, ReplayRiskEngine
+
+    event_engine = ReplayEventEngine()
+    main_engine = ReplayMainEngine(event_engine)
+
+    for contract in data.contracts:
+        main_engine.update_record("contract", contract)
+    main_engine.update_record("account", data.account)
+
+    risk_engine: Any = ReplayRiskEngine(main_engine, event_engine)     # type: ignore
+
+    # 启用全部规则（部分规则默认停用）
+    for rule_name, rule in risk_engine.rules.items():
+        rule.update_setting({"active": True, **BENCHMARK_SETTING.get(rule_name, {})})
+
+    # 推送行情和资金，保证依赖行情的规则处于正常检查状态
+    for tick in data.ticks[:len(SYMBOLS)]:
+        event_engine.put(Event(EVENT_TICK, tick))
+    event_engine.put(Event(EVENT_ACCOUNT, data.account))
+
+    return risk_engine
+
+
+def measure(func: Callable, items: list, repeat: int) -> float:
+    """测量单次调用耗时（纳秒），多轮测试取最小值以降低系统噪声"""
+    best: float = float("inf")
+
+    for _ in range(repeat):
+        start: int = time.perf_counter_ns()
+        for item in items:
+            func(item)
+        best = min(best, (time.perf_counter_ns() - start) / len(items))
+
+    return best
+
+
+def benchmark_rules(data: SampleData, repeat: int) -> dict[str, dict]:
+    """测试每个规则重写的回调函数（同一规则先预占再接收委托推送）"""
+    results: dict[str, dict] = {}
+
+    risk_engine: Any = create_engine(data)
+
+    for rule in risk_engine.rules.values():
+        class_name: str = rule.__class__.__name__
+
+        for method_name in CALLBACKS:
+            if method_name != "check_allowed" and not risk_engine.needs_callback(rule, method_name):
+                continue
+
+            method: Callable = getattr(rule, method_name)
+
+            if method_name == "check_allowed":
+                func: Callable = lambda req, method=method: method(req, "CTP")     # noqa: E731
+                items: list = data.requests
+            elif method_name == "on_send_order":
+                func = lambda item, method=method: method(*item)      # noqa: E731
+                items = [(req, order.vt_orderid) for req, order in zip(data.requests, data.orders, strict=True)]
+            elif method_name == "on_send_result":
+                func = lambda item, method=method: method(*item)      # noqa: E731
+                items = [(req, order.vt_orderid, order.vt_orderid) for req, order in zip(data.requests, data.orders, strict=True)]
+            elif method_name == "on_tick":
+                func, items = method, data.ticks
+            elif method_name == "on_order":
+                func, items = method, data.orders
+            elif method_name == "on_trade":
+                func, items = method, data.trades
+            elif method_name == "on_position":
+                func, items = method, data.positions
+            elif method_name == "on_account":
+                func, items = method, [data.account] * len(data.orders)
+            else:
+                func = lambda _, method=method: method()       # noqa: E731
+                items = data.orders
+
+            results[f"rule.{class_name}.{method_name}"] = {
+                "value": measure(func, items, repeat),
+                "unit": "ns"
+            }
+
+    return results
+
+
+def benchmark_send_order(data: SampleData, repeat: int) -> dict[str, dict]:
+    """测试加载全部规则后send_order的完整路径"""
+    risk_engine: Any = create_engine(data)
+    main_engine: Any = risk_engine.main_engine
+
+    func: Callable = lambda req: main_engine.send_order(req, "CTP")     # noqa: E731
+    value: float = measure(func, data.requests, repeat)
+
+    if risk_engine.reject_count:
+        print(f"[警告] send_order测试中有{risk_engine.reject_count}笔委托被拦截，结果包含拦截日志的开销")
+
+    return {
+        "engine.send_order": {"value": value, "unit": "ns"}
+    }
+
+
+def run_trading_day(risk_engine: Any, data: SampleData) -> int:
+    """按模拟交易日顺序推送行情、发单、委托、成交和持仓，返回事件数量"""
+    event_engine: Any = risk_engine.event_engine
+    send_order: Callable = risk_engine.main_engine.send_order
+    event_count: int = 0
+
+    for i, (tick, req, order, trade, position) in enumerate(zip(
+        data.ticks, data.requests, data.orders, data.trades, data.positions, strict=True
+    )):
+        event_engine.put(Event(EVENT_TICK, tick))
+        send_order(req, "CTP")
+
+        order.status = Status.NOTTRADED
+        event_engine.put(Event(EVENT_ORDER, order))
+        event_count += 2
+
+        # 约三成委托成交，其余撤单
+        if i % 10 < 3:
+            order.status = Status.ALLTRADED
+            event_engine.put(Event(EVENT_TRADE, trade))
+            event_engine.put(Event(EVENT_ORDER, order))
+            event_engine.put(Event(EVENT_POSITION, position))
+            event_count += 3
+        else:
+            order.status = Status.CANCELLED
+            event_engine.put(Event(EVENT_ORDER, order))
+            event_count += 1
+
+        if not i % 100:
+            event_engine.put(Event(EVENT_ACCOUNT, data.account))
+            event_engine.put(Event(EVENT_TIMER))
+            event_count += 2
+
+    return event_count
+
+
+def benchmark_trading_day(data: SampleData) -> dict[str, dict]:
+    """测试模拟交易日的事件分发吞吐量"""
+    risk_engine: Any = create_engine(data)
+
+    start: float = time.perf_counter()
+    event_count: int = run_trading_day(risk_engine, data)
+    elapsed: float = time.perf_counter() - start
+
+    return {
+        "day.event_throughput": {"value": event_count / elapsed, "unit": "events/s", "higher_is_better": True},
+        "day.order_cost": {"value": elapsed / len(data.orders) * 1_000_000_000, "unit": "ns"}
+    }
+
+
+def benchmark_memory(data: SampleData) -> dict[str, dict]:
+    """测试模拟交易日的内存增长（规则和引擎状态随委托数量的增长）"""
+    risk_engine: Any = create_engine(data)
+
+    tracemalloc.start()
+    start_size, _ = tracemalloc.get_traced_memory()
+
+    run_trading_day(risk_engine, data)
+
+    end_size, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    order_count: int = len(data.orders)
+    return {
+        "memory.growth_per_order": {"value": (end_size - start_size) / order_count, "unit": "bytes"},
+        "memory.peak_per_order": {"value": (peak_size - start_size) / order_count, "unit": "bytes"}
+    }
+
+
+def compare_baseline(results: dict[str, dict], baseline: dict[str, dict], tolerance: float) -> list[str]:
+    """与基准结果对比，返回超出容差的测试项"""
+    regressions: list[str] = []
+
+    print(f"\n{'测试项':<48}{'基准':>14}{'当前':>14}{'变化':>10}")
+    print("-" * 86)
+
+    for name, result in results.items():
+        base: dict | None = baseline.get(name, None)
+        if not base or not base["value"]:
+            print(f"{name:<48}{'-':>14}{result['value']:>14,.1f}{'新增' if baseline else '':>10}")
+            continue
+
+        change: float = result["value"] / base["value"] - 1
+        if result.get("higher_is_better", False):
+            change = base["value"] / result["value"] - 1 if result["value"] else float("inf")
+
+        flag: str = ""
+        if change > tolerance:
+            flag = "  <-- 回归"
+            regressions.append(name)
+
+        print(f"{name:<48}{base['value']:>14,.1f}{result['value']:>14,.1f}{change:>+10.1%}{flag}")
+
+    for name in baseline:
+        if name not in results:
+            print(f"{name:<48}{baseline[name]['value']:>14,.1f}{'-':>14}{'缺失':>10}")
+
+    return regressions
+
+
+def main() -> int:
+    """主测试流程"""
+    parser = argparse.ArgumentParser(description="风控模块性能回归基准套件")
+    parser.add_argument("--iterations", type=int, default=20000, help="每项测试的调用次数")
+    parser.add_argument("--repeat", type=int, default=3, help="每项测试的重复轮数（取最小值）")
+    parser.add_argument("--output", help="输出测试结果的JSON文件（可作为后续对比的基准）")
+    parser.add_argument("--baseline", help="对比的基准结果JSON文件")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="允许的性能下降比例")
+    args = parser.parse_args()
+
+    print("=" * 86)
+    print("vnpy_riskmanager 性能回归基准套件")
+    print("=" * 86)
+
+    data: SampleData = SampleData(args.iterations)
+
+    results: dict[str, dict] = {}
+    results.update(benchmark_rules(data, args.repeat))
+    results.update(benchmark_send_order(data, args.repeat))
+    results.update(benchmark_trading_day(SampleData(args.iterations)))
+    results.update(benchmark_memory(SampleData(args.iterations)))
+
+    # 记录规则实现模块（区分Python和Cython版本）
+    risk_engine: Any = create_engine(SampleData(0))
+    modules: dict[str, str] = {
+        rule.__class__.__name__: rule.__class__.__module__
+        for rule in risk_engine.rules.values()
+    }
+
+    output: dict[str, Any] = {
+        "meta": {
+            "datetime": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "iterations": args.iterations,
+            "rule_modules": modules
+        },
+        "results": results
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, indent=4)
+        print(f"测试结果已保存：{args.output}")
+
+    baseline: dict[str, dict] = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    regressions: list[str] = compare_baseline(results, baseline, args.tolerance)
+
+    if regressions:
+        print(f"\n{len(regressions)}项测试超出容差{args.tolerance:.0%}：{', '.join(regressions)}")
+        return 1
+
+    if baseline:
+        print(f"\n全部测试项均在容差{args.tolerance:.0%}以内")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+风控审计日志查看工具
+读取RiskJournal写入的交易日文件，输出检查数量、拦截统计、按规则和委托来源的拦截分布以及检查耗时分位数。
+
+用法：
+    python read_journal.py 20250102.rjnl
+    python read_journal.py 20250102.rjnl --csv journal.csv
+"""
+import argparse
+
+import numpy as np
+
+
+def main() -> None:
+    """主流程"""
+    from vnpy_riskmanager.journal import load_journal_df, REASON_HALT
+
+    parser = argparse.ArgumentParser(description="风控审计日志查看工具")
+    parser.add_argument("filepath", help="审计日志文件路径")
+    parser.add_argument("--csv", help="导出为CSV文件")
+    args = parser.parse_args()
+
+    df = load_journal_df(args.filepath)
+    rejected = df[~df["allowed"]]
+
+    print("=" * 70)
+    print(f"时间范围: {df['datetime'].min()} ~ {df['datetime'].max()}")
+    print(
+        f"检查: {len(df):,}    拦截: {len(rejected):,}    "
+        f"暂停交易拦截: {(df['reason'] == REASON_HALT).sum():,}"
+    )
+
+    latency: np.ndarray = df.loc[df["reason"] != REASON_HALT, "latency"].to_numpy() / 1000
+    if len(latency):
+        p50, p90, p99 = np.percentile(latency, [50, 90, 99])
+        print(f"检查耗时(微秒): p50={p50:.1f}  p90={p90:.1f}  p99={p99:.1f}  max={latency.max():.1f}")
+
+    if len(rejected):
+        print("\n按规则拦截:")
+        for rule, count in rejected["rule"].value_counts().items():
+            print(f"  {count:>8,}  {rule or '全局暂停交易'}")
+
+        print("\n按委托来源拦截:")
+        for reference, count in rejected["reference"].value_counts().head(10).items():
+            print(f"  {count:>8,}  {reference}")
+
+    if args.csv:
+        df.to_csv(args.csv, index=False, encoding="utf-8-sig")
+        print(f"\n已导出：{args.csv}")
+
+
+if __name__ == "__main__":
+    main()
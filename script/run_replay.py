@@ -0,0 +1,180 @@
+"""
+风控离线回放工具
+将RiskRecorder记录的JSONL文件输入真实的风控引擎，输出吞吐量、检查延迟分位数、
+拦截决策和规则最终状态。可通过参数覆盖规则配置，验证参数调整的效果。
+
+用法：
+    python run_replay.py session.jsonl
+    python run_replay.py session.jsonl --setting new_setting.json --output report.json
+    python run_replay.py sample.jsonl --generate 100000
+"""
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+from typing import Any
+
+from vnpy.trader.object import OrderRequest, OrderData, TradeData, TickData, ContractData, AccountData
+from vnpy.trader.constant import Exchange, Direction, Offset, OrderType, Product, Status
+
+
+def generate_records(filepath: str, request_count: int) -> None:
+    """生成模拟交易日记录（用于容量测试）"""
+    from vnpy_riskmanager.replay import to_dict
+
+    random.seed(0)
+
+    symbols: list[str] = [f"rb25{i:02d}" for i in range(1, 13)]
+    prices: dict[str, float] = {symbol: 3000 + i * 10 for i, symbol in enumerate(symbols)}
+    dt: datetime = datetime(2025, 1, 2, 9, 0, 0)
+
+    with open(filepath, "w", encoding="utf-8") as f:
+        def write(record_type: str, data: Any, **extra: Any) -> None:
+            record: dict = {"type": record_type, "time": dt.isoformat(), "data": to_dict(data)}
+            record.update(extra)
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+        for symbol in symbols:
+            contract = ContractData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                name=symbol,
+                product=Product.FUTURES,
+                size=10,
+                pricetick=1,
+                gateway_name="CTP"
+            )
+            write("contract", contract)
+
+        write("account", AccountData(accountid="000001", balance=10_000_000, frozen=0, gateway_name="CTP"))
+
+        for i in range(request_count):
+            dt += timedelta(milliseconds=random.randint(10, 500))
+
+            symbol = random.choice(symbols)
+            prices[symbol] += random.choice([-1, 0, 1])
+            price: float = prices[symbol]
+
+            tick = TickData(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                datetime=dt,
+                last_price=price,
+                limit_up=round(price * 1.1),
+                limit_down=round(price * 0.9),
+                gateway_name="CTP"
+            )
+            write("tick", tick)
+
+            direction: Direction = random.choice([Direction.LONG, Direction.SHORT])
+            req = OrderRequest(
+                symbol=symbol,
+                exchange=Exchange.SHFE,
+                direction=direction,
+                type=OrderType.LIMIT,
+                volume=random.randint(1, 5),
+                price=price - 2 if direction == Direction.LONG else price + 2,
+                offset=random.choice([Offset.OPEN, Offset.CLOSE]),
+                reference=f"strategy_{i % 5}"
+            )
+            orderid: str = str(i + 1)
+            write("request", req, gateway_name="CTP", vt_orderid=f"CTP.{orderid}")
+
+            order: OrderData = req.create_order_data(orderid, "CTP")
+            order.status = Status.NOTTRADED
+            write("order", order)
+
+            # 部分委托成交，部分委托撤单
+            if random.random() < 0.3:
+                order.traded = order.volume
+                order.status = Status.ALLTRADED
+                trade = TradeData(
+                    symbol=symbol,
+                    exchange=Exchange.SHFE,
+                    orderid=orderid,
+                    tradeid=orderid,
+                    direction=order.direction,
+                    offset=order.offset,
+                    price=order.price,
+                    volume=order.volume,
+                    datetime=dt,
+                    gateway_name="CTP"
+                )
+                write("trade", trade)
+                write("order", order)
+            else:
+                order.status = Status.CANCELLED
+                write("order", order)
+
+
+def format_value(value: Any) -> str:
+    """格式化规则变量（字典类型只显示汇总）"""
+    if isinstance(value, dict):
+        return f"{len(value)}项，合计{sum(v for v in value.values() if isinstance(v, int | float)):,}"
+    elif isinstance(value, float):
+        return f"{value:,.4f}"
+    return str(value)
+
+
+def main() -> None:
+    """主流程"""
+    from vnpy_riskmanager.replay import RiskReplayer
+
+    parser = argparse.ArgumentParser(description="风控离线回放工具")
+    parser.add_argument("filepath", help="记录文件路径（JSONL）")
+    parser.add_argument("--setting", help="覆盖规则配置的JSON文件，格式与risk_manager_setting.json相同")
+    parser.add_argument("--output", help="输出回放结果的JSON文件")
+    parser.add_argument("--generate", type=int, default=0, help="先生成指定委托数量的模拟记录文件")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_records(args.filepath, args.generate)
+        print(f"生成模拟记录文件：{args.filepath}")
+
+    rule_settings: dict = {}
+    if args.setting:
+        with open(args.setting, encoding="utf-8") as f:
+            rule_settings = json.load(f)
+
+    replayer = RiskReplayer(rule_settings)
+    record_count: int = replayer.load(args.filepath)
+    print(f"加载记录{record_count:,}条")
+
+    result: dict = replayer.run()
+
+    print("=" * 70)
+    print(
+        f"回放耗时: {result['elapsed_time']:.3f} 秒    模拟时长: {result['simulated_time']:,.0f} 秒    "
+        f"吞吐量: {result['record_throughput']:,.0f} 条/秒"
+    )
+    print(
+        f"委托请求: {result['request_count']:,}    拦截: {result['reject_count']:,}    "
+        f"与记录不一致: {result['changed_count']:,}"
+    )
+
+    latency: dict = result["latency_us"]
+    print(
+        f"检查延迟(微秒): p50={latency['p50']:.1f}  p90={latency['p90']:.1f}  "
+        f"p99={latency['p99']:.1f}  max={latency['max']:.1f}"
+    )
+
+    if result["reject_reasons"]:
+        print("\n拦截原因:")
+        for reason, count in list(result["reject_reasons"].items())[:10]:
+            print(f"  {count:>8,}  {reason}")
+
+    print("\n规则最终状态:")
+    for rule_name, variables in result["variables"].items():
+        if not variables:
+            continue
+        text: str = "  ".join(f"{name}={format_value(value)}" for name, value in variables.items())
+        print(f"  [{rule_name}] {text}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=4, default=str)
+        print(f"\n回放结果已保存：{args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,6 +14,7 @@ from vnpy_riskmanager.rules.daily_limit_rule import DailyLimitRule as PyDailyLim
 from vnpy_riskmanager.rules.duplicate_order_rule import DuplicateOrderRule as PyDuplicateOrderRule
 from vnpy_riskmanager.rules.order_size_rule import OrderSizeRule as PyOrderSizeRule
 from vnpy_riskmanager.rules.order_validity_rule import OrderValidityRule as PyOrderValidityRule
+from vnpy_riskmanager.rules.price_band_rule import PriceBandRule as PyPriceBandRule
 
 # 导入Cython规则
 try:
@@ -22,6 +23,7 @@ try:
     from vnpy_riskmanager.rules.duplicate_order_rule_cy import DuplicateOrderRule as CyDuplicateOrderRule
     from vnpy_riskmanager.rules.order_size_rule_cy import OrderSizeRule as CyOrderSizeRule
     from vnpy_riskmanager.rules.order_validity_rule_cy import OrderValidityRule as CyOrderValidityRule
+    from vnpy_riskmanager.rules.price_band_rule_cy import PriceBandRule as CyPriceBandRule
 except ImportError:
     print("未找到Cython规则，请先编译")
     exit()
@@ -51,6 +53,12 @@ class MockRiskEngine:
     def write_log(self, msg: str) -> None:
         pass
 
+    def get_shared_counter(self) -> Any:
+        return None
+
+    def get_time(self) -> float:
+        return 0
+
     def put_rule_event(self, rule: Any) -> None:
         pass
 
@@ -103,6 +111,22 @@ class MockTradeData:
         self.vt_symbol = vt_symbol
 
 
+class MockTickData:
+    """模拟行情数据"""
+
+    def __init__(
+        self,
+        vt_symbol: str,
+        last_price: float,
+        limit_up: float = 0,
+        limit_down: float = 0
+    ):
+        self.vt_symbol = vt_symbol
+        self.last_price = last_price
+        self.limit_up = limit_up
+        self.limit_down = limit_down
+
+
 class BaseRuleConsistencyTest(unittest.TestCase):
     """规则一致性测试的基类"""
     py_rule_class: type | None = None
@@ -155,6 +179,46 @@ class TestActiveOrderRuleConsistency(BaseRuleConsistencyTest):
         self.cy_rule.on_order(order2)
         self.assert_state_equal("委托变为非活动后状态应相同")
 
+    def test_on_send_order(self) -> None:
+        """测试发单预占和推送核对的一致性"""
+        req = MockOrderRequest("IF2401", 1, 4000)
+        self.py_rule.on_send_order(req, "order1")
+        self.cy_rule.on_send_order(req, "order1")
+        self.assert_state_equal("发单预占后状态应相同")
+        self.assertEqual(self.cy_rule.active_order_count, 1)
+
+        order1 = MockOrderData("order1", "IF2401", Status.NOTTRADED)
+        self.py_rule.on_order(order1)
+        self.cy_rule.on_order(order1)
+        self.assert_state_equal("预占转为活动委托后状态应相同")
+        self.assertEqual(self.cy_rule.active_order_count, 1)
+
+        # 发单后直接被拒单，释放预占
+        self.py_rule.on_send_order(req, "order2")
+        self.cy_rule.on_send_order(req, "order2")
+        order2 = MockOrderData("order2", "IF2401", Status.REJECTED)
+        self.py_rule.on_order(order2)
+        self.cy_rule.on_order(order2)
+        self.assert_state_equal("拒单释放预占后状态应相同")
+        self.assertEqual(self.cy_rule.active_order_count, 1)
+
+    def test_on_send_result(self) -> None:
+        """测试预占转到委托号和发单失败释放预占的一致性"""
+        req = MockOrderRequest("IF2401", 1, 4000)
+        for rule in [self.py_rule, self.cy_rule]:
+            rule.on_send_order(req, "reserve.1")
+            rule.on_send_order(req, "reserve.2")
+            rule.on_send_result(req, "reserve.1", "order1")
+            rule.on_send_result(req, "reserve.2", "")
+        self.assert_state_equal("发单返回后状态应相同")
+        self.assertEqual(self.cy_rule.active_order_count, 1)
+
+        order1 = MockOrderData("order1", "IF2401", Status.NOTTRADED)
+        self.py_rule.on_order(order1)
+        self.cy_rule.on_order(order1)
+        self.assert_state_equal("预占转为活动委托后状态应相同")
+        self.assertEqual(self.cy_rule.active_order_count, 1)
+
     def test_check_allowed(self) -> None:
         """测试check_allowed的一致性"""
         req = MockOrderRequest("IF2401", 1, 4000)
@@ -197,6 +261,37 @@ class TestDailyLimitRuleConsistency(BaseRuleConsistencyTest):
         self.cy_rule.on_trade(trade1)
         self.assert_state_equal("成交后状态应相同")
 
+    def test_on_send_order(self) -> None:
+        """测试发单计数和推送不重复计数的一致性"""
+        req = MockOrderRequest("IF2401", 1, 4000)
+        self.py_rule.on_send_order(req, "order1")
+        self.cy_rule.on_send_order(req, "order1")
+        self.assert_state_equal("发单计数后状态应相同")
+
+        order1 = MockOrderData("order1", "IF2401", Status.CANCELLED)
+        self.py_rule.on_order(order1)
+        self.cy_rule.on_order(order1)
+        self.assert_state_equal("收到推送后状态应相同")
+        self.assertEqual(self.cy_rule.total_order_count, 1)
+        self.assertEqual(self.cy_rule.total_cancel_count, 1)
+
+    def test_on_send_result(self) -> None:
+        """测试预占转到委托号和发单失败撤销计数的一致性"""
+        req = MockOrderRequest("IF2401", 1, 4000)
+        for rule in [self.py_rule, self.cy_rule]:
+            rule.on_send_order(req, "reserve.1")
+            rule.on_send_order(req, "reserve.2")
+            rule.on_send_result(req, "reserve.1", "order1")
+            rule.on_send_result(req, "reserve.2", "")
+        self.assert_state_equal("发单返回后状态应相同")
+        self.assertEqual(self.cy_rule.total_order_count, 1)
+
+        order1 = MockOrderData("order1", "IF2401", Status.NOTTRADED)
+        self.py_rule.on_order(order1)
+        self.cy_rule.on_order(order1)
+        self.assert_state_equal("收到推送后状态应相同")
+        self.assertEqual(self.cy_rule.total_order_count, 1)
+
 
 class TestDuplicateOrderRuleConsistency(BaseRuleConsistencyTest):
     py_rule_class = PyDuplicateOrderRule
@@ -245,6 +340,21 @@ class TestOrderSizeRuleConsistency(BaseRuleConsistencyTest):
             self.cy_rule.check_allowed(req3, "CTP")
         )
 
+    def test_compile_check(self) -> None:
+        """测试合约专用检查函数与check_allowed的一致性"""
+        py_check = self.py_rule.compile_check("IF2401")
+        cy_check = self.cy_rule.compile_check("IF2401")
+
+        for volume, price in [(10, 4000), (1000, 4000), (10, 500000)]:
+            req = MockOrderRequest("IF2401", volume, price)
+            result = self.py_rule.check_allowed(req, "CTP")
+            self.assertEqual(py_check(req, "CTP"), result)
+            self.assertEqual(cy_check(req, "CTP"), result)
+
+        # 合约不存在时不编译
+        self.assertIsNone(self.py_rule.compile_check("FAIL2401"))
+        self.assertIsNone(self.cy_rule.compile_check("FAIL2401"))
+
 
 class TestOrderValidityRuleConsistency(BaseRuleConsistencyTest):
     py_rule_class = PyOrderValidityRule
@@ -287,6 +397,57 @@ class TestOrderValidityRuleConsistency(BaseRuleConsistencyTest):
             self.cy_rule.check_allowed(req5, "CTP")
         )
 
+    def test_compile_check(self) -> None:
+        """测试合约专用检查函数与check_allowed的一致性"""
+        py_check = self.py_rule.compile_check("IF2401")
+        cy_check = self.cy_rule.compile_check("IF2401")
+
+        for volume, price in [(10, 4000.1), (10, 4000.15), (0.5, 4000.1), (200, 4000.1)]:
+            req = MockOrderRequest("IF2401", volume, price)
+            result = self.py_rule.check_allowed(req, "CTP")
+            self.assertEqual(py_check(req, "CTP"), result)
+            self.assertEqual(cy_check(req, "CTP"), result)
+
+        # 合约不存在时不编译
+        self.assertIsNone(self.py_rule.compile_check("FAIL2401"))
+        self.assertIsNone(self.cy_rule.compile_check("FAIL2401"))
+
+
+class TestPriceBandRuleConsistency(BaseRuleConsistencyTest):
+    py_rule_class = PyPriceBandRule
+    cy_rule_class = CyPriceBandRule
+
+    def test_check_allowed(self) -> None:
+        """测试check_allowed的一致性"""
+        # 无行情缓存
+        req1 = MockOrderRequest("IF2401", 1, 4000)
+        self.assertEqual(
+            self.py_rule.check_allowed(req1, "CTP"),
+            self.cy_rule.check_allowed(req1, "CTP")
+        )
+
+        tick = MockTickData("IF2401", 4000, 4400, 3600)
+        self.py_rule.on_tick(tick)
+        self.cy_rule.on_tick(tick)
+        self.assert_state_equal("收到行情后状态应相同")
+
+        # 合法价格、比例偏离、涨跌停价
+        for price in [4100, 4300, 4500, 3500]:
+            req = MockOrderRequest("IF2401", 1, price)
+            self.assertEqual(
+                self.py_rule.check_allowed(req, "CTP"),
+                self.cy_rule.check_allowed(req, "CTP")
+            )
+
+        # 跳数偏离
+        self.py_rule.price_band_ticks = 10
+        self.cy_rule.price_band_ticks = 10
+        req2 = MockOrderRequest("IF2401", 1, 4002)
+        self.assertEqual(
+            self.py_rule.check_allowed(req2, "CTP"),
+            self.cy_rule.check_allowed(req2, "CTP")
+        )
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -20,6 +20,10 @@ extensions = [
         "vnpy_riskmanager.template",
         [os.path.join("vnpy_riskmanager", "template.pyx")],
     ),
+    Extension(
+        "vnpy_riskmanager.shared",
+        [os.path.join("vnpy_riskmanager", "shared.pyx")],
+    ),
     Extension(
         "vnpy_riskmanager.rules.active_order_rule_cy",
         [os.path.join("vnpy_riskmanager", "rules", "active_order_rule_cy.pyx")],
@@ -39,6 +43,10 @@ extensions = [
     Extension(
         "vnpy_riskmanager.rules.order_validity_rule_cy",
         [os.path.join("vnpy_riskmanager", "rules", "order_validity_rule_cy.pyx")],
+    ),
+    Extension(
+        "vnpy_riskmanager.rules.price_band_rule_cy",
+        [os.path.join("vnpy_riskmanager", "rules", "price_band_rule_cy.pyx")],
     )
 ]
 
@@ -25,10 +25,16 @@ from pathlib import Path
 from vnpy.trader.app import BaseApp
 
 from .engine import RiskEngine, APP_NAME
+from .service import RiskServer, RiskClientEngine
+from .replay import RiskRecorder, RiskReplayer
 
 
 __all__ = [
     "RiskEngine",
+    "RiskServer",
+    "RiskClientEngine",
+    "RiskRecorder",
+    "RiskReplayer",
     "APP_NAME",
     "RiskManagerApp",
 ]
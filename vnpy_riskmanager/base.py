@@ -5,3 +5,11 @@ APP_NAME = "RiskManager"
 EVENT_RISK_RULE = "eRiskRule"
 
 EVENT_RISK_NOTIFY = "eRiskNotify"
+
+EVENT_RISK_HALT = "eRiskHalt"
+
+EVENT_RISK_ALERT = "eRiskAlert"
+
+EVENT_RISK_DEMOTE = "eRiskDemote"
+
+EVENT_RISK_CANCEL = "eRiskCancel"
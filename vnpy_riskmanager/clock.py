@@ -0,0 +1,40 @@
+from time import time
+from datetime import datetime
+
+
+class Clock:
+    """系统时钟（实盘使用，读取本机时间）"""
+
+    def get_time(self) -> float:
+        """获取当前时间戳（秒）"""
+        return time()
+
+    def get_datetime(self) -> datetime:
+        """获取当前时间"""
+        return datetime.now()
+
+
+class SimulatedClock(Clock):
+    """
+    模拟时钟
+
+    时间只在调用set_time时前进（由回放数据的时间戳驱动），
+    配合RiskEngine.advance_clock使用，可以快进执行全天的风控逻辑。
+    """
+
+    def __init__(self, timestamp: float = 0) -> None:
+        """构造函数"""
+        self.timestamp: float = timestamp
+
+    def set_time(self, timestamp: float) -> None:
+        """设置当前时间戳（时间不会倒退）"""
+        if timestamp > self.timestamp:
+            self.timestamp = timestamp
+
+    def get_time(self) -> float:
+        """获取当前时间戳（秒）"""
+        return self.timestamp
+
+    def get_datetime(self) -> datetime:
+        """获取当前时间"""
+        return datetime.fromtimestamp(self.timestamp)
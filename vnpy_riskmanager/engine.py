@@ -1,6 +1,11 @@
+import copy
 import importlib
 import traceback
+from threading import RLock
+from time import perf_counter_ns
+from collections import defaultdict, OrderedDict
 from collections.abc import Callable
+from datetime import date, datetime
 from typing import Any
 from pathlib import Path
 from glob import glob
@@ -16,29 +21,56 @@ from vnpy.trader.event import (
     EVENT_TICK,
     EVENT_ORDER,
     EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT,
     EVENT_TIMER,
     EVENT_LOG
 )
 from vnpy.trader.object import (
     OrderRequest,
+    CancelRequest,
     TickData,
     OrderData,
     TradeData,
+    PositionData,
+    AccountData,
     ContractData,
     LogData
 )
+from vnpy.trader.constant import Status
 from vnpy.trader.engine import BaseEngine, MainEngine
-from vnpy.trader.utility import load_json, save_json
+from vnpy.trader.utility import load_json, save_json, get_folder_path
 from vnpy.trader.logger import ERROR
 
 from .template import RuleTemplate
-from .base import APP_NAME, EVENT_RISK_RULE, EVENT_RISK_NOTIFY
+from .portfolio import PortfolioRuleTemplate
+from .clock import Clock, SimulatedClock
+from .utility import SettingWriter, get_trading_day
+from .journal import RiskJournal, REASON_PASS, REASON_RULE, REASON_HALT
+from .metrics import RiskMetrics
+from .shadow import ShadowRunner
+from .watchdog import LatencyWatchdog, POLICY_DISABLE, POLICY_SHADOW, POLICY_NAMES
+from .base import (
+    APP_NAME,
+    EVENT_RISK_RULE,
+    EVENT_RISK_NOTIFY,
+    EVENT_RISK_HALT,
+    EVENT_RISK_ALERT,
+    EVENT_RISK_DEMOTE,
+    EVENT_RISK_CANCEL
+)
+
+
+# 发单期间使用的临时预占编号前缀（调用网关返回委托号后替换）
+RESERVE_PREFIX: str = "reserve."
 
 
 class RiskEngine(BaseEngine):
     """风控引擎"""
 
     setting_filename: str = "risk_manager_setting.json"
+    engine_setting_filename: str = "risk_engine_setting.json"
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
         """构造函数"""
@@ -50,22 +82,187 @@ class RiskEngine(BaseEngine):
         # 风控规则实例（遍历执行检查）
         self.rules: dict[str, RuleTemplate] = {}
 
-        # 风控规则配置（从文件加载）
+        # 风控规则配置（从文件加载，修改后由后台线程合并保存）
         self.setting: dict = load_json(self.setting_filename)
+        self.setting_writer: SettingWriter = SettingWriter(on_error=self.write_error)
 
         # 风控规则字段名称映射（用于UI显示）
         self.field_name_map: dict = {}
 
+        # 风控引擎配置（从文件加载）
+        self.engine_setting: dict = {
+            "shared_state": False,
+            "shared_name": "vnpy_risk",
+            "check_cache_size": 10000,
+            "journal": False,
+            "metrics_host": "127.0.0.1",
+            "metrics_port": 0,
+            "metrics_interval": 5,
+            "shadow_rules": {},
+            "latency_budget": 0,
+            "latency_breach_limit": 5,
+            "latency_breach_window": 60,
+            "latency_policy": "disable"
+        }
+        self.load_engine_setting()
+
         # 缓存：记录哪些规则需要哪些回调
+        self.send_rules: list[RuleTemplate] = []
         self.tick_rules: list[RuleTemplate] = []
         self.order_rules: list[RuleTemplate] = []
         self.trade_rules: list[RuleTemplate] = []
+        self.position_rules: list[RuleTemplate] = []
+        self.account_rules: list[RuleTemplate] = []
         self.timer_rules: list[RuleTemplate] = []
 
+        # 合约检查计划：vt_symbol -> 按顺序执行的(规则名称, 检查函数)（只包含启用的规则）
+        self.check_plans: dict[str, list[tuple[str, Callable[[OrderRequest, str], bool]]]] = {}
+
+        # 纯函数规则的检查结果缓存（LRU）：key为(vt_symbol, 委托类型, 价格, 数量)，只缓存检查通过的结果
+        self.check_cache: OrderedDict[tuple, None] = OrderedDict()
+        self.check_cache_size: int = self.engine_setting["check_cache_size"]
+        self.cache_hit_count: int = 0
+        self.cache_miss_count: int = 0
+
+        # 策略索引：通过委托号将委托、成交归属到委托来源（OrderRequest.reference）
+        self.orderid_reference_map: dict[str, str] = {}
+        self.cancel_orderids: set[str] = set()
+        self.tradeids: set[str] = set()
+
+        self.reference_order_count: dict[str, int] = defaultdict(int)
+        self.reference_cancel_count: dict[str, int] = defaultdict(int)
+        self.reference_trade_count: dict[str, int] = defaultdict(int)
+        self.reference_active_orderids: dict[str, set[str]] = defaultdict(set)
+
+        # 全局暂停交易状态（暂停后直接拦截所有委托，不再执行规则检查）
+        self.halted: bool = False
+        self.halt_reason: str = ""
+
+        # 检查统计
+        self.check_count: int = 0
+        self.reject_count: int = 0
+
+        # 最近一次拦截委托的规则名称
+        self.reject_rule: str = ""
+
+        # 引擎锁：下单检查（调用方线程）和事件回调（事件线程）互斥执行，
+        # 保证规则状态的“检查-预占”原子性（可重入，允许规则回调中再次调用引擎函数），调用网关发单时不持有
+        self.lock: RLock = RLock()
+
+        # 发单期间使用的临时预占编号计数
+        self.reserve_count: int = 0
+
+        # 引擎时钟：规则通过引擎获取时间，回放时替换为模拟时钟
+        self.clock: Clock = Clock()
+        self.timer_second: int = 0
+
+        # 当前交易日（切换交易日时清理已结束委托的索引和去重记录）
+        self.trading_day: date = get_trading_day(self.clock.get_datetime())
+
+        # 风控决策审计日志（启用时创建，后台线程写入）
+        self.journal: RiskJournal | None = None
+        self.init_journal()
+
+        # 多进程共享计数器（启用共享内存时创建）
+        self.shared_counter: Any = None
+        self.init_shared_counter()
+
+        # 指标导出（配置端口时创建）
+        self.metrics: RiskMetrics | None = None
+
+        # 影子规则运行器（添加影子规则时创建）
+        self.shadow: ShadowRunner | None = None
+
+        # 规则检查耗时看门狗（配置耗时预算时创建）
+        self.watchdog: LatencyWatchdog | None = None
+        self.pending_demotions: set[str] = set()
+        self.init_watchdog()
+
         self.load_rules()
         self.register_events()
         self.patch_functions()
 
+        self.init_metrics()
+        self.init_shadow()
+
+    def load_engine_setting(self) -> None:
+        """加载风控引擎配置"""
+        setting: dict = load_json(self.engine_setting_filename)
+
+        if setting:
+            self.engine_setting.update(setting)
+        else:
+            save_json(self.engine_setting_filename, self.engine_setting)
+
+    def init_journal(self) -> None:
+        """创建风控决策审计日志"""
+        if self.engine_setting["journal"]:
+            self.journal = RiskJournal(get_folder_path("risk_journal"), on_error=self.write_error)
+
+    def init_shared_counter(self) -> None:
+        """创建多进程共享计数器（同一主机上交易同一账户的多个进程共用一组计数）"""
+        if not self.engine_setting["shared_state"]:
+            return
+
+        try:
+            from .shared import SharedCounter
+        except ImportError:
+            self.main_engine.write_log("共享内存计数器需要编译Cython扩展，当前使用进程内计数", source="RiskEngine")
+            return
+
+        # 按交易日区分共享内存段（20点后的夜盘归属下一交易日）
+        name: str = f"{self.engine_setting['shared_name']}_{self.trading_day:%Y%m%d}"
+        self.shared_counter = SharedCounter(name)
+
+        self.main_engine.write_log(f"共享内存计数器[{name}]启动成功", source="RiskEngine")
+
+    def init_metrics(self) -> None:
+        """启动指标导出HTTP服务"""
+        port: int = self.engine_setting["metrics_port"]
+        if not port:
+            return
+
+        metrics: RiskMetrics = RiskMetrics(
+            self,
+            self.engine_setting["metrics_host"],
+            port,
+            self.engine_setting["metrics_interval"]
+        )
+
+        try:
+            metrics.start()
+        except OSError:
+            self.write_error(f"风控指标导出服务启动失败：{traceback.format_exc()}")
+            return
+
+        with self.lock:
+            metrics.update_snapshot()
+        self.metrics = metrics
+
+    def init_watchdog(self) -> None:
+        """创建规则检查耗时看门狗"""
+        budget: float = self.engine_setting["latency_budget"]
+        if not budget:
+            return
+
+        try:
+            self.watchdog = LatencyWatchdog(
+                budget,
+                self.engine_setting["latency_breach_limit"],
+                self.engine_setting["latency_breach_window"],
+                self.engine_setting["latency_policy"]
+            )
+        except ValueError as ex:
+            self.write_error(f"规则检查耗时看门狗启动失败：{ex}")
+
+    def init_shadow(self) -> None:
+        """创建配置中的影子规则"""
+        for rule_name, setting in self.engine_setting["shadow_rules"].items():
+            if rule_name in self.rules:
+                self.add_shadow_rule(rule_name, setting)
+            else:
+                self.write_error(f"影子规则[{rule_name}]对应的规则不存在")
+
     def load_rules(self) -> None:
         """加载本地工具"""
         # 收集所有规则类
@@ -77,7 +274,12 @@ class RiskEngine(BaseEngine):
 
         # 实例化收集到的规则类
         for class_name, (rule_class, module_name) in self.rule_classes.items():
-            self.add_rule(rule_class)
+            try:
+                self.add_rule(rule_class)
+            except Exception:
+                msg: str = f"风控规则[{class_name}]初始化失败：{traceback.format_exc()}"
+                self.main_engine.write_log(msg, level=ERROR, source="RiskEngine")
+                continue
 
             self.main_engine.write_log(
                 msg=f"风控规则[{class_name}]加载成功，模块：{module_name}",
@@ -133,24 +335,42 @@ class RiskEngine(BaseEngine):
         """检测规则需要的事件类型并注册"""
         # 遍历所有规则，检测并缓存需要回调的规则
         for rule in self.rules.values():
+            if self.needs_callback(rule, "on_send_order") or self.needs_callback(rule, "on_send_result"):
+                self.send_rules.append(rule)
             if self.needs_callback(rule, "on_tick"):
                 self.tick_rules.append(rule)
             if self.needs_callback(rule, "on_order"):
                 self.order_rules.append(rule)
             if self.needs_callback(rule, "on_trade"):
                 self.trade_rules.append(rule)
+            if self.needs_callback(rule, "on_position"):
+                self.position_rules.append(rule)
+            if self.needs_callback(rule, "on_account"):
+                self.account_rules.append(rule)
             if self.needs_callback(rule, "on_timer"):
                 self.timer_rules.append(rule)
 
+        # 委托和成交事件始终注册（用于维护策略索引）
+        self.event_engine.register(EVENT_ORDER, self.process_order_event)
+        self.event_engine.register(EVENT_TRADE, self.process_trade_event)
+
+        # 合约事件始终注册（用于更新检查计划）
+        self.event_engine.register(EVENT_CONTRACT, self.process_contract_event)
+
+        # 暂停交易时的撤单请求（在事件线程中执行，不持有引擎锁）
+        self.event_engine.register(EVENT_RISK_CANCEL, self.process_cancel_event)
+
         # 按需注册事件监听
         if self.tick_rules:
             self.event_engine.register(EVENT_TICK, self.process_tick_event)
-        if self.order_rules:
-            self.event_engine.register(EVENT_ORDER, self.process_order_event)
-        if self.trade_rules:
-            self.event_engine.register(EVENT_TRADE, self.process_trade_event)
-        if self.timer_rules:
-            self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+        if self.position_rules:
+            self.event_engine.register(EVENT_POSITION, self.process_position_event)
+        if self.account_rules:
+            self.event_engine.register(EVENT_ACCOUNT, self.process_account_event)
+        # 定时事件始终注册（用于切换交易日）
+        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+        if self.watchdog:
+            self.event_engine.register(EVENT_RISK_DEMOTE, self.process_demote_event)
 
     def needs_callback(self, rule: RuleTemplate, method_name: str) -> bool:
         """检测规则是否重写了某个回调方法"""
@@ -158,47 +378,572 @@ class RiskEngine(BaseEngine):
         base_method = getattr(RuleTemplate, method_name)
         return rule_method.__func__ is not base_method
 
+    def process_contract_event(self, event: Event) -> None:
+        """处理合约事件（合约信息变化后重新编译该合约的检查计划）"""
+        contract: ContractData = event.data
+        with self.lock:
+            self.check_plans.pop(contract.vt_symbol, None)
+
+            if self.check_cache:
+                keys: list[tuple] = [key for key in self.check_cache if key[0] == contract.vt_symbol]
+                for key in keys:
+                    self.check_cache.pop(key)
+
     def process_tick_event(self, event: Event) -> None:
-        """处理行情事件"""
+        """处理行情事件（只推送给启用的规则，没有启用的行情规则和影子规则时不加锁直接返回）"""
         tick: TickData = event.data
-        for rule in self.tick_rules:
-            rule.on_tick(tick)
+
+        rules: list[RuleTemplate] = [rule for rule in self.tick_rules if rule.active]
+        if not rules and not self.shadow:
+            return
+
+        with self.lock:
+            for rule in rules:
+                rule.on_tick(tick)
+
+            if self.shadow:
+                self.shadow.put("on_tick", tick)
 
     def process_order_event(self, event: Event) -> None:
         """处理委托事件"""
         order: OrderData = event.data
-        for rule in self.order_rules:
-            rule.on_order(order)
+        with self.lock:
+            self.update_order_index(order)
+
+            for rule in self.order_rules:
+                rule.on_order(order)
+
+            if self.shadow:
+                self.shadow.put("on_order", order)
 
     def process_trade_event(self, event: Event) -> None:
         """处理成交事件"""
         trade: TradeData = event.data
-        for rule in self.trade_rules:
-            rule.on_trade(trade)
+        with self.lock:
+            self.update_trade_index(trade)
+
+            for rule in self.trade_rules:
+                rule.on_trade(trade)
+
+            if self.shadow:
+                self.shadow.put("on_trade", trade)
+
+    def process_position_event(self, event: Event) -> None:
+        """处理持仓事件"""
+        position: PositionData = event.data
+        with self.lock:
+            for rule in self.position_rules:
+                rule.on_position(position)
+
+            if self.shadow:
+                self.shadow.put("on_position", position)
+
+    def process_account_event(self, event: Event) -> None:
+        """处理资金事件"""
+        account: AccountData = event.data
+        with self.lock:
+            for rule in self.account_rules:
+                rule.on_account(account)
+
+            if self.shadow:
+                self.shadow.put("on_account", account)
 
     def process_timer_event(self, event: Event) -> None:
-        """处理定时事件"""
-        for rule in self.timer_rules:
-            rule.on_timer()
+        """处理定时事件（使用模拟时钟时由advance_clock驱动，忽略定时事件）"""
+        if isinstance(self.clock, SimulatedClock):
+            return
+
+        # 回收已退出进程在共享计数器中的登记（其持有的活动委托数量不再计入汇总）
+        if self.shared_counter:
+            self.shared_counter.reclaim()
+
+        with self.lock:
+            self.check_trading_day()
+
+            for rule in self.timer_rules:
+                rule.on_timer()
+
+            if self.shadow:
+                self.shadow.put("on_timer")
+
+            if self.metrics:
+                self.metrics.on_timer()
+
+    def check_trading_day(self) -> None:
+        """交易日切换时清理已结束委托的委托号归属，以及撤单和成交的去重记录（在引擎锁内调用）"""
+        trading_day: date = get_trading_day(self.clock.get_datetime())
+        if trading_day == self.trading_day:
+            return
+        self.trading_day = trading_day
+
+        active_orderids: set[str] = set()
+        for orderids in self.reference_active_orderids.values():
+            active_orderids.update(orderids)
+
+        self.orderid_reference_map = {
+            vt_orderid: reference
+            for vt_orderid, reference in self.orderid_reference_map.items()
+            if vt_orderid in active_orderids
+        }
+        self.cancel_orderids.clear()
+        self.tradeids.clear()
+
+    def process_demote_event(self, event: Event) -> None:
+        """处理规则降级事件（在事件线程中执行，不占用下单检查的时间）"""
+        rule_name, latency = event.data
+
+        with self.lock:
+            self.pending_demotions.discard(rule_name)
+
+        self.demote_rule(rule_name, latency)
+
+    def process_cancel_event(self, event: Event) -> None:
+        """处理撤销全部委托事件"""
+        self.cancel_all_orders()
+
+    def set_clock(self, clock: Clock) -> None:
+        """替换引擎时钟"""
+        with self.lock:
+            self.clock = clock
+            self.timer_second = int(clock.get_time())
+            self.trading_day = get_trading_day(clock.get_datetime())
+
+    def advance_clock(self, timestamp: float) -> None:
+        """推进模拟时钟，每经过一个整秒执行一次规则定时回调"""
+        clock: Clock = self.clock
+        if not isinstance(clock, SimulatedClock):
+            return
+
+        with self.lock:
+            clock.set_time(timestamp)
+            self.check_trading_day()
+
+            second: int = int(clock.get_time())
+            if not self.timer_second:
+                self.timer_second = second
+                return
+
+            # 跨越休市时段时最多补发一天的定时回调
+            steps: int = min(second - self.timer_second, 86400)
+            self.timer_second = second
+
+            for _ in range(steps):
+                for rule in self.timer_rules:
+                    rule.on_timer()
+
+                if self.shadow:
+                    self.shadow.put("on_timer")
 
     def send_order(self, req: OrderRequest, gateway_name: str) -> str:
         """下单请求风控检查"""
-        result: bool = self.check_allowed(req, gateway_name)
-        if not result:
-            return ""
+        # 检查和预占在同一临界区内完成，避免并发下单同时通过检查后超限，
+        # 调用网关发单时释放引擎锁，网关响应缓慢不会阻塞其他线程的下单和事件回调
+        with self.lock:
+            if not self.check_order(req, gateway_name):
+                return ""
+
+            reserve_id: str = self.reserve_order(req)
+
+        vt_orderid: str = ""
+        try:
+            vt_orderid = self._send_order(req, gateway_name)
+        finally:
+            with self.lock:
+                self.settle_order(req, reserve_id, vt_orderid)
+
+        return vt_orderid
+
+    def reserve_order(self, req: OrderRequest) -> str:
+        """以临时编号预占规则计数和策略索引，突发连续下单时上限同样有效（在引擎锁内调用）"""
+        self.reserve_count += 1
+        reserve_id: str = f"{RESERVE_PREFIX}{self.reserve_count}"
+
+        self.add_order_index(reserve_id, req.reference)
+
+        for rule in self.send_rules:
+            rule.on_send_order(req, reserve_id)
+
+        if self.shadow:
+            self.shadow.put("on_send_order", req, reserve_id)
+
+        return reserve_id
+
+    def settle_order(self, req: OrderRequest, reserve_id: str, vt_orderid: str) -> None:
+        """发单返回后将预占转到委托号（在引擎锁内调用）"""
+        reference: str = self.orderid_reference_map.pop(reserve_id)
+        self.reference_active_orderids[reference].discard(reserve_id)
+
+        # 发单失败（返回空委托号），或发单期间委托推送已先行到达（已由推送完成计数）时释放预占
+        if vt_orderid and vt_orderid not in self.orderid_reference_map:
+            self.orderid_reference_map[vt_orderid] = reference
+            self.reference_active_orderids[reference].add(vt_orderid)
+        else:
+            vt_orderid = ""
+            self.reference_order_count[reference] -= 1
+
+        for rule in self.send_rules:
+            rule.on_send_result(req, reserve_id, vt_orderid)
+
+        if self.shadow:
+            self.shadow.put("on_send_result", req, reserve_id, vt_orderid)
+
+    def check_order(self, req: OrderRequest, gateway_name: str) -> bool:
+        """执行风控检查并统计结果（不发单，也供风控服务调用）"""
+        with self.lock:
+            if self.halted:
+                self.write_log(f"全局交易已暂停（{self.halt_reason}）：{req}")
+
+                if self.journal:
+                    self.journal.record(self.clock.get_time(), req, False, REASON_HALT, "", 0)
+                return False
+
+            self.check_count += 1
+            self.reject_rule = ""
+
+            if self.journal or self.metrics:
+                start: int = perf_counter_ns()
+                result: bool = self.check_allowed(req, gateway_name)
+                latency: int = perf_counter_ns() - start
+
+                if self.metrics:
+                    self.metrics.add_latency(latency)
+
+                if self.journal:
+                    reason: int = REASON_PASS if result else REASON_RULE
+                    self.journal.record(self.clock.get_time(), req, result, reason, self.reject_rule, latency)
+            else:
+                result = self.check_allowed(req, gateway_name)
+
+            # 影子规则在后台线程中检查，不影响本次检查结果
+            if self.shadow:
+                self.shadow.put("check", req, gateway_name, result, self.reject_rule, self.clock.get_time())
+
+            if not result:
+                self.reject_count += 1
+                return False
 
-        return self._send_order(req, gateway_name)
+        return True
 
     def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
-        """检查是否允许发单"""
-        for rule in self.rules.values():
-            if (
-                rule.active                                         # 启用规则
-                and not rule.check_allowed(req, gateway_name)       # 检查规则是否允许
-            ):
+        """检查是否允许发单（执行合约的检查计划）"""
+        plan: list[tuple[str, Callable[[OrderRequest, str], bool]]] | None = self.check_plans.get(req.vt_symbol, None)
+        if plan is None:
+            plan = self.compile_plan(req.vt_symbol)
+
+        for rule_name, check in plan:
+            if not check(req, gateway_name):
+                # 合并后的纯函数规则检查名称为空，由检查内部记录拦截规则
+                if rule_name:
+                    self.reject_rule = rule_name
                 return False
         return True
 
+    def compile_plan(self, vt_symbol: str) -> list[tuple[str, Callable[[OrderRequest, str], bool]]]:
+        """编译合约的检查计划（跳过未启用的规则，规则提供专用检查函数时使用专用函数）"""
+        plan: list[tuple[str, Callable[[OrderRequest, str], bool]]] = []
+        pure_checks: list[tuple[str, Callable[[OrderRequest, str], bool]]] = []
+
+        for rule in self.rules.values():
+            if not rule.active:
+                continue
+
+            # 按拦截策略降级的规则直接拦截委托
+            if self.watchdog and self.watchdog.is_rejected(rule.name):
+                plan.append((rule.name, self.create_reject_check(rule.name)))
+                continue
+
+            check: Callable[[OrderRequest, str], bool] | None = rule.compile_check(vt_symbol)
+            if check is None:
+                check = rule.check_allowed
+
+            if self.watchdog:
+                check = self.create_timed_check(rule.name, check)
+
+            if rule.pure and self.check_cache_size:
+                pure_checks.append((rule.name, check))
+            else:
+                plan.append((rule.name, check))
+
+        # 纯函数规则合并为一个带缓存的检查，放在计划最前面（没有副作用，先执行不影响其他规则）
+        if pure_checks:
+            plan.insert(0, ("", self.create_cached_check(pure_checks)))
+
+        self.check_plans[vt_symbol] = plan
+        return plan
+
+    def create_cached_check(
+        self,
+        checks: list[tuple[str, Callable[[OrderRequest, str], bool]]]
+    ) -> Callable[[OrderRequest, str], bool]:
+        """创建带缓存的纯函数规则检查（未通过的检查不缓存，每次重新执行以输出拦截日志）"""
+        cache: OrderedDict[tuple, None] = self.check_cache
+
+        def check_allowed(req: OrderRequest, gateway_name: str) -> bool:
+            key: tuple = (req.vt_symbol, req.type, req.price, req.volume)
+
+            if key in cache:
+                cache.move_to_end(key)
+                self.cache_hit_count += 1
+                return True
+
+            self.cache_miss_count += 1
+
+            for rule_name, check in checks:
+                if not check(req, gateway_name):
+                    self.reject_rule = rule_name
+                    return False
+
+            cache[key] = None
+            if len(cache) > self.check_cache_size:
+                cache.popitem(last=False)
+
+            return True
+
+        return check_allowed
+
+    def create_timed_check(
+        self,
+        rule_name: str,
+        check: Callable[[OrderRequest, str], bool]
+    ) -> Callable[[OrderRequest, str], bool]:
+        """创建计时的规则检查（超出耗时预算时通知看门狗，拦截时的耗时包括输出日志，不计入）"""
+        budget: int = self.watchdog.budget if self.watchdog else 0
+
+        def timed_check(req: OrderRequest, gateway_name: str) -> bool:
+            start: int = perf_counter_ns()
+            result: bool = check(req, gateway_name)
+            end: int = perf_counter_ns()
+
+            if result and end - start > budget:
+                self.on_latency_breach(rule_name, end - start, end / 1e9)
+            return result
+
+        return timed_check
+
+    def create_reject_check(self, rule_name: str) -> Callable[[OrderRequest, str], bool]:
+        """创建直接拦截的检查（规则按拦截策略降级后使用）"""
+        def reject_check(req: OrderRequest, gateway_name: str) -> bool:
+            self.write_log(f"规则[{rule_name}]检查耗时超出预算已降级为拦截：{req}")
+            return False
+
+        return reject_check
+
+    def on_latency_breach(self, rule_name: str, latency: int, timestamp: float) -> None:
+        """规则检查超出耗时预算（在引擎锁内调用，需要降级时推送事件，由事件线程执行降级）"""
+        if (
+            self.watchdog
+            and self.watchdog.add_breach(rule_name, latency, timestamp)
+            and rule_name not in self.pending_demotions
+        ):
+            self.pending_demotions.add(rule_name)
+            self.event_engine.put(Event(EVENT_RISK_DEMOTE, (rule_name, latency)))
+
+    def demote_rule(self, rule_name: str, latency: int) -> None:
+        """按看门狗策略降级规则，并推送告警事件"""
+        if not self.watchdog:
+            return
+
+        with self.lock:
+            policy: str = self.watchdog.demote(rule_name)
+            rule: RuleTemplate = self.rules[rule_name]
+
+            # 停用前先以当前参数创建影子规则，继续在后台线程中评估
+            if policy == POLICY_SHADOW:
+                self.add_shadow_rule(rule_name, {"active": True})
+
+            if policy in {POLICY_DISABLE, POLICY_SHADOW}:
+                rule.active = False
+
+            self.clear_check_plans()
+
+        msg: str = (
+            f"规则[{rule_name}]检查耗时{latency / 1000:.1f}微秒，"
+            f"{self.watchdog.breach_window}秒内{self.watchdog.breach_limit}次超出预算"
+            f"{self.watchdog.budget / 1000:.1f}微秒，已降级：{POLICY_NAMES[policy]}"
+        )
+        self.write_error(msg)
+
+        data: dict[str, Any] = {
+            "rule": rule_name,
+            "policy": policy,
+            "latency": latency / 1000,
+            "budget": self.watchdog.budget / 1000,
+            "msg": msg
+        }
+        self.event_engine.put(Event(EVENT_RISK_ALERT, data))
+        self.event_engine.put(Event(EVENT_RISK_NOTIFY, msg))
+
+        rule.put_event()
+
+    def restore_rule(self, rule_name: str) -> None:
+        """恢复被看门狗降级的规则"""
+        if not self.watchdog:
+            return
+
+        rule: RuleTemplate = self.rules[rule_name]
+
+        with self.lock:
+            policy: str | None = self.watchdog.restore(rule_name)
+            if not policy:
+                return
+
+            if policy == POLICY_SHADOW:
+                self.remove_shadow_rule(rule_name)
+
+            if policy in {POLICY_DISABLE, POLICY_SHADOW}:
+                rule.active = True
+
+            self.clear_check_plans()
+
+        self.main_engine.write_log(f"规则[{rule_name}]已恢复", source="RiskEngine")
+        rule.put_event()
+
+    def get_watchdog_stats(self) -> dict[str, Any]:
+        """获取规则检查耗时看门狗的统计数据"""
+        if not self.watchdog:
+            return {}
+
+        with self.lock:
+            return self.watchdog.get_stats()
+
+    def clear_check_plans(self) -> None:
+        """清空检查计划和检查结果缓存（直接修改规则启用状态或参数后需要调用）"""
+        with self.lock:
+            self.check_plans.clear()
+            self.check_cache.clear()
+
+    def add_shadow_rule(self, rule_name: str, setting: dict) -> None:
+        """添加影子规则：使用候选参数创建规则的另一个实例，接收相同的回调和检查，只记录决策不拦截委托"""
+        rule: RuleTemplate = self.rules[rule_name]
+
+        with self.lock:
+            rule_setting: dict = rule.get_data()["parameters"]
+            rule_setting.update(copy.deepcopy(setting))
+
+            if not self.shadow:
+                self.shadow = ShadowRunner(self)
+            self.shadow.add_rule(rule_name, type(rule), rule_setting)
+
+    def remove_shadow_rule(self, rule_name: str) -> None:
+        """移除影子规则"""
+        if self.shadow:
+            self.shadow.remove_rule(rule_name)
+
+    def get_shadow_report(self) -> dict[str, dict[str, Any]]:
+        """获取影子规则与实盘规则的决策差异统计"""
+        if not self.shadow:
+            return {}
+        return self.shadow.get_report()
+
+    def get_cache_stats(self) -> dict[str, Any]:
+        """获取检查结果缓存的统计数据"""
+        total: int = self.cache_hit_count + self.cache_miss_count
+
+        return {
+            "size": len(self.check_cache),
+            "hit_count": self.cache_hit_count,
+            "miss_count": self.cache_miss_count,
+            "hit_rate": self.cache_hit_count / total if total else 0
+        }
+
+    def add_order_index(self, vt_orderid: str, reference: str) -> None:
+        """将委托号归属到委托来源"""
+        self.orderid_reference_map[vt_orderid] = reference
+        self.reference_order_count[reference] += 1
+        self.reference_active_orderids[reference].add(vt_orderid)
+
+    def update_order_index(self, order: OrderData) -> None:
+        """根据委托推送更新策略索引"""
+        vt_orderid: str = order.vt_orderid
+
+        # 非本引擎发出的委托，首次收到推送时按委托自带的来源归属
+        reference: str | None = self.orderid_reference_map.get(vt_orderid, None)
+        if reference is None:
+            reference = order.reference
+            self.add_order_index(vt_orderid, reference)
+
+        if order.is_active():
+            return
+
+        self.reference_active_orderids[reference].discard(vt_orderid)
+
+        if (
+            order.status == Status.CANCELLED
+            and vt_orderid not in self.cancel_orderids
+        ):
+            self.cancel_orderids.add(vt_orderid)
+            self.reference_cancel_count[reference] += 1
+
+    def update_trade_index(self, trade: TradeData) -> None:
+        """根据成交推送更新策略索引"""
+        if trade.vt_tradeid in self.tradeids:
+            return
+        self.tradeids.add(trade.vt_tradeid)
+
+        reference: str | None = self.orderid_reference_map.get(trade.vt_orderid, None)
+        if reference is not None:
+            self.reference_trade_count[reference] += 1
+
+    def get_order_reference(self, vt_orderid: str) -> str | None:
+        """查询委托号对应的委托来源"""
+        return self.orderid_reference_map.get(vt_orderid, None)
+
+    def get_reference_order_count(self, reference: str) -> int:
+        """查询委托来源的委托笔数"""
+        return self.reference_order_count.get(reference, 0)
+
+    def get_reference_cancel_count(self, reference: str) -> int:
+        """查询委托来源的撤单笔数"""
+        return self.reference_cancel_count.get(reference, 0)
+
+    def get_reference_trade_count(self, reference: str) -> int:
+        """查询委托来源的成交笔数"""
+        return self.reference_trade_count.get(reference, 0)
+
+    def get_reference_active_count(self, reference: str) -> int:
+        """查询委托来源的活动委托数量"""
+        active_orderids: set[str] | None = self.reference_active_orderids.get(reference, None)
+        if not active_orderids:
+            return 0
+        return len(active_orderids)
+
+    def halt(self, reason: str, cancel_orders: bool = False) -> None:
+        """全局暂停交易（撤单通过事件在释放引擎锁后执行，规则回调中触发时不会在锁内调用网关）"""
+        with self.lock:
+            self.halt_reason = reason
+            self.halted = True
+
+        msg: str = f"全局暂停交易：{reason}"
+        self.main_engine.write_log(msg, source="RiskEngine")
+        self.event_engine.put(Event(EVENT_RISK_NOTIFY, msg))
+        self.put_halt_event()
+
+        if cancel_orders:
+            self.event_engine.put(Event(EVENT_RISK_CANCEL, reason))
+
+    def resume(self) -> None:
+        """恢复交易"""
+        with self.lock:
+            self.halted = False
+            self.halt_reason = ""
+
+        self.main_engine.write_log("恢复交易", source="RiskEngine")
+        self.put_halt_event()
+
+    def cancel_all_orders(self) -> None:
+        """撤销全部活动委托"""
+        for order in self.main_engine.get_all_active_orders():
+            req: CancelRequest = order.create_cancel_request()
+            self.main_engine.cancel_order(req, order.gateway_name)
+
+    def put_halt_event(self) -> None:
+        """推送全局暂停状态事件"""
+        data: dict[str, Any] = {
+            "halted": self.halted,
+            "reason": self.halt_reason
+        }
+        self.event_engine.put(Event(EVENT_RISK_HALT, data))
+
     def write_log(self, msg: str) -> None:
         """输出风控日志"""
         log: LogData = LogData(
@@ -215,10 +960,30 @@ class RiskEngine(BaseEngine):
         if winsound:
             winsound.PlaySound("SystemExclamation", winsound.SND_ALIAS | winsound.SND_ASYNC)
 
+    def get_time(self) -> float:
+        """获取引擎时钟的当前时间戳（供规则调用）"""
+        return self.clock.get_time()
+
+    def get_datetime(self) -> datetime:
+        """获取引擎时钟的当前时间（供规则调用）"""
+        return self.clock.get_datetime()
+
     def get_contract(self, vt_symbol: str) -> ContractData | None:
         """查询合约信息（供规则调用）"""
         return self.main_engine.get_contract(vt_symbol)
 
+    def get_all_positions(self) -> list[PositionData]:
+        """查询所有持仓信息（供规则调用）"""
+        return self.main_engine.get_all_positions()
+
+    def get_all_accounts(self) -> list[AccountData]:
+        """查询所有资金信息（供规则调用）"""
+        return self.main_engine.get_all_accounts()
+
+    def get_shared_counter(self) -> Any:
+        """获取多进程共享计数器，未启用时返回None（供规则调用）"""
+        return self.shared_counter
+
     def put_rule_event(self, rule: RuleTemplate) -> None:
         """推送规则事件"""
         data: dict[str, Any] = rule.get_data()
@@ -227,15 +992,55 @@ class RiskEngine(BaseEngine):
 
     def update_rule_setting(self, rule_name: str, rule_setting: dict) -> None:
         """更新指定规则的参数"""
-        self.setting[rule_name] = rule_setting
-
-        # 更新到规则对象
         rule: RuleTemplate = self.rules[rule_name]
-        rule.update_setting(rule_setting)
+
+        # 复制参数，调用方之后修改传入的字典不会影响规则和待保存的配置
+        rule_setting = copy.deepcopy(rule_setting)
+
+        # 在引擎锁内整体应用参数，检查时不会看到只更新了一部分的参数，应用失败时恢复原参数
+        with self.lock:
+            previous_setting: dict = rule.get_data()["parameters"]
+            try:
+                rule.update_setting(rule_setting)
+            except Exception:
+                rule.update_setting(previous_setting)
+                raise
+
+            self.check_plans.clear()
+            self.check_cache.clear()
+
+            # 手动修改参数后取消看门狗的降级标记（影子规则需要另行移除）
+            if self.watchdog:
+                self.watchdog.restore(rule_name)
+
+            self.setting[rule_name] = rule_setting
+            setting: dict = dict(self.setting)
+
         rule.put_event()
 
-        # 保存配置到文件
-        save_json(self.setting_filename, self.setting)
+        # 由后台线程合并保存到文件（不阻塞调用线程）
+        self.setting_writer.save(self.setting_filename, setting)
+
+    def write_error(self, msg: str) -> None:
+        """输出引擎错误日志"""
+        self.main_engine.write_log(msg, source="RiskEngine")
+
+    def close(self) -> None:
+        """关闭引擎（写入待保存的配置和审计日志，停止指标导出服务和组合规则的后台线程）"""
+        self.setting_writer.close()
+
+        for rule in self.rules.values():
+            if isinstance(rule, PortfolioRuleTemplate):
+                rule.close()
+
+        if self.journal:
+            self.journal.close()
+
+        if self.metrics:
+            self.metrics.close()
+
+        if self.shadow:
+            self.shadow.close()
 
     def get_all_rule_names(self) -> list[str]:
         """获取所有规则类名"""
@@ -244,7 +1049,8 @@ class RiskEngine(BaseEngine):
     def get_rule_data(self, rule_name: str) -> dict[str, Any]:
         """获取指定规则的数据"""
         rule: RuleTemplate = self.rules[rule_name]
-        return rule.get_data()
+        with self.lock:
+            return rule.get_data()
 
     def get_field_name(self, field: str) -> str:
         """获取字段名称"""
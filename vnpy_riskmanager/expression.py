@@ -0,0 +1,279 @@
+import re
+import ast
+import operator
+from collections.abc import Callable
+from typing import Any, cast
+
+from vnpy.trader.object import OrderRequest, ContractData
+
+
+# 委托请求变量：名称 -> 取值代码（编译后函数的参数为req和gateway_name，枚举取名称）
+REQUEST_VARIABLES: dict[str, str] = {
+    "volume": "req.volume",
+    "price": "req.price",
+    "direction": "req.direction.name",
+    "offset": "req.offset.name",
+    "type": "req.type.name",
+    "reference": "req.reference",
+    "gateway_name": "gateway_name",
+}
+
+# 引擎检查结果缓存键包含的委托请求变量（只使用这些变量的表达式结果可以缓存）
+CACHE_KEY_VARIABLES: set[str] = {"volume", "price", "type"}
+
+# 合约变量（编译时折叠为常量）
+CONTRACT_VARIABLES: set[str] = {
+    "size", "pricetick", "min_volume", "max_volume", "exchange", "symbol", "vt_symbol", "product"
+}
+
+# 适用范围过滤只支持合约变量中的文本字段
+FILTER_FIELDS: set[str] = {"exchange", "symbol", "vt_symbol", "product"}
+
+# 文本变量（不允许参与算术运算）
+STRING_VARIABLES: set[str] = {"direction", "offset", "type", "reference", "gateway_name"} | FILTER_FIELDS
+
+# 可调用的函数
+FUNCTIONS: dict[str, Callable] = {
+    "abs": abs,
+    "min": min,
+    "max": max,
+    "round": round,
+}
+
+# 运算符
+BINARY_OPERATORS: dict[type, Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+}
+
+UNARY_OPERATORS: dict[type, Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+    ast.Not: operator.not_,
+}
+
+COMPARE_OPERATORS: dict[type, Callable[[Any, Any], bool]] = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+# 允许出现的语法节点
+ALLOWED_NODES: tuple[type, ...] = (
+    ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.BinOp, ast.Compare,
+    ast.Name, ast.Load, ast.Constant, ast.Call, ast.Tuple, ast.List,
+    *BINARY_OPERATORS, *UNARY_OPERATORS, *COMPARE_OPERATORS,
+)
+
+FILTER_PATTERN: re.Pattern = re.compile(r"^(?P<body>.+?)\s+for\s+(?P<field>\w+)\s+(?P<values>[\w.\-]+(\s*,\s*[\w.\-]+)*)$")
+
+
+class LimitExpression:
+    """
+    限额表达式
+
+    格式为“条件表达式 [for 合约字段 值1,值2]”，例如“volume * price * size <= 2e6 for exchange SHFE”。
+    解析时校验语法（只允许白名单中的节点、变量和函数），编译时折叠合约常量，生成Python函数。
+    """
+
+    def __init__(self, text: str) -> None:
+        """构造函数（表达式不合法时抛出ValueError）"""
+        self.text: str = text.strip()
+
+        self.filter_field: str = ""
+        self.filter_values: set[str] = set()
+
+        # 表达式使用的委托请求变量
+        self.request_variables: set[str] = set()
+
+        body: str = self.text
+        match: re.Match | None = FILTER_PATTERN.match(self.text)
+        if match:
+            body = match.group("body")
+            self.filter_field = match.group("field")
+            self.filter_values = {v.strip() for v in match.group("values").split(",")}
+
+            if self.filter_field not in FILTER_FIELDS:
+                raise ValueError(f"表达式[{self.text}]的适用范围字段{self.filter_field}不支持，可选：{sorted(FILTER_FIELDS)}")
+
+        try:
+            self.tree: ast.Expression = ast.parse(body, mode="eval")
+        except SyntaxError as ex:
+            raise ValueError(f"表达式[{self.text}]语法错误：{ex.msg}") from None
+
+        self.validate()
+
+    def validate(self) -> None:
+        """校验语法节点、变量和函数"""
+        for node in ast.walk(self.tree):
+            if not isinstance(node, ALLOWED_NODES):
+                raise ValueError(f"表达式[{self.text}]不支持的语法：{type(node).__name__}")
+
+            if isinstance(node, ast.Name):
+                if node.id not in REQUEST_VARIABLES and node.id not in CONTRACT_VARIABLES and node.id not in FUNCTIONS:
+                    raise ValueError(f"表达式[{self.text}]未知的变量：{node.id}")
+
+                if node.id in REQUEST_VARIABLES:
+                    self.request_variables.add(node.id)
+            elif isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+                    raise ValueError(f"表达式[{self.text}]只能调用函数：{sorted(FUNCTIONS)}")
+            elif isinstance(node, ast.Constant):
+                if not isinstance(node.value, int | float | str):
+                    raise ValueError(f"表达式[{self.text}]不支持的常量：{node.value!r}")
+            elif isinstance(node, ast.BinOp):
+                for operand in [node.left, node.right]:
+                    if (
+                        (isinstance(operand, ast.Constant) and isinstance(operand.value, str))
+                        or (isinstance(operand, ast.Name) and operand.id in STRING_VARIABLES)
+                    ):
+                        raise ValueError(f"表达式[{self.text}]文本不能参与算术运算")
+
+        body: ast.expr = self.tree.body
+        if not isinstance(body, ast.Compare | ast.BoolOp) and not (isinstance(body, ast.UnaryOp) and isinstance(body.op, ast.Not)):
+            raise ValueError(f"表达式[{self.text}]的结果必须是比较或逻辑运算")
+
+    def is_applicable(self, constants: dict[str, Any]) -> bool:
+        """是否适用于该合约"""
+        if not self.filter_field:
+            return True
+        return constants[self.filter_field] in self.filter_values
+
+    def compile(self, constants: dict[str, Any]) -> Callable[[OrderRequest, str], bool] | None:
+        """折叠合约常量后编译为检查函数，结果恒为真时返回None（表达式计算出错时抛出ValueError）"""
+        try:
+            tree: ast.expr = fold_constants(self.tree.body, constants)
+        except Exception as ex:
+            raise ValueError(f"表达式[{self.text}]常量计算错误：{ex}") from None
+
+        if isinstance(tree, ast.Constant):
+            if tree.value:
+                return None
+
+            def reject_all(req: OrderRequest, gateway_name: str) -> bool:
+                return False
+
+            return reject_all
+
+        # 请求变量替换为属性访问
+        source: str = "lambda req, gateway_name: " + to_source(tree)
+        code: Any = compile(source, f"<{self.text}>", "eval")
+
+        func: Callable[[OrderRequest, str], bool] = eval(code, {"__builtins__": {}, **FUNCTIONS})
+        return func
+
+
+def get_contract_constants(contract: ContractData) -> dict[str, Any]:
+    """获取合约常量"""
+    return {
+        "size": contract.size,
+        "pricetick": contract.pricetick,
+        "min_volume": contract.min_volume,
+        "max_volume": contract.max_volume or 0,
+        "exchange": contract.exchange.value,
+        "symbol": contract.symbol,
+        "vt_symbol": contract.vt_symbol,
+        "product": contract.product.name,
+    }
+
+
+def parse_expressions(text: str) -> list[LimitExpression]:
+    """解析多条表达式（使用分号或换行分隔）"""
+    return [LimitExpression(s) for s in re.split(r"[;\n]", text) if s.strip()]
+
+
+def fold_constants(node: ast.expr, constants: dict[str, Any]) -> ast.expr:
+    """替换合约常量并折叠只包含常量的子表达式（逻辑运算按短路规则化简）"""
+    if isinstance(node, ast.Name):
+        if node.id in constants:
+            return ast.Constant(constants[node.id])
+        return node
+
+    elif isinstance(node, ast.Tuple | ast.List):
+        elts: list[ast.expr] = [fold_constants(e, constants) for e in node.elts]
+        elt_values: list[Any] | None = get_constant_values(elts)
+        if elt_values is not None:
+            return ast.Constant(cast(Any, tuple(elt_values)))
+        return ast.Tuple(elts=elts, ctx=ast.Load())
+
+    elif isinstance(node, ast.UnaryOp):
+        operand: ast.expr = fold_constants(node.operand, constants)
+        if isinstance(operand, ast.Constant):
+            return ast.Constant(UNARY_OPERATORS[type(node.op)](operand.value))
+        return ast.UnaryOp(op=node.op, operand=operand)
+
+    elif isinstance(node, ast.BinOp):
+        left: ast.expr = fold_constants(node.left, constants)
+        right: ast.expr = fold_constants(node.right, constants)
+        if isinstance(left, ast.Constant) and isinstance(right, ast.Constant):
+            return ast.Constant(BINARY_OPERATORS[type(node.op)](left.value, right.value))
+        return ast.BinOp(left=left, op=node.op, right=right)
+
+    elif isinstance(node, ast.Compare):
+        operands: list[ast.expr] = [fold_constants(e, constants) for e in [node.left, *node.comparators]]
+        values: list[Any] | None = get_constant_values(operands)
+        if values is not None:
+            result: bool = all(
+                COMPARE_OPERATORS[type(op)](values[i], values[i + 1]) for i, op in enumerate(node.ops)
+            )
+            return ast.Constant(result)
+        return ast.Compare(left=operands[0], ops=node.ops, comparators=operands[1:])
+
+    elif isinstance(node, ast.BoolOp):
+        # and中的真值常量、or中的假值常量可以去掉，遇到相反的常量时整体为该常量
+        is_and: bool = isinstance(node.op, ast.And)
+        items: list[ast.expr] = []
+
+        for e in node.values:
+            e = fold_constants(e, constants)
+            if isinstance(e, ast.Constant):
+                if bool(e.value) == is_and:
+                    continue
+                return ast.Constant(not is_and)
+            items.append(e)
+
+        if not items:
+            return ast.Constant(is_and)
+        elif len(items) == 1:
+            return items[0]
+        return ast.BoolOp(op=node.op, values=items)
+
+    elif isinstance(node, ast.Call):
+        args: list[ast.expr] = [fold_constants(e, constants) for e in node.args]
+        arg_values: list[Any] | None = get_constant_values(args)
+        if arg_values is not None:
+            return ast.Constant(FUNCTIONS[cast(ast.Name, node.func).id](*arg_values))
+        return ast.Call(func=node.func, args=args, keywords=[])
+
+    return node
+
+
+def get_constant_values(nodes: list[ast.expr]) -> list[Any] | None:
+    """节点全部为常量时返回常量值，否则返回None"""
+    values: list[Any] = []
+    for node in nodes:
+        if not isinstance(node, ast.Constant):
+            return None
+        values.append(node.value)
+    return values
+
+
+def to_source(node: ast.expr) -> str:
+    """生成Python源码（请求变量替换为委托请求的属性访问）"""
+    class Transformer(ast.NodeTransformer):
+        def visit_Name(self, name: ast.Name) -> ast.expr:
+            if name.id in REQUEST_VARIABLES:
+                return ast.parse(REQUEST_VARIABLES[name.id], mode="eval").body
+            return name
+
+    tree: ast.expr = Transformer().visit(node)
+    return ast.unparse(ast.fix_missing_locations(tree))
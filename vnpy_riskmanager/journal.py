@@ -0,0 +1,220 @@
+import struct
+from time import monotonic
+from datetime import date, datetime
+from pathlib import Path
+from threading import Thread, Lock, Condition
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+
+from vnpy.trader.object import OrderRequest
+from vnpy.trader.constant import Direction, Offset, OrderType
+
+from .utility import get_trading_day
+
+
+# 文件头：魔数、版本号、单条记录字节数
+MAGIC: bytes = b"VNRJ"
+VERSION: int = 1
+HEADER_FORMAT: str = "<4sII4x"
+HEADER_SIZE: int = struct.calcsize(HEADER_FORMAT)
+
+# 检查结果代码
+REASON_PASS: int = 0            # 通过
+REASON_RULE: int = 1            # 规则拦截
+REASON_HALT: int = 2            # 全局暂停交易
+
+# 枚举类型和代码
+DIRECTIONS: list[Direction] = list(Direction)
+OFFSETS: list[Offset] = list(Offset)
+ORDER_TYPES: list[OrderType] = list(OrderType)
+
+DIRECTION_CODES: dict[Direction, int] = {v: i for i, v in enumerate(DIRECTIONS)}
+OFFSET_CODES: dict[Offset, int] = {v: i for i, v in enumerate(OFFSETS)}
+ORDER_TYPE_CODES: dict[OrderType, int] = {v: i for i, v in enumerate(ORDER_TYPES)}
+
+# 记录格式（字符串字段为UTF-8编码，超长时截断）
+JOURNAL_DTYPE: np.dtype = np.dtype([
+    ("timestamp", "<f8"),
+    ("vt_symbol", "S32"),
+    ("direction", "u1"),
+    ("offset", "u1"),
+    ("type", "u1"),
+    ("price", "<f8"),
+    ("volume", "<f8"),
+    ("reference", "S32"),
+    ("allowed", "u1"),
+    ("reason", "u1"),
+    ("rule", "S32"),
+    ("latency", "<u4"),
+])
+
+
+class RiskJournal:
+    """
+    风控决策审计日志
+
+    记录每一笔委托检查（时间戳、委托请求、检查结果、拦截规则、检查耗时），
+    下单线程只将记录追加到内存缓冲，由后台线程批量编码为定长二进制记录，按交易日追加写入文件。
+    缓冲区达到上限时丢弃新记录并计数，保证不会阻塞下单。
+    """
+
+    def __init__(
+        self,
+        folder: str | Path,
+        interval: float = 1.0,
+        max_records: int = 1_000_000,
+        on_error: Callable[[str], None] | None = None
+    ) -> None:
+        """构造函数"""
+        self.folder: Path = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+
+        self.interval: float = interval
+        self.max_records: int = max_records
+        self.on_error: Callable[[str], None] | None = on_error
+
+        self.records: list[tuple] = []
+        self.lock: Lock = Lock()
+
+        self.record_count: int = 0
+        self.write_count: int = 0
+        self.dropped_count: int = 0
+
+        self.active: bool = True
+        self.condition: Condition = Condition()
+
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def record(
+        self,
+        timestamp: float,
+        req: OrderRequest,
+        allowed: bool,
+        reason: int,
+        rule: str,
+        latency: int
+    ) -> None:
+        """添加一条检查记录（只追加到内存缓冲）"""
+        with self.lock:
+            if len(self.records) >= self.max_records:
+                self.dropped_count += 1
+                return
+
+            self.records.append((timestamp, req, allowed, reason, rule, latency))
+            self.record_count += 1
+
+    def run(self) -> None:
+        """写入线程"""
+        next_time: float = monotonic() + self.interval
+
+        while True:
+            with self.condition:
+                while self.active:
+                    remaining: float = next_time - monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+            next_time = monotonic() + self.interval
+
+            with self.lock:
+                records: list[tuple] = self.records
+                self.records = []
+
+            if records:
+                self.write(records)
+
+            if not self.active:
+                return
+
+    def write(self, records: list[tuple]) -> None:
+        """按每条记录所属的交易日分组（20点后的夜盘归属下一交易日），编码并追加写入到交易日文件"""
+        groups: dict[date, list[tuple]] = {}
+        for record in records:
+            trading_day: date = get_trading_day(datetime.fromtimestamp(record[0]))
+            groups.setdefault(trading_day, []).append(record)
+
+        for trading_day, day_records in groups.items():
+            self.write_file(trading_day, day_records)
+
+    def write_file(self, trading_day: date, records: list[tuple]) -> None:
+        """编码并追加写入到交易日文件"""
+        try:
+            data: np.ndarray = encode_records(records)
+
+            filepath: Path = self.folder.joinpath(f"{trading_day:%Y%m%d}.rjnl")
+
+            with open(filepath, "ab") as f:
+                if not f.tell():
+                    f.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, JOURNAL_DTYPE.itemsize))
+                f.write(data.tobytes())
+
+            self.write_count += len(records)
+        except Exception as ex:
+            self.dropped_count += len(records)
+            if self.on_error:
+                self.on_error(f"风控审计日志写入失败：{ex}")
+
+    def close(self) -> None:
+        """写入剩余记录后停止线程"""
+        with self.condition:
+            self.active = False
+            self.condition.notify()
+
+        self.thread.join()
+
+
+def encode_records(records: list[tuple]) -> np.ndarray:
+    """将检查记录编码为结构化数组"""
+    data: np.ndarray = np.empty(len(records), dtype=JOURNAL_DTYPE)
+
+    reqs: list[OrderRequest] = [r[1] for r in records]
+
+    data["timestamp"] = [r[0] for r in records]
+    data["vt_symbol"] = [req.vt_symbol.encode("utf-8")[:32] for req in reqs]
+    data["direction"] = [DIRECTION_CODES.get(req.direction, 255) for req in reqs]
+    data["offset"] = [OFFSET_CODES.get(req.offset, 255) for req in reqs]
+    data["type"] = [ORDER_TYPE_CODES.get(req.type, 255) for req in reqs]
+    data["price"] = [req.price for req in reqs]
+    data["volume"] = [req.volume for req in reqs]
+    data["reference"] = [req.reference.encode("utf-8")[:32] for req in reqs]
+    data["allowed"] = [r[2] for r in records]
+    data["reason"] = [r[3] for r in records]
+    data["rule"] = [r[4].encode("utf-8")[:32] for r in records]
+    data["latency"] = [min(r[5], 0xFFFFFFFF) for r in records]
+
+    return data
+
+
+def load_journal(filepath: str | Path) -> np.ndarray:
+    """读取审计日志文件，返回结构化数组"""
+    with open(filepath, "rb") as f:
+        magic, version, itemsize = struct.unpack(HEADER_FORMAT, f.read(HEADER_SIZE))
+
+    if magic != MAGIC or version != VERSION or itemsize != JOURNAL_DTYPE.itemsize:
+        raise ValueError(f"审计日志文件格式不匹配：{filepath}")
+
+    data: np.ndarray = np.fromfile(filepath, dtype=JOURNAL_DTYPE, offset=HEADER_SIZE)
+    return data
+
+
+def load_journal_df(filepath: str | Path) -> Any:
+    """读取审计日志文件，返回pandas DataFrame（字符串和枚举字段已解码）"""
+    import pandas as pd
+
+    data: np.ndarray = load_journal(filepath)
+    df: Any = pd.DataFrame(data)
+
+    df["datetime"] = pd.to_datetime(df["timestamp"].map(datetime.fromtimestamp))
+    for name in ["vt_symbol", "reference", "rule"]:
+        df[name] = df[name].str.decode("utf-8", errors="ignore")
+
+    df["direction"] = df["direction"].map({i: v.value for i, v in enumerate(DIRECTIONS)})
+    df["offset"] = df["offset"].map({i: v.value for i, v in enumerate(OFFSETS)})
+    df["type"] = df["type"].map({i: v.value for i, v in enumerate(ORDER_TYPES)})
+    df["allowed"] = df["allowed"].astype(bool)
+
+    return df
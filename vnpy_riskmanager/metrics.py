@@ -0,0 +1,262 @@
+from bisect import bisect_left
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread
+from time import time
+from typing import Any, TYPE_CHECKING
+
+from .utility import get_limit, get_utilization
+
+if TYPE_CHECKING:
+    from .engine import RiskEngine
+
+
+# 检查耗时直方图的分桶上界（纳秒）
+LATENCY_BOUNDS: list[int] = [
+    1_000, 2_000, 5_000, 10_000, 20_000, 50_000, 100_000, 200_000, 500_000, 1_000_000, 10_000_000
+]
+
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class LatencyHistogram:
+    """检查耗时直方图（固定分桶，在引擎锁内更新）"""
+
+    def __init__(self, bounds: list[int] = LATENCY_BOUNDS) -> None:
+        """构造函数"""
+        self.bounds: list[int] = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.total: int = 0
+
+    def add(self, latency: int) -> None:
+        """添加一次检查耗时（纳秒）"""
+        self.counts[bisect_left(self.bounds, latency)] += 1
+        self.total += latency
+
+
+class RiskMetrics:
+    """
+    风控指标导出
+
+    引擎在定时事件中（引擎锁内）按固定间隔生成只读快照并整体替换引用，
+    HTTP线程只读取最新快照的引用并渲染为Prometheus文本格式，采集请求不会访问规则或引擎状态。
+    """
+
+    def __init__(self, risk_engine: "RiskEngine", host: str, port: int, interval: int = 5) -> None:
+        """构造函数"""
+        self.risk_engine: RiskEngine = risk_engine
+        self.host: str = host
+        self.port: int = port
+        self.interval: int = interval
+
+        self.histogram: LatencyHistogram = LatencyHistogram()
+
+        self.snapshot: dict[str, Any] = {}
+        self.update_time: float = 0
+
+        # 渲染结果缓存：(快照, 文本)
+        self.rendered: tuple[dict[str, Any], bytes] = ({}, b"")
+
+        self.server: ThreadingHTTPServer | None = None
+        self.thread: Thread | None = None
+
+    def start(self) -> None:
+        """启动HTTP服务"""
+        metrics: RiskMetrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] not in {"/", "/metrics"}:
+                    self.send_error(404)
+                    return
+
+                body: bytes = metrics.render()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self.server = ThreadingHTTPServer((self.host, self.port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def close(self) -> None:
+        """停止HTTP服务"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def add_latency(self, latency: int) -> None:
+        """记录检查耗时（在引擎锁内调用）"""
+        self.histogram.add(latency)
+
+    def on_timer(self) -> None:
+        """定时生成快照（在引擎锁内调用）"""
+        now: float = time()
+        if now - self.update_time < self.interval:
+            return
+        self.update_time = now
+
+        self.update_snapshot()
+
+    def update_snapshot(self) -> None:
+        """生成快照（在引擎锁内调用，所有数据均复制为不可变的值）"""
+        engine: RiskEngine = self.risk_engine
+
+        rules: list[tuple] = []
+        for rule in engine.rules.values():
+            data: dict[str, Any] = rule.get_data()
+            parameters: dict = data["parameters"]
+
+            parameter_values: list[tuple[str, float]] = [
+                (name, float(value)) for name, value in parameters.items() if is_number(value)
+            ]
+
+            variable_values: list[tuple[str, str, float]] = []
+            utilizations: list[tuple[str, str, float]] = []
+
+            for name, value in data["variables"].items():
+                items: list[tuple[str, Any]]
+                if isinstance(value, dict):
+                    items = [(str(k), v) for k, v in value.items() if is_number(v)]
+                elif is_number(value):
+                    items = [("", value)]
+                else:
+                    continue
+
+                limit: Any = get_limit(name, parameters)
+
+                for key, v in items:
+                    variable_values.append((name, key, float(v)))
+
+                    utilization: float | None = get_utilization(v, limit)
+                    if utilization is not None:
+                        utilizations.append((name, key, utilization))
+
+            rules.append((data["class_name"], rule.active, parameter_values, variable_values, utilizations))
+
+        histogram: LatencyHistogram = self.histogram
+        cache_stats: dict[str, Any] = engine.get_cache_stats()
+
+        snapshot: dict[str, Any] = {
+            "time": engine.get_time(),
+            "check_count": engine.check_count,
+            "reject_count": engine.reject_count,
+            "halted": engine.halted,
+            "cache_hit_count": cache_stats["hit_count"],
+            "cache_miss_count": cache_stats["miss_count"],
+            "latency_bounds": tuple(histogram.bounds),
+            "latency_counts": tuple(histogram.counts),
+            "latency_total": histogram.total,
+            "rules": tuple(rules),
+        }
+
+        if engine.journal:
+            snapshot["journal_record_count"] = engine.journal.record_count
+            snapshot["journal_dropped_count"] = engine.journal.dropped_count
+
+        # 整体替换引用，HTTP线程读到的始终是完整的快照
+        self.snapshot = snapshot
+
+    def render(self) -> bytes:
+        """将最新快照渲染为Prometheus文本格式（快照未变化时返回缓存）"""
+        snapshot: dict[str, Any] = self.snapshot
+
+        rendered: tuple[dict[str, Any], bytes] = self.rendered
+        if rendered[0] is snapshot:
+            return rendered[1]
+
+        lines: list[str] = []
+
+        def add_metric(name: str, metric_type: str, description: str, samples: list[tuple[str, Any]]) -> None:
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {format_value(value)}")
+
+        if snapshot:
+            add_metric("vnpy_risk_snapshot_timestamp_seconds", "gauge", "快照生成时间", [("", snapshot["time"])])
+            add_metric("vnpy_risk_checks_total", "counter", "委托检查次数", [("", snapshot["check_count"])])
+            add_metric("vnpy_risk_rejects_total", "counter", "委托拦截次数", [("", snapshot["reject_count"])])
+            add_metric("vnpy_risk_halted", "gauge", "全局暂停交易状态", [("", int(snapshot["halted"]))])
+            add_metric("vnpy_risk_cache_hits_total", "counter", "检查结果缓存命中次数", [("", snapshot["cache_hit_count"])])
+            add_metric("vnpy_risk_cache_misses_total", "counter", "检查结果缓存未命中次数", [("", snapshot["cache_miss_count"])])
+
+            if "journal_record_count" in snapshot:
+                add_metric("vnpy_risk_journal_records_total", "counter", "审计日志记录数量", [("", snapshot["journal_record_count"])])
+                add_metric("vnpy_risk_journal_dropped_total", "counter", "审计日志丢弃数量", [("", snapshot["journal_dropped_count"])])
+
+            # 检查耗时直方图（秒，累计计数）
+            samples: list[tuple[str, Any]] = []
+            cumulative: int = 0
+            for bound, count in zip(snapshot["latency_bounds"], snapshot["latency_counts"], strict=False):
+                cumulative += count
+                samples.append((format_labels(le=format_value(bound / 1e9)), cumulative))
+
+            count = sum(snapshot["latency_counts"])
+            samples.append((format_labels(le="+Inf"), count))
+            add_metric("vnpy_risk_check_latency_seconds", "histogram", "委托检查耗时", [])
+            for labels, value in samples:
+                lines.append(f"vnpy_risk_check_latency_seconds_bucket{labels} {value}")
+            lines.append(f"vnpy_risk_check_latency_seconds_sum {format_value(snapshot['latency_total'] / 1e9)}")
+            lines.append(f"vnpy_risk_check_latency_seconds_count {count}")
+
+            # 规则指标
+            active_samples: list[tuple[str, Any]] = []
+            parameter_samples: list[tuple[str, Any]] = []
+            variable_samples: list[tuple[str, Any]] = []
+            utilization_samples: list[tuple[str, Any]] = []
+
+            for rule_name, active, parameters, variables, utilizations in snapshot["rules"]:
+                active_samples.append((format_labels(rule=rule_name), int(active)))
+
+                for name, value in parameters:
+                    parameter_samples.append((format_labels(rule=rule_name, name=name), value))
+
+                for name, key, value in variables:
+                    variable_samples.append((format_labels(rule=rule_name, name=name, key=key), value))
+
+                for name, key, value in utilizations:
+                    utilization_samples.append((format_labels(rule=rule_name, name=name, key=key), value))
+
+            add_metric("vnpy_risk_rule_active", "gauge", "规则启用状态", active_samples)
+            add_metric("vnpy_risk_rule_parameter", "gauge", "规则参数", parameter_samples)
+            add_metric("vnpy_risk_rule_variable", "gauge", "规则变量", variable_samples)
+            add_metric("vnpy_risk_limit_utilization", "gauge", "规则变量相对上限参数的使用率", utilization_samples)
+
+        body: bytes = ("\n".join(lines) + "\n").encode("utf-8")
+        self.rendered = (snapshot, body)
+        return body
+
+
+def is_number(value: Any) -> bool:
+    """是否为数值（布尔值按数值处理）"""
+    return isinstance(value, int | float)
+
+
+def format_value(value: Any) -> str:
+    """格式化指标数值"""
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        elif value in (float("inf"), float("-inf")):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+    return str(int(value))
+
+
+def format_labels(**labels: str) -> str:
+    """格式化标签（转义反斜杠、引号和换行）"""
+    items: list[str] = []
+    for name, value in labels.items():
+        value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        items.append(f'{name}="{value}"')
+    return "{" + ",".join(items) + "}"
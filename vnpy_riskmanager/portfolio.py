@@ -0,0 +1,115 @@
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from vnpy.trader.object import OrderRequest, TradeData
+from vnpy.trader.constant import Direction
+
+from .template import RuleTemplate
+
+if TYPE_CHECKING:
+    from .engine import RiskEngine
+
+
+class PortfolioRuleTemplate(RuleTemplate):
+    """
+    组合风控规则模板
+
+    组合层面的重计算（VaR、压力测试等）在后台线程中执行，计算完成后发布
+    按合约和方向预计算的放行标记，事前检查时只做一次字典查询。
+    """
+
+    def __init__(self, risk_engine: "RiskEngine", setting: dict) -> None:
+        """构造函数"""
+        # 预计算结果：(放行标记, 未知合约默认放行, 拦截原因)，整体替换以保证原子性
+        self.gate: tuple[dict[tuple[str, Direction], bool], bool, str] = ({}, True, "")
+
+        # 默认计算间隔（子类需在parameters中声明calc_interval以支持配置）
+        self.calc_interval: int = 5
+
+        # 后台计算状态
+        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self.calculating: bool = False
+        self.calc_pending: bool = False
+        self.timer_count: int = 0
+
+        super().__init__(risk_engine, setting)
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托（只读取预计算结果）"""
+        flags, default_allowed, reason = self.gate
+
+        if not flags.get((req.vt_symbol, req.direction), default_allowed):
+            self.write_log(f"{reason}：{req}")
+            return False
+
+        return True
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送（停用时不计算）"""
+        if self.active:
+            self.trigger_calculation()
+
+    def on_timer(self) -> None:
+        """定时推送（停用时不计算）"""
+        if not self.active:
+            return
+
+        self.timer_count += 1
+
+        if self.timer_count >= self.calc_interval or self.calc_pending:
+            self.timer_count = 0
+            self.trigger_calculation()
+
+    def update_setting(self, rule_setting: dict) -> None:
+        """更新风控规则参数（停用时清除已发布的放行标记，重新启用后等待新的计算结果）"""
+        super().update_setting(rule_setting)
+
+        if not self.active:
+            self.gate = ({}, True, "")
+
+    def trigger_calculation(self) -> None:
+        """在事件线程中生成快照，并提交到后台线程计算"""
+        if self.calculating:
+            self.calc_pending = True
+            return
+
+        self.calculating = True
+        self.calc_pending = False
+
+        snapshot: Any = self.create_snapshot()
+        self.executor.submit(self.run_calculation, snapshot)
+
+    def run_calculation(self, snapshot: Any) -> None:
+        """后台线程执行计算"""
+        try:
+            self.calculate(snapshot)
+        except Exception:
+            self.risk_engine.main_engine.write_log(
+                f"组合风控规则[{self.name}]计算出错：{traceback.format_exc()}",
+                source="RiskEngine"
+            )
+        finally:
+            self.calculating = False
+
+    def publish(
+        self,
+        flags: dict[tuple[str, Direction], bool],
+        default_allowed: bool = True,
+        reason: str = ""
+    ) -> None:
+        """发布预计算的放行标记（后台线程调用）"""
+        self.gate = (flags, default_allowed, reason)
+        self.put_event()
+
+    def close(self) -> None:
+        """停止后台计算线程（引擎关闭时调用）"""
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def create_snapshot(self) -> Any:
+        """生成计算所需的数据快照（事件线程中调用，子类重写）"""
+        return None
+
+    def calculate(self, snapshot: Any) -> None:
+        """基于快照执行计算并调用publish发布结果（后台线程中调用，子类重写）"""
+        pass
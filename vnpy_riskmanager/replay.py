@@ -0,0 +1,420 @@
+import re
+import json
+import time
+import typing
+from enum import Enum
+from datetime import datetime
+from dataclasses import fields
+from collections import defaultdict
+from collections.abc import Callable
+from pathlib import Path
+from types import UnionType
+from typing import Any, TextIO
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.event import (
+    EVENT_TICK,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT
+)
+from vnpy.trader.object import (
+    OrderRequest,
+    CancelRequest,
+    TickData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    ContractData
+)
+from vnpy.trader.engine import MainEngine
+
+from .engine import RiskEngine
+from .clock import SimulatedClock
+from .base import EVENT_RISK_NOTIFY
+
+
+# 记录类型和数据类
+RECORD_CLASSES: dict[str, type] = {
+    "request": OrderRequest,
+    "tick": TickData,
+    "order": OrderData,
+    "trade": TradeData,
+    "position": PositionData,
+    "account": AccountData,
+    "contract": ContractData
+}
+
+# 记录类型和事件类型
+RECORD_EVENTS: dict[str, str] = {
+    "tick": EVENT_TICK,
+    "order": EVENT_ORDER,
+    "trade": EVENT_TRADE,
+    "position": EVENT_POSITION,
+    "account": EVENT_ACCOUNT,
+    "contract": EVENT_CONTRACT
+}
+
+
+def to_dict(obj: Any) -> dict:
+    """将数据对象转换为可JSON序列化的字典"""
+    d: dict = {}
+
+    for field in fields(obj):
+        if not field.init:
+            continue
+
+        value: Any = getattr(obj, field.name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+
+        d[field.name] = value
+
+    return d
+
+
+# 数据类字段类型注解缓存
+TYPE_HINTS: dict[type, dict[str, Any]] = {}
+
+
+def from_dict(cls: type, d: dict) -> Any:
+    """从字典还原数据对象"""
+    hints: dict[str, Any] | None = TYPE_HINTS.get(cls, None)
+    if hints is None:
+        hints = typing.get_type_hints(cls)
+        TYPE_HINTS[cls] = hints
+
+    kwargs: dict = {}
+    for name, value in d.items():
+        if value is not None:
+            value = convert_value(hints[name], value)
+        kwargs[name] = value
+
+    return cls(**kwargs)
+
+
+def convert_value(hint: Any, value: Any) -> Any:
+    """按类型注解转换字段值"""
+    # 可选类型取第一个非None类型
+    if isinstance(hint, UnionType):
+        hint = typing.get_args(hint)[0]
+
+    if isinstance(hint, type):
+        if issubclass(hint, Enum):
+            return hint(value)
+        elif issubclass(hint, datetime):
+            return datetime.fromisoformat(value)
+
+    return value
+
+
+class RiskRecorder:
+    """
+    风控数据记录器
+
+    记录委托请求（含发单结果）和交易事件到JSONL文件，用于离线回放。
+    需要在风控引擎之后创建，以便记录到风控检查的结果。
+    """
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine, filepath: str | Path) -> None:
+        """构造函数"""
+        self.main_engine: MainEngine = main_engine
+        self.event_engine: EventEngine = event_engine
+
+        self.file: TextIO = open(filepath, "a", encoding="utf-8")
+
+        for record_type, event_type in RECORD_EVENTS.items():
+            self.event_engine.register(event_type, self.create_handler(record_type))
+
+        self._send_order: Callable[[OrderRequest, str], str] = self.main_engine.send_order
+        self.main_engine.send_order = self.send_order     # type: ignore
+
+    def create_handler(self, record_type: str) -> Callable[[Event], None]:
+        """创建事件记录函数"""
+        def process_event(event: Event) -> None:
+            self.write_record(record_type, event.data)
+
+        return process_event
+
+    def send_order(self, req: OrderRequest, gateway_name: str) -> str:
+        """记录委托请求和发单结果"""
+        vt_orderid: str = self._send_order(req, gateway_name)
+        self.write_record("request", req, gateway_name=gateway_name, vt_orderid=vt_orderid)
+        return vt_orderid
+
+    def write_record(self, record_type: str, data: Any, **extra: Any) -> None:
+        """写入一条记录"""
+        record: dict = {
+            "type": record_type,
+            "time": datetime.now().isoformat(),
+            "data": to_dict(data)
+        }
+        record.update(extra)
+
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        """关闭记录文件"""
+        self.file.close()
+
+
+class ReplayEventEngine:
+    """回放事件引擎（同步处理事件，不启动线程）"""
+
+    def __init__(self) -> None:
+        """构造函数"""
+        self.handlers: defaultdict[str, list[Callable[[Event], None]]] = defaultdict(list)
+
+    def register(self, type: str, handler: Callable[[Event], None]) -> None:
+        """注册事件处理函数"""
+        if handler not in self.handlers[type]:
+            self.handlers[type].append(handler)
+
+    def unregister(self, type: str, handler: Callable[[Event], None]) -> None:
+        """注销事件处理函数"""
+        if handler in self.handlers[type]:
+            self.handlers[type].remove(handler)
+
+    def put(self, event: Event) -> None:
+        """立即处理事件"""
+        for handler in self.handlers[event.type]:
+            handler(event)
+
+    def start(self) -> None:
+        """启动（无操作）"""
+        pass
+
+    def stop(self) -> None:
+        """停止（无操作）"""
+        pass
+
+
+class ReplayMainEngine:
+    """回放主引擎（基于记录数据提供查询，发单时返回记录中的委托号）"""
+
+    def __init__(self, event_engine: ReplayEventEngine) -> None:
+        """构造函数"""
+        self.event_engine: ReplayEventEngine = event_engine
+
+        self.contracts: dict[str, ContractData] = {}
+        self.positions: dict[str, PositionData] = {}
+        self.accounts: dict[str, AccountData] = {}
+        self.active_orders: dict[str, OrderData] = {}
+
+        self.next_orderid: str = ""
+        self.order_count: int = 0
+        self.logs: list[str] = []
+
+    def update_record(self, record_type: str, data: Any) -> None:
+        """更新查询数据"""
+        if record_type == "contract":
+            self.contracts[data.vt_symbol] = data
+        elif record_type == "position":
+            self.positions[data.vt_positionid] = data
+        elif record_type == "account":
+            self.accounts[data.vt_accountid] = data
+        elif record_type == "order":
+            if data.is_active():
+                self.active_orders[data.vt_orderid] = data
+            else:
+                self.active_orders.pop(data.vt_orderid, None)
+
+    def send_order(self, req: OrderRequest, gateway_name: str) -> str:
+        """发送委托（优先返回记录中的委托号）"""
+        self.order_count += 1
+        return self.next_orderid or f"{gateway_name}.REPLAY_{self.order_count}"
+
+    def cancel_order(self, req: CancelRequest, gateway_name: str) -> None:
+        """撤销委托"""
+        pass
+
+    def write_log(self, msg: str, source: str = "") -> None:
+        """记录日志"""
+        self.logs.append(msg)
+
+    def get_contract(self, vt_symbol: str) -> ContractData | None:
+        """查询合约"""
+        return self.contracts.get(vt_symbol, None)
+
+    def get_all_contracts(self) -> list[ContractData]:
+        """查询全部合约"""
+        return list(self.contracts.values())
+
+    def get_all_positions(self) -> list[PositionData]:
+        """查询全部持仓"""
+        return list(self.positions.values())
+
+    def get_all_accounts(self) -> list[AccountData]:
+        """查询全部资金"""
+        return list(self.accounts.values())
+
+    def get_all_active_orders(self) -> list[OrderData]:
+        """查询全部活动委托"""
+        return list(self.active_orders.values())
+
+
+class ReplayRiskEngine(RiskEngine):
+    """
+    回放风控引擎
+
+    不连接多进程共享计数器、不写审计日志、不启动指标导出服务，避免影响实盘的计数、
+    日志和监控；同时不创建配置中的影子规则和耗时看门狗，回放结果只反映规则本身的决策。
+    """
+
+    def init_shared_counter(self) -> None:
+        """不创建共享计数器"""
+        pass
+
+    def init_journal(self) -> None:
+        """不创建审计日志"""
+        pass
+
+    def init_metrics(self) -> None:
+        """不启动指标导出服务"""
+        pass
+
+    def init_watchdog(self) -> None:
+        """不创建耗时看门狗"""
+        pass
+
+    def init_shadow(self) -> None:
+        """不创建影子规则"""
+        pass
+
+
+class RiskReplayer:
+    """
+    风控回放器
+
+    将记录的委托请求、委托、成交、行情等数据按顺序输入真实的风控引擎，
+    统计吞吐量、检查延迟分位数、拦截决策（与记录时的差异）和规则最终状态。
+    """
+
+    def __init__(self, rule_settings: dict[str, dict] | None = None) -> None:
+        """构造函数（rule_settings用于覆盖规则参数，验证参数调整的效果）"""
+        self.event_engine: ReplayEventEngine = ReplayEventEngine()
+        self.main_engine: ReplayMainEngine = ReplayMainEngine(self.event_engine)
+        self.risk_engine: RiskEngine = ReplayRiskEngine(self.main_engine, self.event_engine)    # type: ignore
+
+        # 使用模拟时钟，按记录时间戳推进，定时回调不依赖实际时间
+        self.clock: SimulatedClock = SimulatedClock()
+        self.risk_engine.set_clock(self.clock)
+
+        for rule_name, setting in (rule_settings or {}).items():
+            self.risk_engine.rules[rule_name].update_setting(setting)
+
+        # 拦截原因统计
+        self.notify_msgs: list[str] = []
+        self.event_engine.register(EVENT_RISK_NOTIFY, self.process_notify_event)
+
+        self.records: list[tuple[str, datetime | None, Any, dict]] = []
+
+    def process_notify_event(self, event: Event) -> None:
+        """收集风控通知"""
+        self.notify_msgs.append(event.data)
+
+    def load(self, filepath: str | Path) -> int:
+        """加载记录文件，返回记录数量"""
+        with open(filepath, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                record: dict = json.loads(line)
+                record_type: str = record["type"]
+                data: Any = from_dict(RECORD_CLASSES[record_type], record["data"])
+
+                dt: datetime | None = None
+                if "time" in record:
+                    dt = datetime.fromisoformat(record["time"])
+
+                self.records.append((record_type, dt, data, record))
+
+        return len(self.records)
+
+    def run(self) -> dict[str, Any]:
+        """执行回放，返回统计结果"""
+        latencies: list[int] = []
+        reasons: defaultdict[str, int] = defaultdict(int)
+        request_count: int = 0
+        reject_count: int = 0
+        changed_count: int = 0
+
+        start_timestamp: float = 0
+        send_order: Callable = self.main_engine.send_order
+        start_time: float = time.perf_counter()
+
+        for record_type, dt, data, record in self.records:
+            # 按记录时间推进模拟时钟（每经过一秒执行一次定时回调）
+            if dt:
+                timestamp: float = dt.timestamp()
+                if not start_timestamp:
+                    start_timestamp = timestamp
+                self.risk_engine.advance_clock(timestamp)
+
+            if record_type == "request":
+                request_count += 1
+                self.main_engine.next_orderid = record.get("vt_orderid", "")
+                msg_count: int = len(self.notify_msgs)
+
+                t: int = time.perf_counter_ns()
+                vt_orderid: str = send_order(data, record.get("gateway_name", ""))
+                latencies.append(time.perf_counter_ns() - t)
+
+                if not vt_orderid:
+                    reject_count += 1
+                    for msg in self.notify_msgs[msg_count:]:
+                        reasons[self.format_reason(msg)] += 1
+
+                # 记录中有发单结果时，对比拦截决策是否变化
+                if "vt_orderid" in record and bool(vt_orderid) != bool(record["vt_orderid"]):
+                    changed_count += 1
+            else:
+                self.main_engine.update_record(record_type, data)
+                self.event_engine.put(Event(RECORD_EVENTS[record_type], data))
+
+        elapsed_time: float = time.perf_counter() - start_time
+
+        latencies.sort()
+
+        result: dict[str, Any] = {
+            "record_count": len(self.records),
+            "request_count": request_count,
+            "reject_count": reject_count,
+            "changed_count": changed_count,
+            "elapsed_time": elapsed_time,
+            "simulated_time": self.clock.get_time() - start_timestamp if start_timestamp else 0,
+            "record_throughput": len(self.records) / elapsed_time if elapsed_time else 0,
+            "latency_us": {
+                name: self.get_percentile(latencies, percent) / 1000
+                for name, percent in [("p50", 50), ("p90", 90), ("p99", 99), ("max", 100)]
+            },
+            "reject_reasons": dict(sorted(reasons.items(), key=lambda item: item[1], reverse=True)),
+            "variables": {
+                rule.name: self.risk_engine.get_rule_data(rule.name)["variables"]
+                for rule in self.risk_engine.rules.values()
+                if rule.active
+            }
+        }
+
+        # 关闭引擎（停止组合规则的后台线程，写入待保存的配置）
+        self.risk_engine.close()
+
+        return result
+
+    def format_reason(self, msg: str) -> str:
+        """去掉委托内容和具体数值，用于拦截原因归类"""
+        reason: str = msg.rsplit("：", 1)[0]
+        return re.sub(r"[\d.]+", "#", reason)
+
+    def get_percentile(self, values: list[int], percent: float) -> float:
+        """计算分位数"""
+        if not values:
+            return 0
+        ix: int = min(int(len(values) * percent / 100), len(values) - 1)
+        return values[ix]
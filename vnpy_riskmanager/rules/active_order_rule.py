@@ -1,3 +1,5 @@
+from typing import Any
+
 from vnpy.trader.object import OrderRequest, OrderData
 
 from ..template import RuleTemplate
@@ -24,24 +26,64 @@ class ActiveOrderRule(RuleTemplate):
         # 活动委托
         self.active_orders: dict[str, OrderData] = {}
 
+        # 已发出但尚未收到推送的委托号（预占活动委托数量）
+        self.reserved_orderids: set[str] = set()
+
         # 数量统计
         self.active_order_count: int = 0
 
+        # 多进程共享计数器（未启用时为None）
+        self.shared_counter: Any = self.get_shared_counter()
+
     def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
         """检查是否允许委托"""
+        if self.shared_counter:
+            self.active_order_count = self.shared_counter.get_owned("active|order")
+
         if self.active_order_count >= self.active_order_limit:
             self.write_log(f"活动委托数量{self.active_order_count}达到上限{self.active_order_limit}：{req}")
             return False
 
         return True
 
+    def on_send_order(self, req: OrderRequest, vt_orderid: str) -> None:
+        """委托发出"""
+        if vt_orderid in self.active_orders:
+            return
+
+        self.reserved_orderids.add(vt_orderid)
+        self.update_count(1)
+
+    def on_send_result(self, req: OrderRequest, reserve_id: str, vt_orderid: str) -> None:
+        """委托发出结果"""
+        if reserve_id not in self.reserved_orderids:
+            return
+        self.reserved_orderids.remove(reserve_id)
+
+        if vt_orderid and vt_orderid not in self.active_orders:
+            self.reserved_orderids.add(vt_orderid)
+        else:
+            self.update_count(-1)
+
     def on_order(self, order: OrderData) -> None:
         """委托推送"""
+        previous_count: int = len(self.active_orders) + len(self.reserved_orderids)
+
+        # 收到推送后转为活动委托或释放预占
+        self.reserved_orderids.discard(order.vt_orderid)
+
         if order.is_active():
             self.active_orders[order.vt_orderid] = order
         elif order.vt_orderid in self.active_orders:
             self.active_orders.pop(order.vt_orderid)
 
-        self.active_order_count = len(self.active_orders)
+        self.update_count(len(self.active_orders) + len(self.reserved_orderids) - previous_count)
+
+    def update_count(self, delta: int) -> None:
+        """更新活动委托数量（启用共享计数器时发布本进程的数量变化，并读取多进程汇总值）"""
+        if self.shared_counter:
+            self.active_order_count = self.shared_counter.add_owned("active|order", delta)
+        else:
+            self.active_order_count = len(self.active_orders) + len(self.reserved_orderids)
 
         self.put_event()
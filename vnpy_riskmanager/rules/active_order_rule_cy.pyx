@@ -3,6 +3,7 @@ from vnpy.trader.object import OrderRequest, OrderData
 
 # 使用cimport导入Cython扩展类型
 from vnpy_riskmanager.template cimport RuleTemplate
+from vnpy_riskmanager.shared cimport SharedCounter
 
 
 cdef class ActiveOrderRuleCy(RuleTemplate):
@@ -12,6 +13,8 @@ cdef class ActiveOrderRuleCy(RuleTemplate):
     cdef public int active_order_limit
     cdef public int active_order_count
     cdef dict active_orders
+    cdef set reserved_orderids
+    cdef SharedCounter shared_counter
 
     cpdef void on_init(self):
         """初始化"""
@@ -21,11 +24,20 @@ cdef class ActiveOrderRuleCy(RuleTemplate):
         # 活动委托
         self.active_orders = {}
 
+        # 已发出但尚未收到推送的委托号（预占活动委托数量）
+        self.reserved_orderids = set()
+
         # 数量统计
         self.active_order_count = 0
 
+        # 多进程共享计数器（未启用时为None）
+        self.shared_counter = self.get_shared_counter()
+
     cpdef bint check_allowed(self, object req, str gateway_name):
         """检查是否允许委托"""
+        if self.shared_counter is not None:
+            self.active_order_count = self.shared_counter.get_owned("active|order")
+
         if self.active_order_count >= self.active_order_limit:
             msg = f"活动委托数量{self.active_order_count}达到上限{self.active_order_limit}：{req}"
             self.write_log(msg)
@@ -33,16 +45,46 @@ cdef class ActiveOrderRuleCy(RuleTemplate):
 
         return True
 
+    cpdef void on_send_order(self, object req, str vt_orderid):
+        """委托发出"""
+        if vt_orderid in self.active_orders:
+            return
+
+        self.reserved_orderids.add(vt_orderid)
+        self.update_count(1)
+
+    cpdef void on_send_result(self, object req, str reserve_id, str vt_orderid):
+        """委托发出结果"""
+        if reserve_id not in self.reserved_orderids:
+            return
+        self.reserved_orderids.remove(reserve_id)
+
+        if vt_orderid and vt_orderid not in self.active_orders:
+            self.reserved_orderids.add(vt_orderid)
+        else:
+            self.update_count(-1)
+
     cpdef void on_order(self, object order):
         """委托推送"""
         cdef str vt_orderid = order.vt_orderid
-        
+        cdef int previous_count = len(self.active_orders) + len(self.reserved_orderids)
+
+        # 收到推送后转为活动委托或释放预占
+        self.reserved_orderids.discard(vt_orderid)
+
         if order.is_active():
             self.active_orders[vt_orderid] = order
         elif vt_orderid in self.active_orders:
             self.active_orders.pop(vt_orderid)
 
-        self.active_order_count = len(self.active_orders)
+        self.update_count(len(self.active_orders) + len(self.reserved_orderids) - previous_count)
+
+    cdef void update_count(self, int delta):
+        """更新活动委托数量（启用共享计数器时发布本进程的数量变化，并读取多进程汇总值）"""
+        if self.shared_counter is not None:
+            self.active_order_count = self.shared_counter.add_owned("active|order", delta)
+        else:
+            self.active_order_count = len(self.active_orders) + len(self.reserved_orderids)
 
         self.put_event()
 
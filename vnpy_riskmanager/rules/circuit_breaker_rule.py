@@ -0,0 +1,122 @@
+from collections import deque
+
+from vnpy.trader.object import AccountData
+
+from ..template import RuleTemplate
+
+
+class CircuitBreakerRule(RuleTemplate):
+    """自动熔断风控规则（触发后全局暂停交易）"""
+
+    name: str = "自动熔断检查"
+
+    parameters: dict[str, str] = {
+        "reject_rate_limit": "拦截率上限",
+        "min_check_count": "最小样本检查次数",
+        "window_seconds": "拦截率统计窗口(秒)",
+        "loss_limit": "权益亏损上限",
+        "cancel_on_trip": "熔断时撤销全部委托"
+    }
+
+    variables: dict[str, str] = {
+        "reject_rate": "窗口拦截率",
+        "loss": "权益亏损"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数（为0时不检查）
+        self.reject_rate_limit: float = 0.5
+        self.min_check_count: int = 20
+        self.window_seconds: int = 60
+        self.loss_limit: float = 0
+        self.cancel_on_trip: bool = False
+
+        # 每秒记录一次风控引擎的检查和拦截次数
+        self.samples: deque[tuple[int, int]] = deque()
+
+        # 账户基准权益和当前权益（基准为首次收到或恢复交易时的权益，出入金同样计入亏损）
+        self.start_balances: dict[str, float] = {}
+        self.current_balances: dict[str, float] = {}
+
+        # 上次检查时的全局暂停状态，用于识别恢复交易
+        self.halted: bool = False
+
+        # 统计结果
+        self.reject_rate: float = 0
+        self.loss: float = 0
+
+    def on_timer(self) -> None:
+        """定时推送（停用时不统计，也不会触发熔断）"""
+        if not self.active:
+            self.samples.clear()
+            return
+
+        self.check_resumed()
+
+        self.samples.append((self.risk_engine.check_count, self.risk_engine.reject_count))
+        while len(self.samples) > self.window_seconds + 1:
+            self.samples.popleft()
+
+        start_checks, start_rejects = self.samples[0]
+        end_checks, end_rejects = self.samples[-1]
+
+        check_count: int = end_checks - start_checks
+        if not check_count:
+            return
+
+        self.reject_rate = round((end_rejects - start_rejects) / check_count, 4)
+        self.put_event()
+
+        if (
+            self.reject_rate_limit
+            and check_count >= self.min_check_count
+            and self.reject_rate > self.reject_rate_limit
+        ):
+            self.trip(f"{self.window_seconds}秒内拦截率{self.reject_rate:.2%}超过上限{self.reject_rate_limit:.2%}")
+
+    def on_account(self, account: AccountData) -> None:
+        """资金推送（停用时不统计，启用后以首次收到的权益为基准）"""
+        if not self.active:
+            self.start_balances.clear()
+            return
+
+        self.check_resumed()
+
+        vt_accountid: str = account.vt_accountid
+
+        # 首次收到的权益作为基准权益
+        self.start_balances.setdefault(vt_accountid, account.balance)
+        self.current_balances[vt_accountid] = account.balance
+
+        self.loss = round(sum(self.start_balances.values()) - sum(self.current_balances.values()), 2)
+        self.put_event()
+
+        if self.loss_limit and self.loss > self.loss_limit:
+            self.trip(f"权益亏损{self.loss}超过上限{self.loss_limit}")
+
+    def check_resumed(self) -> None:
+        """恢复交易后重新开始统计（以当前权益为基准，清空暂停期间的拦截样本），避免立即再次熔断"""
+        halted: bool = self.risk_engine.halted
+
+        if self.halted and not halted:
+            self.samples.clear()
+            self.start_balances = dict(self.current_balances)
+
+            self.reject_rate = 0
+            self.loss = 0
+            self.put_event()
+
+        self.halted = halted
+
+    def trip(self, reason: str) -> None:
+        """触发熔断"""
+        if self.risk_engine.halted:
+            return
+
+        self.samples.clear()
+        self.risk_engine.halt(f"自动熔断，{reason}", self.cancel_on_trip)
+        self.halted = True
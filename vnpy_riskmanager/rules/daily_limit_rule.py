@@ -1,4 +1,5 @@
 from collections import defaultdict
+from typing import Any
 
 from vnpy.trader.object import OrderRequest, OrderData, TradeData
 from vnpy.trader.constant import Status
@@ -55,8 +56,14 @@ class DailyLimitRule(RuleTemplate):
         self.contract_cancel_count: dict[str, int] = defaultdict(int)
         self.contract_trade_count: dict[str, int] = defaultdict(int)
 
+        # 多进程共享计数器（未启用时为None）
+        self.shared_counter: Any = self.get_shared_counter()
+
     def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
         """检查是否允许委托"""
+        if self.shared_counter:
+            self.load_shared_counts(req.vt_symbol)
+
         contract_order_count: int = self.contract_order_count[req.vt_symbol]
         if contract_order_count >= self.contract_order_limit:
             self.write_log(f"合约委托笔数{contract_order_count}达到上限{self.contract_order_limit}：{req}")
@@ -86,34 +93,88 @@ class DailyLimitRule(RuleTemplate):
 
         return True
 
+    def on_send_order(self, req: OrderRequest, vt_orderid: str) -> None:
+        """委托发出（发单时即计入委托笔数，收到推送后不再重复计数）"""
+        if vt_orderid not in self.all_orderids:
+            self.add_order(vt_orderid, req.vt_symbol)
+
+    def on_send_result(self, req: OrderRequest, reserve_id: str, vt_orderid: str) -> None:
+        """委托发出结果（发单失败或已由推送计数时撤销预占的委托笔数）"""
+        if reserve_id not in self.all_orderids:
+            return
+        self.all_orderids.remove(reserve_id)
+
+        if vt_orderid:
+            self.all_orderids.add(vt_orderid)
+            return
+
+        vt_symbol: str = req.vt_symbol
+
+        if self.shared_counter:
+            self.total_order_count = self.shared_counter.add("daily|total_order", -1)
+            self.contract_order_count[vt_symbol] = self.shared_counter.add(f"daily|contract_order|{vt_symbol}", -1)
+        else:
+            self.total_order_count -= 1
+            self.contract_order_count[vt_symbol] -= 1
+
+        self.put_event()
+
     def on_order(self, order: OrderData) -> None:
         """委托推送"""
         if order.vt_orderid not in self.all_orderids:
-            self.all_orderids.add(order.vt_orderid)
-            self.total_order_count += 1
-
-            self.contract_order_count[order.vt_symbol] += 1
-
-            self.put_event()
+            self.add_order(order.vt_orderid, order.vt_symbol)
         elif (
             order.status == Status.CANCELLED
             and order.vt_orderid not in self.cancel_orderids
         ):
             self.cancel_orderids.add(order.vt_orderid)
-            self.total_cancel_count += 1
 
-            self.contract_cancel_count[order.vt_symbol] += 1
+            if self.shared_counter:
+                self.total_cancel_count = self.shared_counter.add("daily|total_cancel", 1)
+                self.contract_cancel_count[order.vt_symbol] = self.shared_counter.add(f"daily|contract_cancel|{order.vt_symbol}", 1)
+            else:
+                self.total_cancel_count += 1
+                self.contract_cancel_count[order.vt_symbol] += 1
 
             self.put_event()
 
+    def add_order(self, vt_orderid: str, vt_symbol: str) -> None:
+        """计入委托笔数"""
+        self.all_orderids.add(vt_orderid)
+
+        if self.shared_counter:
+            self.total_order_count = self.shared_counter.add("daily|total_order", 1)
+            self.contract_order_count[vt_symbol] = self.shared_counter.add(f"daily|contract_order|{vt_symbol}", 1)
+        else:
+            self.total_order_count += 1
+            self.contract_order_count[vt_symbol] += 1
+
+        self.put_event()
+
     def on_trade(self, trade: TradeData) -> None:
         """成交推送"""
         if trade.vt_tradeid in self.all_tradeids:
             return
 
         self.all_tradeids.add(trade.vt_tradeid)
-        self.total_trade_count += 1
 
-        self.contract_trade_count[trade.vt_symbol] += 1
+        if self.shared_counter:
+            self.total_trade_count = self.shared_counter.add("daily|total_trade", 1)
+            self.contract_trade_count[trade.vt_symbol] = self.shared_counter.add(f"daily|contract_trade|{trade.vt_symbol}", 1)
+        else:
+            self.total_trade_count += 1
+            self.contract_trade_count[trade.vt_symbol] += 1
 
         self.put_event()
+
+    def load_shared_counts(self, vt_symbol: str) -> None:
+        """从共享计数器读取多进程汇总计数"""
+        counter: Any = self.shared_counter
+
+        self.total_order_count = counter.get("daily|total_order")
+        self.total_cancel_count = counter.get("daily|total_cancel")
+        self.total_trade_count = counter.get("daily|total_trade")
+
+        self.contract_order_count[vt_symbol] = counter.get(f"daily|contract_order|{vt_symbol}")
+        self.contract_cancel_count[vt_symbol] = counter.get(f"daily|contract_cancel|{vt_symbol}")
+        self.contract_trade_count[vt_symbol] = counter.get(f"daily|contract_trade|{vt_symbol}")
@@ -4,6 +4,7 @@ from collections import defaultdict
 from vnpy.trader.constant import Status
 
 from vnpy_riskmanager.template cimport RuleTemplate
+from vnpy_riskmanager.shared cimport SharedCounter
 
 
 cdef class DailyLimitRuleCy(RuleTemplate):
@@ -28,6 +29,8 @@ cdef class DailyLimitRuleCy(RuleTemplate):
     cdef public object contract_cancel_count
     cdef public object contract_trade_count
 
+    cdef SharedCounter shared_counter
+
     cpdef void on_init(self):
         """初始化"""
         # 默认参数
@@ -54,10 +57,16 @@ cdef class DailyLimitRuleCy(RuleTemplate):
         self.contract_cancel_count = defaultdict(int)
         self.contract_trade_count = defaultdict(int)
 
+        # 多进程共享计数器（未启用时为None）
+        self.shared_counter = self.get_shared_counter()
+
     cpdef bint check_allowed(self, object req, str gateway_name):
         """检查是否允许委托"""
         cdef str vt_symbol = req.vt_symbol
 
+        if self.shared_counter is not None:
+            self.load_shared_counts(vt_symbol)
+
         cdef int contract_order_count = self.contract_order_count[vt_symbol]
         if contract_order_count >= self.contract_order_limit:
             self.write_log(f"合约委托笔数{contract_order_count}达到上限{self.contract_order_limit}：{req}")
@@ -87,25 +96,64 @@ cdef class DailyLimitRuleCy(RuleTemplate):
 
         return True
 
+    cpdef void on_send_order(self, object req, str vt_orderid):
+        """委托发出（发单时即计入委托笔数，收到推送后不再重复计数）"""
+        if vt_orderid not in self.all_orderids:
+            self.add_order(vt_orderid, req.vt_symbol)
+
+    cpdef void on_send_result(self, object req, str reserve_id, str vt_orderid):
+        """委托发出结果（发单失败或已由推送计数时撤销预占的委托笔数）"""
+        cdef str vt_symbol = req.vt_symbol
+
+        if reserve_id not in self.all_orderids:
+            return
+        self.all_orderids.remove(reserve_id)
+
+        if vt_orderid:
+            self.all_orderids.add(vt_orderid)
+            return
+
+        if self.shared_counter is not None:
+            self.total_order_count = self.shared_counter.add("daily|total_order", -1)
+            self.contract_order_count[vt_symbol] = self.shared_counter.add(f"daily|contract_order|{vt_symbol}", -1)
+        else:
+            self.total_order_count -= 1
+            self.contract_order_count[vt_symbol] -= 1
+        self.put_event()
+
     cpdef void on_order(self, object order):
         """委托推送"""
         cdef str vt_orderid = order.vt_orderid
         cdef str vt_symbol = order.vt_symbol
 
         if vt_orderid not in self.all_orderids:
-            self.all_orderids.add(vt_orderid)
-            self.total_order_count += 1
-            self.contract_order_count[vt_symbol] += 1
-            self.put_event()
+            self.add_order(vt_orderid, vt_symbol)
         elif (
             order.status == Status.CANCELLED
             and vt_orderid not in self.cancel_orderids
         ):
             self.cancel_orderids.add(vt_orderid)
-            self.total_cancel_count += 1
-            self.contract_cancel_count[vt_symbol] += 1
+
+            if self.shared_counter is not None:
+                self.total_cancel_count = self.shared_counter.add("daily|total_cancel", 1)
+                self.contract_cancel_count[vt_symbol] = self.shared_counter.add(f"daily|contract_cancel|{vt_symbol}", 1)
+            else:
+                self.total_cancel_count += 1
+                self.contract_cancel_count[vt_symbol] += 1
             self.put_event()
 
+    cdef void add_order(self, str vt_orderid, str vt_symbol):
+        """计入委托笔数"""
+        self.all_orderids.add(vt_orderid)
+
+        if self.shared_counter is not None:
+            self.total_order_count = self.shared_counter.add("daily|total_order", 1)
+            self.contract_order_count[vt_symbol] = self.shared_counter.add(f"daily|contract_order|{vt_symbol}", 1)
+        else:
+            self.total_order_count += 1
+            self.contract_order_count[vt_symbol] += 1
+        self.put_event()
+
     cpdef void on_trade(self, object trade):
         """成交推送"""
         cdef str vt_tradeid = trade.vt_tradeid
@@ -113,11 +161,30 @@ cdef class DailyLimitRuleCy(RuleTemplate):
         if vt_tradeid in self.all_tradeids:
             return
 
+        cdef str vt_symbol = trade.vt_symbol
+
         self.all_tradeids.add(vt_tradeid)
-        self.total_trade_count += 1
-        self.contract_trade_count[trade.vt_symbol] += 1
+
+        if self.shared_counter is not None:
+            self.total_trade_count = self.shared_counter.add("daily|total_trade", 1)
+            self.contract_trade_count[vt_symbol] = self.shared_counter.add(f"daily|contract_trade|{vt_symbol}", 1)
+        else:
+            self.total_trade_count += 1
+            self.contract_trade_count[vt_symbol] += 1
         self.put_event()
 
+    cdef void load_shared_counts(self, str vt_symbol):
+        """从共享计数器读取多进程汇总计数"""
+        cdef SharedCounter counter = self.shared_counter
+
+        self.total_order_count = counter.get("daily|total_order")
+        self.total_cancel_count = counter.get("daily|total_cancel")
+        self.total_trade_count = counter.get("daily|total_trade")
+
+        self.contract_order_count[vt_symbol] = counter.get(f"daily|contract_order|{vt_symbol}")
+        self.contract_cancel_count[vt_symbol] = counter.get(f"daily|contract_cancel|{vt_symbol}")
+        self.contract_trade_count[vt_symbol] = counter.get(f"daily|contract_trade|{vt_symbol}")
+
 
 class DailyLimitRule(DailyLimitRuleCy):
     """每日上限检查规则的Python包装类"""
@@ -0,0 +1,120 @@
+from collections.abc import Callable
+
+from vnpy.trader.object import OrderRequest, ContractData
+
+from ..template import RuleTemplate
+from ..expression import LimitExpression, CACHE_KEY_VARIABLES, parse_expressions, get_contract_constants
+
+
+class ExpressionRule(RuleTemplate):
+    """表达式限额检查风控规则（表达式只使用缓存键中的委托变量时为纯函数规则）"""
+
+    name: str = "表达式检查"
+
+    pure: bool = True
+
+    parameters: dict[str, str] = {
+        "expressions": "限额表达式",
+    }
+
+    variables: dict[str, str] = {
+        "expression_count": "表达式数量",
+        "reject_counts": "表达式拦截次数",
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数（多条表达式使用分号分隔）
+        self.expressions: str = ""
+
+        # 变量
+        self.expression_count: int = 0
+        self.reject_counts: dict[str, int] = {}
+
+        self.limit_expressions: list[LimitExpression] = []
+
+        # 合约检查函数缓存：vt_symbol -> (编译时的合约对象, 检查函数)，修改参数或合约对象变化时重新编译
+        self.symbol_checks: dict[str, tuple[ContractData, Callable[[OrderRequest, str], bool]]] = {}
+
+    def update_setting(self, rule_setting: dict) -> None:
+        """更新风控规则参数（表达式不合法时抛出ValueError，不修改当前参数）"""
+        limit_expressions: list[LimitExpression] = self.limit_expressions
+        if "expressions" in rule_setting:
+            limit_expressions = parse_expressions(rule_setting["expressions"])
+
+        super().update_setting(rule_setting)
+
+        self.limit_expressions = limit_expressions
+        self.expression_count = len(limit_expressions)
+        self.reject_counts = {e.text: self.reject_counts.get(e.text, 0) for e in limit_expressions}
+
+        # 表达式使用了方向、开平、来源等缓存键以外的变量时，结果不能按缓存键复用
+        self.pure = all(e.request_variables <= CACHE_KEY_VARIABLES for e in limit_expressions)
+        self.symbol_checks = {}
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托（合约不存在时不检查）"""
+        contract: ContractData | None = self.get_contract(req.vt_symbol)
+        if not contract:
+            return True
+
+        cached: tuple[ContractData, Callable[[OrderRequest, str], bool]] | None = self.symbol_checks.get(req.vt_symbol, None)
+        if cached and cached[0] is contract:
+            return cached[1](req, gateway_name)
+
+        check: Callable[[OrderRequest, str], bool] | None = self.compile_check(req.vt_symbol)
+        if not check:
+            return True
+        return check(req, gateway_name)
+
+    def compile_check(self, vt_symbol: str) -> Callable[[OrderRequest, str], bool] | None:
+        """编译合约专用的检查函数（只包含适用于该合约的表达式，合约常量已折叠）"""
+        contract: ContractData | None = self.get_contract(vt_symbol)
+        if not contract:
+            return None
+
+        constants: dict = get_contract_constants(contract)
+
+        # 检查函数为None表示常量计算出错，拦截该合约的所有委托
+        checks: list[tuple[str, Callable[[OrderRequest, str], bool] | None]] = []
+        for expression in self.limit_expressions:
+            if not expression.is_applicable(constants):
+                continue
+
+            try:
+                func: Callable[[OrderRequest, str], bool] | None = expression.compile(constants)
+            except ValueError as ex:
+                self.write_log(f"{ex}，{vt_symbol}的委托将被拦截")
+                checks.append((expression.text, None))
+                continue
+
+            # 结果恒为真的表达式不需要检查
+            if func:
+                checks.append((expression.text, func))
+
+        reject: Callable[[str, OrderRequest, str], None] = self.reject
+
+        def check_allowed(req: OrderRequest, gateway_name: str) -> bool:
+            for text, func in checks:
+                try:
+                    result: bool = func is not None and func(req, gateway_name)
+                except Exception as ex:
+                    reject(text, req, f"计算错误{ex}")
+                    return False
+
+                if not result:
+                    reject(text, req, "")
+                    return False
+            return True
+
+        self.symbol_checks[vt_symbol] = (contract, check_allowed)
+        return check_allowed
+
+    def reject(self, text: str, req: OrderRequest, msg: str) -> None:
+        """记录拦截"""
+        self.reject_counts[text] = self.reject_counts.get(text, 0) + 1
+        self.write_log(f"不满足限额表达式[{text}]{msg}：{req}")
+        self.put_event()
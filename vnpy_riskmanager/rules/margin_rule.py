@@ -0,0 +1,214 @@
+from vnpy.trader.object import (
+    OrderRequest,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    ContractData
+)
+from vnpy.trader.constant import Direction, Offset
+
+from ..template import RuleTemplate
+
+
+class MarginRule(RuleTemplate):
+    """保证金和资金使用率检查风控规则"""
+
+    name: str = "资金使用率检查"
+
+    parameters: dict[str, str] = {
+        "margin_ratio": "保证金比例",
+        "capital_usage_limit": "资金使用率上限"
+    }
+
+    variables: dict[str, str] = {
+        "total_balance": "账户总权益",
+        "position_margin": "持仓占用保证金",
+        "frozen_margin": "挂单冻结保证金",
+        "capital_usage": "资金使用率"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数
+        self.margin_ratio: float = 0.15
+        self.capital_usage_limit: float = 0.8
+
+        # 账户权益：vt_accountid -> balance
+        self.account_balances: dict[str, float] = {}
+
+        # 持仓保证金：vt_positionid -> margin
+        self.position_margins: dict[str, float] = {}
+
+        # 净持仓模式的持仓数量（多正空负）：vt_positionid -> volume
+        self.net_volumes: dict[str, float] = {}
+
+        # 活动委托冻结保证金：vt_orderid -> margin
+        self.order_margins: dict[str, float] = {}
+
+        # 汇总统计（增量维护）
+        self.total_balance: float = 0
+        self.position_margin: float = 0
+        self.frozen_margin: float = 0
+        self.capital_usage: float = 0
+
+        for account in self.get_all_accounts():
+            self.update_balance(account)
+
+        for position in self.get_all_positions():
+            self.update_position_margin(position)
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        # 平仓委托释放保证金，无需检查
+        if req.offset not in {Offset.OPEN, Offset.NONE}:
+            return True
+
+        # 尚未收到资金数据，或市价类委托无法估算
+        if not self.total_balance or not req.price:
+            return True
+
+        # 净持仓模式只检查超出反向持仓的开仓部分
+        volume: float = req.volume
+        if req.offset == Offset.NONE:
+            volume = self.get_open_volume(gateway_name, req.vt_symbol, req.direction, volume)
+            if not volume:
+                return True
+
+        required_margin: float = self.calculate_margin(req.vt_symbol, req.price, volume)
+        used_margin: float = self.position_margin + self.frozen_margin + required_margin
+        usage: float = used_margin / self.total_balance
+
+        if usage > self.capital_usage_limit:
+            self.write_log(f"预计资金使用率{usage:.2%}超过上限{self.capital_usage_limit:.2%}：{req}")
+            return False
+
+        return True
+
+    def on_order(self, order: OrderData) -> None:
+        """委托推送"""
+        vt_orderid: str = order.vt_orderid
+
+        margin: float = 0
+        if order.is_active() and order.offset in {Offset.OPEN, Offset.NONE}:
+            volume: float = order.volume - order.traded
+            if order.offset == Offset.NONE:
+                volume = self.get_open_volume(order.gateway_name, order.vt_symbol, order.direction, volume)
+            margin = self.calculate_margin(order.vt_symbol, order.price, volume)
+
+        previous: float = self.order_margins.get(vt_orderid, 0)
+        if margin == previous:
+            return
+
+        if margin:
+            self.order_margins[vt_orderid] = margin
+        else:
+            self.order_margins.pop(vt_orderid, None)
+
+        self.frozen_margin += margin - previous
+        self.update_usage()
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送（在下一次持仓推送前临时估算保证金变化）"""
+        if trade.offset == Offset.NONE:
+            self.update_net_trade(trade)
+            return
+
+        margin: float = self.calculate_margin(trade.vt_symbol, trade.price, trade.volume)
+
+        if trade.offset == Offset.OPEN:
+            direction: Direction | None = trade.direction
+        else:
+            # 平仓成交减少反方向持仓
+            if trade.direction == Direction.LONG:
+                direction = Direction.SHORT
+            else:
+                direction = Direction.LONG
+            margin = -margin
+
+        if not direction:
+            return
+
+        vt_positionid: str = f"{trade.gateway_name}.{trade.vt_symbol}.{direction.value}"
+        previous: float = self.position_margins.get(vt_positionid, 0)
+        current: float = max(previous + margin, 0)
+
+        self.position_margins[vt_positionid] = current
+        self.position_margin += current - previous
+        self.update_usage()
+
+    def update_net_trade(self, trade: TradeData) -> None:
+        """净持仓模式的成交（按成交后的净持仓数量估算保证金）"""
+        vt_positionid: str = f"{trade.gateway_name}.{trade.vt_symbol}.{Direction.NET.value}"
+
+        net_volume: float = self.net_volumes.get(vt_positionid, 0)
+        if trade.direction == Direction.LONG:
+            net_volume += trade.volume
+        else:
+            net_volume -= trade.volume
+        self.net_volumes[vt_positionid] = net_volume
+
+        previous: float = self.position_margins.get(vt_positionid, 0)
+        current: float = self.calculate_margin(trade.vt_symbol, trade.price, abs(net_volume))
+
+        self.position_margins[vt_positionid] = current
+        self.position_margin += current - previous
+        self.update_usage()
+
+    def on_position(self, position: PositionData) -> None:
+        """持仓推送"""
+        self.update_position_margin(position)
+        self.update_usage()
+
+    def on_account(self, account: AccountData) -> None:
+        """资金推送"""
+        self.update_balance(account)
+        self.update_usage()
+
+    def calculate_margin(self, vt_symbol: str, price: float, volume: float) -> float:
+        """计算保证金占用"""
+        contract: ContractData | None = self.get_contract(vt_symbol)
+        if not contract:
+            return 0
+        return price * volume * contract.size * self.margin_ratio
+
+    def get_open_volume(self, gateway_name: str, vt_symbol: str, direction: Direction | None, volume: float) -> float:
+        """净持仓模式下委托中的开仓数量（先平掉反向持仓，超出部分为开仓）"""
+        vt_positionid: str = f"{gateway_name}.{vt_symbol}.{Direction.NET.value}"
+        net_volume: float = self.net_volumes.get(vt_positionid, 0)
+
+        if direction == Direction.LONG:
+            close_volume: float = max(-net_volume, 0)
+        else:
+            close_volume = max(net_volume, 0)
+
+        return max(volume - close_volume, 0)
+
+    def update_position_margin(self, position: PositionData) -> None:
+        """基于持仓数据更新保证金占用"""
+        if position.direction == Direction.NET:
+            self.net_volumes[position.vt_positionid] = position.volume
+
+        margin: float = self.calculate_margin(position.vt_symbol, position.price, abs(position.volume))
+
+        previous: float = self.position_margins.get(position.vt_positionid, 0)
+        self.position_margins[position.vt_positionid] = margin
+        self.position_margin += margin - previous
+
+    def update_balance(self, account: AccountData) -> None:
+        """基于资金数据更新账户权益"""
+        previous: float = self.account_balances.get(account.vt_accountid, 0)
+        self.account_balances[account.vt_accountid] = account.balance
+        self.total_balance += account.balance - previous
+
+    def update_usage(self) -> None:
+        """更新资金使用率"""
+        if self.total_balance:
+            self.capital_usage = round((self.position_margin + self.frozen_margin) / self.total_balance, 4)
+        else:
+            self.capital_usage = 0
+
+        self.put_event()
@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 from vnpy.trader.object import OrderRequest, ContractData
 
 from ..template import RuleTemplate
@@ -8,6 +10,8 @@ class OrderSizeRule(RuleTemplate):
 
     name: str = "委托规模检查"
 
+    pure: bool = True
+
     parameters: dict[str, str] = {
         "order_volume_limit": "委托数量上限",
         "order_value_limit": "委托价值上限",
@@ -20,15 +24,37 @@ class OrderSizeRule(RuleTemplate):
 
     def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
         """检查是否允许委托"""
-        if req.volume > self.order_volume_limit:
-            self.write_log(f"委托数量{req.volume}超过上限{self.order_volume_limit}：{req}")
+        contract: ContractData | None = self.get_contract(req.vt_symbol)
+        size: float = contract.size if contract else 0
+
+        return self.check_size(req, self.order_volume_limit, self.order_value_limit, size)
+
+    def compile_check(self, vt_symbol: str) -> Callable[[OrderRequest, str], bool] | None:
+        """编译合约专用的检查函数（合约不存在时返回None，使用check_allowed检查）"""
+        contract: ContractData | None = self.get_contract(vt_symbol)
+        if not contract:
+            return None
+
+        order_volume_limit: int = self.order_volume_limit
+        order_value_limit: float = self.order_value_limit
+        size: float = contract.size
+        check_size: Callable[[OrderRequest, int, float, float], bool] = self.check_size
+
+        def check_allowed(req: OrderRequest, gateway_name: str) -> bool:
+            return check_size(req, order_volume_limit, order_value_limit, size)
+
+        return check_allowed
+
+    def check_size(self, req: OrderRequest, order_volume_limit: int, order_value_limit: float, size: float) -> bool:
+        """检查委托数量和价值（合约乘数为0时不检查委托价值）"""
+        if req.volume > order_volume_limit:
+            self.write_log(f"委托数量{req.volume}超过上限{order_volume_limit}：{req}")
             return False
 
-        contract: ContractData | None = self.get_contract(req.vt_symbol)
-        if contract and req.price:      # 只考虑限价单
-            order_value: float = req.volume * req.price * contract.size
-            if order_value > self.order_value_limit:
-                self.write_log(f"委托价值{order_value}超过上限{self.order_value_limit}：{req}")
+        if size and req.price:      # 只考虑限价单
+            order_value: float = req.volume * req.price * size
+            if order_value > order_value_limit:
+                self.write_log(f"委托价值{order_value}超过上限{order_value_limit}：{req}")
                 return False
 
         return True
@@ -15,28 +15,63 @@ cdef class OrderSizeRuleCy(RuleTemplate):
 
     cpdef bint check_allowed(self, object req, str gateway_name):
         """检查是否允许委托"""
-        cdef object contract
-        cdef float order_value
+        cdef object contract = self.get_contract(req.vt_symbol)
+        cdef double size = contract.size if contract else 0
 
-        if req.volume > self.order_volume_limit:
-            self.write_log(f"委托数量{req.volume}超过上限{self.order_volume_limit}：{req}")
+        return self.check_size(req, self.order_volume_limit, self.order_value_limit, size)
+
+    cpdef object compile_check(self, str vt_symbol):
+        """编译合约专用的检查函数（合约不存在时返回None，使用check_allowed检查）"""
+        cdef object contract = self.get_contract(vt_symbol)
+        if not contract:
+            return None
+
+        return OrderSizeCheck(self, self.order_volume_limit, self.order_value_limit, contract.size)
+
+    cdef bint check_size(self, object req, int order_volume_limit, double order_value_limit, double size):
+        """检查委托数量和价值（合约乘数为0时不检查委托价值）"""
+        cdef double order_value
+
+        if req.volume > order_volume_limit:
+            self.write_log(f"委托数量{req.volume}超过上限{order_volume_limit}：{req}")
             return False
 
-        contract = self.get_contract(req.vt_symbol)
-        if contract and req.price:      # 只考虑限价单
-            order_value = req.volume * req.price * contract.size
-            if order_value > self.order_value_limit:
-                self.write_log(f"委托价值{order_value}超过上限{self.order_value_limit}：{req}")
+        if size and req.price:      # 只考虑限价单
+            order_value = req.volume * req.price * size
+            if order_value > order_value_limit:
+                self.write_log(f"委托价值{order_value}超过上限{order_value_limit}：{req}")
                 return False
 
         return True
 
 
+cdef class OrderSizeCheck:
+    """合约专用的委托规模检查函数（折叠合约乘数和规则参数）"""
+
+    cdef OrderSizeRuleCy rule
+    cdef int order_volume_limit
+    cdef double order_value_limit
+    cdef double size
+
+    def __init__(self, OrderSizeRuleCy rule, int order_volume_limit, double order_value_limit, double size):
+        """构造函数"""
+        self.rule = rule
+        self.order_volume_limit = order_volume_limit
+        self.order_value_limit = order_value_limit
+        self.size = size
+
+    def __call__(self, object req, str gateway_name):
+        """执行检查"""
+        return self.rule.check_size(req, self.order_volume_limit, self.order_value_limit, self.size)
+
+
 class OrderSizeRule(OrderSizeRuleCy):
     """委托规模检查规则的Python包装类"""
 
     name: str = "委托规模检查"
 
+    pure: bool = True
+
     parameters: dict[str, str] = {
         "order_volume_limit": "委托数量上限",
         "order_value_limit": "委托价值上限",
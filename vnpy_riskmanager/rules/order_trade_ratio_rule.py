@@ -0,0 +1,241 @@
+from collections import defaultdict
+
+from vnpy.trader.object import OrderRequest, OrderData, TradeData
+from vnpy.trader.constant import Status
+
+from ..template import RuleTemplate
+
+
+# 滚动窗口配置：(窗口名称, 窗口秒数, 分桶数量)
+WINDOWS: list[tuple[str, int, int]] = [
+    ("1分钟", 60, 30),
+    ("5分钟", 300, 30),
+]
+
+
+class RollingCounter:
+    """固定内存的分桶滚动计数器"""
+
+    __slots__ = ("bucket_seconds", "buckets", "total", "current")
+
+    def __init__(self, window_seconds: int, bucket_count: int) -> None:
+        """构造函数"""
+        self.bucket_seconds: float = window_seconds / bucket_count
+        self.buckets: list[int] = [0] * bucket_count
+        self.total: int = 0
+        self.current: int = 0
+
+    def advance(self, timestamp: float) -> None:
+        """滚动到时间戳所在分桶，清空过期分桶"""
+        bucket_id: int = int(timestamp // self.bucket_seconds)
+        steps: int = bucket_id - self.current
+        if steps <= 0:
+            return
+
+        bucket_count: int = len(self.buckets)
+        if steps >= bucket_count:
+            for i in range(bucket_count):
+                self.buckets[i] = 0
+            self.total = 0
+        else:
+            for i in range(self.current + 1, bucket_id + 1):
+                ix: int = i % bucket_count
+                self.total -= self.buckets[ix]
+                self.buckets[ix] = 0
+
+        self.current = bucket_id
+
+    def add(self, timestamp: float) -> None:
+        """计数加一"""
+        self.advance(timestamp)
+        self.buckets[self.current % len(self.buckets)] += 1
+        self.total += 1
+
+    def get(self, timestamp: float) -> int:
+        """获取窗口内计数"""
+        self.advance(timestamp)
+        return self.total
+
+
+class RatioCounter:
+    """单个合约在单个窗口内的委托、撤单、成交计数"""
+
+    __slots__ = ("order", "cancel", "trade")
+
+    def __init__(self, window_seconds: int, bucket_count: int) -> None:
+        """构造函数"""
+        self.order: RollingCounter = RollingCounter(window_seconds, bucket_count)
+        self.cancel: RollingCounter = RollingCounter(window_seconds, bucket_count)
+        self.trade: RollingCounter = RollingCounter(window_seconds, bucket_count)
+
+
+class OrderTradeRatioRule(RuleTemplate):
+    """报单成交比和撤单比检查风控规则"""
+
+    name: str = "报撤成交比检查"
+
+    parameters: dict[str, str] = {
+        "order_trade_ratio_limit": "报单成交比上限",
+        "cancel_order_ratio_limit": "撤单报单比上限",
+        "min_order_count": "最小样本委托笔数"
+    }
+
+    variables: dict[str, str] = {
+        "contract_order_trade_ratio": "合约全天报单成交比",
+        "contract_cancel_order_ratio": "合约全天撤单报单比"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数
+        self.order_trade_ratio_limit: float = 20.0
+        self.cancel_order_ratio_limit: float = 0.9
+        self.min_order_count: int = 50
+
+        # 委托号和成交号记录
+        self.all_orderids: set[str] = set()
+        self.cancel_orderids: set[str] = set()
+        self.all_tradeids: set[str] = set()
+
+        # 滚动窗口计数：vt_symbol -> 各窗口计数器
+        self.window_counters: dict[str, list[RatioCounter]] = {}
+
+        # 全天计数
+        self.contract_order_count: dict[str, int] = defaultdict(int)
+        self.contract_cancel_count: dict[str, int] = defaultdict(int)
+        self.contract_trade_count: dict[str, int] = defaultdict(int)
+
+        # 全天比率
+        self.contract_order_trade_ratio: dict[str, float] = {}
+        self.contract_cancel_order_ratio: dict[str, float] = {}
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        vt_symbol: str = req.vt_symbol
+
+        # 全天统计
+        order_count: int = self.contract_order_count.get(vt_symbol, 0)
+        if order_count < self.min_order_count:
+            return True
+
+        if not self.check_ratio(
+            req,
+            "全天",
+            order_count,
+            self.contract_cancel_count.get(vt_symbol, 0),
+            self.contract_trade_count.get(vt_symbol, 0)
+        ):
+            return False
+
+        # 滚动窗口统计
+        counters: list[RatioCounter] | None = self.window_counters.get(vt_symbol, None)
+        if not counters:
+            return True
+
+        now: float = self.get_time()
+
+        for (window_name, _, _), counter in zip(WINDOWS, counters, strict=True):
+            order_count = counter.order.get(now)
+            if order_count < self.min_order_count:
+                continue
+
+            if not self.check_ratio(
+                req,
+                window_name,
+                order_count,
+                counter.cancel.get(now),
+                counter.trade.get(now)
+            ):
+                return False
+
+        return True
+
+    def check_ratio(
+        self,
+        req: OrderRequest,
+        window_name: str,
+        order_count: int,
+        cancel_count: int,
+        trade_count: int
+    ) -> bool:
+        """检查窗口内的比率"""
+        order_trade_ratio: float = order_count / max(trade_count, 1)
+        if order_trade_ratio > self.order_trade_ratio_limit:
+            self.write_log(f"{window_name}报单成交比{order_trade_ratio:.2f}超过上限{self.order_trade_ratio_limit}：{req}")
+            return False
+
+        cancel_order_ratio: float = cancel_count / order_count
+        if cancel_order_ratio > self.cancel_order_ratio_limit:
+            self.write_log(f"{window_name}撤单报单比{cancel_order_ratio:.2f}超过上限{self.cancel_order_ratio_limit}：{req}")
+            return False
+
+        return True
+
+    def on_order(self, order: OrderData) -> None:
+        """委托推送"""
+        vt_orderid: str = order.vt_orderid
+        vt_symbol: str = order.vt_symbol
+
+        if vt_orderid not in self.all_orderids:
+            self.all_orderids.add(vt_orderid)
+            self.contract_order_count[vt_symbol] += 1
+
+            now: float = self.get_time()
+            for counter in self.get_counters(vt_symbol):
+                counter.order.add(now)
+        elif (
+            order.status == Status.CANCELLED
+            and vt_orderid not in self.cancel_orderids
+        ):
+            self.cancel_orderids.add(vt_orderid)
+            self.contract_cancel_count[vt_symbol] += 1
+
+            now = self.get_time()
+            for counter in self.get_counters(vt_symbol):
+                counter.cancel.add(now)
+        else:
+            return
+
+        self.update_ratio(vt_symbol)
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送"""
+        if trade.vt_tradeid in self.all_tradeids:
+            return
+        self.all_tradeids.add(trade.vt_tradeid)
+
+        vt_symbol: str = trade.vt_symbol
+        self.contract_trade_count[vt_symbol] += 1
+
+        now: float = self.get_time()
+        for counter in self.get_counters(vt_symbol):
+            counter.trade.add(now)
+
+        self.update_ratio(vt_symbol)
+
+    def get_counters(self, vt_symbol: str) -> list[RatioCounter]:
+        """获取合约的滚动窗口计数器"""
+        counters: list[RatioCounter] | None = self.window_counters.get(vt_symbol, None)
+
+        if not counters:
+            counters = [
+                RatioCounter(window_seconds, bucket_count)
+                for _, window_seconds, bucket_count in WINDOWS
+            ]
+            self.window_counters[vt_symbol] = counters
+
+        return counters
+
+    def update_ratio(self, vt_symbol: str) -> None:
+        """更新全天比率"""
+        order_count: int = self.contract_order_count[vt_symbol]
+        cancel_count: int = self.contract_cancel_count[vt_symbol]
+        trade_count: int = self.contract_trade_count[vt_symbol]
+
+        self.contract_order_trade_ratio[vt_symbol] = round(order_count / max(trade_count, 1), 2)
+        self.contract_cancel_order_ratio[vt_symbol] = round(cancel_count / max(order_count, 1), 2)
+
+        self.put_event()
@@ -1,3 +1,5 @@
+from collections.abc import Callable
+
 from vnpy.trader.object import OrderRequest, ContractData
 
 from ..template import RuleTemplate
@@ -8,6 +10,8 @@ class OrderValidityRule(RuleTemplate):
 
     name: str = "委托指令检查"
 
+    pure: bool = True
+
     def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
         """检查是否允许委托"""
         # 检查合约存在
@@ -16,10 +20,28 @@ class OrderValidityRule(RuleTemplate):
             self.write_log(f"合约代码{req.vt_symbol}不存在：{req}")
             return False
 
-        # 检查最小价格变动
-        if contract.pricetick > 0:
-            pricetick: float = contract.pricetick
+        return self.check_contract(req, contract.pricetick, contract.max_volume or 0, contract.min_volume)
+
+    def compile_check(self, vt_symbol: str) -> Callable[[OrderRequest, str], bool] | None:
+        """编译合约专用的检查函数（合约不存在时返回None，使用check_allowed检查）"""
+        contract: ContractData | None = self.get_contract(vt_symbol)
+        if not contract:
+            return None
 
+        pricetick: float = contract.pricetick
+        max_volume: float = contract.max_volume or 0
+        min_volume: float = contract.min_volume
+        check_contract: Callable[[OrderRequest, float, float, float], bool] = self.check_contract
+
+        def check_allowed(req: OrderRequest, gateway_name: str) -> bool:
+            return check_contract(req, pricetick, max_volume, min_volume)
+
+        return check_allowed
+
+    def check_contract(self, req: OrderRequest, pricetick: float, max_volume: float, min_volume: float) -> bool:
+        """检查委托价格和数量是否符合合约规则"""
+        # 检查最小价格变动
+        if pricetick > 0:
             # 计算价格与最小变动价位的余数
             remainder: float = req.price % pricetick
 
@@ -29,13 +51,13 @@ class OrderValidityRule(RuleTemplate):
                 return False
 
         # 检查委托数量上限
-        if contract.max_volume and req.volume > contract.max_volume:
-            self.write_log(f"委托数量{req.volume}大于合约委托数量上限{contract.max_volume}：{req}")
+        if max_volume and req.volume > max_volume:
+            self.write_log(f"委托数量{req.volume}大于合约委托数量上限{max_volume}：{req}")
             return False
 
         # 检查委托数量下限
-        if req.volume < contract.min_volume:
-            self.write_log(f"委托数量{req.volume}小于合约委托数量下限{contract.min_volume}：{req}")
+        if req.volume < min_volume:
+            self.write_log(f"委托数量{req.volume}小于合约委托数量下限{min_volume}：{req}")
             return False
 
         return True
@@ -7,19 +7,28 @@ cdef class OrderValidityRuleCy(RuleTemplate):
 
     cpdef bint check_allowed(self, object req, str gateway_name):
         """检查是否允许委托"""
-        cdef double pricetick
-        cdef double remainder
-
         # 检查合约存在
         cdef object contract = self.get_contract(req.vt_symbol)
         if not contract:
             self.write_log(f"合约代码{req.vt_symbol}不存在：{req}")
             return False
 
-        # 检查最小价格变动
-        if contract.pricetick > 0:
-            pricetick = contract.pricetick
+        return self.check_contract(req, contract.pricetick, contract.max_volume or 0, contract.min_volume)
+
+    cpdef object compile_check(self, str vt_symbol):
+        """编译合约专用的检查函数（合约不存在时返回None，使用check_allowed检查）"""
+        cdef object contract = self.get_contract(vt_symbol)
+        if not contract:
+            return None
+
+        return OrderValidityCheck(self, contract.pricetick, contract.max_volume or 0, contract.min_volume)
+
+    cdef bint check_contract(self, object req, double pricetick, double max_volume, double min_volume):
+        """检查委托价格和数量是否符合合约规则"""
+        cdef double remainder
 
+        # 检查最小价格变动
+        if pricetick > 0:
             # 计算价格与最小变动价位的余数
             remainder = req.price % pricetick
 
@@ -29,19 +38,41 @@ cdef class OrderValidityRuleCy(RuleTemplate):
                 return False
 
         # 检查委托数量上限
-        if contract.max_volume and req.volume > contract.max_volume:
-            self.write_log(f"委托数量{req.volume}大于合约委托数量上限{contract.max_volume}：{req}")
+        if max_volume and req.volume > max_volume:
+            self.write_log(f"委托数量{req.volume}大于合约委托数量上限{max_volume}：{req}")
             return False
 
         # 检查委托数量下限
-        if req.volume < contract.min_volume:
-            self.write_log(f"委托数量{req.volume}小于合约委托数量下限{contract.min_volume}：{req}")
+        if req.volume < min_volume:
+            self.write_log(f"委托数量{req.volume}小于合约委托数量下限{min_volume}：{req}")
             return False
 
         return True
 
 
+cdef class OrderValidityCheck:
+    """合约专用的委托指令检查函数（折叠合约常量）"""
+
+    cdef OrderValidityRuleCy rule
+    cdef double pricetick
+    cdef double max_volume
+    cdef double min_volume
+
+    def __init__(self, OrderValidityRuleCy rule, double pricetick, double max_volume, double min_volume):
+        """构造函数"""
+        self.rule = rule
+        self.pricetick = pricetick
+        self.max_volume = max_volume
+        self.min_volume = min_volume
+
+    def __call__(self, object req, str gateway_name):
+        """执行检查"""
+        return self.rule.check_contract(req, self.pricetick, self.max_volume, self.min_volume)
+
+
 class OrderValidityRule(OrderValidityRuleCy):
     """委托指令检查规则的Python包装类"""
 
     name: str = "委托指令检查"
+
+    pure: bool = True
@@ -0,0 +1,213 @@
+from collections import defaultdict
+from statistics import NormalDist
+
+import numpy as np
+
+from vnpy.trader.object import TickData, OrderData, TradeData, PositionData, ContractData
+from vnpy.trader.constant import Direction, Offset
+
+from ..portfolio import PortfolioRuleTemplate
+
+
+class PortfolioVarRule(PortfolioRuleTemplate):
+    """组合VaR检查风控规则（后台计算）"""
+
+    name: str = "组合VaR检查"
+
+    parameters: dict[str, str] = {
+        "var_limit": "VaR上限",
+        "var_confidence": "VaR置信度",
+        "history_window": "历史样本数量",
+        "calc_interval": "计算间隔(秒)"
+    }
+
+    variables: dict[str, str] = {
+        "portfolio_var": "组合VaR",
+        "sample_count": "历史样本数量"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数
+        self.var_limit: float = 1_000_000
+        self.var_confidence: float = 0.99
+        self.history_window: int = 250
+
+        # 持仓和行情（事件线程维护）
+        self.long_pos: dict[str, float] = defaultdict(float)
+        self.short_pos: dict[str, float] = defaultdict(float)
+        self.last_prices: dict[str, float] = {}
+
+        # 合约列表（只包含有持仓或活动委托的合约，只增不减，保证历史数据列对齐）
+        self.symbols: list[str] = []
+        self.symbol_index: dict[str, int] = {}
+
+        # 按固定间隔采集、尚未加入历史的价格样本（事件线程维护）
+        self.pending_samples: list[np.ndarray] = []
+        self.sample_timer: int = 0
+
+        # 历史价格（后台线程维护）
+        self.price_history: np.ndarray = np.zeros((0, 0))
+
+        # 计算结果
+        self.portfolio_var: float = 0
+        self.sample_count: int = 0
+
+        for position in self.get_all_positions():
+            self.on_position(position)
+
+    def update_setting(self, rule_setting: dict) -> None:
+        """更新风控规则参数（停用时清空价格样本，重新启用后重新采集）"""
+        super().update_setting(rule_setting)
+
+        if not self.active:
+            self.pending_samples = []
+            self.sample_timer = 0
+            self.price_history = np.zeros((0, 0))
+
+    def on_tick(self, tick: TickData) -> None:
+        """行情推送（停用时，或合约没有持仓和活动委托时忽略）"""
+        if self.active and tick.vt_symbol in self.symbol_index:
+            self.last_prices[tick.vt_symbol] = tick.last_price
+
+    def on_order(self, order: OrderData) -> None:
+        """委托推送（有活动委托的合约开始采集价格）"""
+        if self.active and order.vt_symbol not in self.symbol_index and order.is_active():
+            self.add_symbol(order.vt_symbol)
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送"""
+        vt_symbol: str = trade.vt_symbol
+        if vt_symbol not in self.symbol_index:
+            self.add_symbol(vt_symbol)
+
+        if trade.offset == Offset.OPEN or trade.offset == Offset.NONE:
+            if trade.direction == Direction.LONG:
+                self.long_pos[vt_symbol] += trade.volume
+            else:
+                self.short_pos[vt_symbol] += trade.volume
+        else:
+            if trade.direction == Direction.LONG:
+                self.short_pos[vt_symbol] -= trade.volume
+            else:
+                self.long_pos[vt_symbol] -= trade.volume
+
+        self.last_prices.setdefault(vt_symbol, trade.price)
+
+        super().on_trade(trade)
+
+    def on_timer(self) -> None:
+        """定时推送（按固定间隔采集价格样本，成交触发的计算只复用已有历史）"""
+        if not self.active:
+            return
+
+        self.sample_timer += 1
+
+        if self.sample_timer >= self.calc_interval:
+            self.sample_timer = 0
+
+            prices: np.ndarray = np.array([self.last_prices.get(s, np.nan) or np.nan for s in self.symbols])
+            self.pending_samples.append(prices)
+            del self.pending_samples[:-(self.history_window + 1)]
+
+        super().on_timer()
+
+    def on_position(self, position: PositionData) -> None:
+        """持仓推送"""
+        vt_symbol: str = position.vt_symbol
+        if vt_symbol not in self.symbol_index and position.volume:
+            self.add_symbol(vt_symbol)
+
+        if position.direction == Direction.LONG:
+            self.long_pos[vt_symbol] = position.volume
+        elif position.direction == Direction.SHORT:
+            self.short_pos[vt_symbol] = position.volume
+        else:
+            self.long_pos[vt_symbol] = position.volume
+            self.short_pos[vt_symbol] = 0
+
+        if position.price:
+            self.last_prices.setdefault(vt_symbol, position.price)
+
+    def add_symbol(self, vt_symbol: str) -> None:
+        """添加合约"""
+        self.symbol_index[vt_symbol] = len(self.symbols)
+        self.symbols.append(vt_symbol)
+
+    def create_snapshot(self) -> tuple[list[str], np.ndarray, list[np.ndarray]]:
+        """生成合约、净持仓名义价值快照，并取出待加入历史的价格样本"""
+        symbols: list[str] = list(self.symbols)
+        exposures: np.ndarray = np.zeros(len(symbols))
+
+        samples: list[np.ndarray] = self.pending_samples
+        self.pending_samples = []
+
+        for ix, vt_symbol in enumerate(symbols):
+            price: float | None = self.last_prices.get(vt_symbol, None)
+            if not price:
+                continue
+
+            net_pos: float = self.long_pos.get(vt_symbol, 0) - self.short_pos.get(vt_symbol, 0)
+            if not net_pos:
+                continue
+
+            contract: ContractData | None = self.get_contract(vt_symbol)
+            if contract:
+                exposures[ix] = net_pos * price * contract.size
+
+        return symbols, exposures, samples
+
+    def calculate(self, snapshot: tuple[list[str], np.ndarray, list[np.ndarray]]) -> None:
+        """计算组合VaR并发布放行标记"""
+        symbols, exposures, samples = snapshot
+        n: int = len(symbols)
+
+        # 追加价格样本（新增合约时扩展列，样本采集时尚未出现的合约记为缺失）
+        history: np.ndarray = self.price_history
+        if history.shape[1] < n:
+            padding: np.ndarray = np.full((history.shape[0], n - history.shape[1]), np.nan)
+            history = np.hstack([history, padding])
+
+        if samples:
+            rows: np.ndarray = np.full((len(samples), n), np.nan)
+            for i, prices in enumerate(samples):
+                rows[i, :len(prices)] = prices
+
+            history = np.vstack([history, rows])[-(self.history_window + 1):]
+
+        self.price_history = history
+        self.sample_count = history.shape[0] - 1
+
+        if self.sample_count < 2 or not n:
+            return
+
+        # 计算对数收益率协方差（缺失数据视为零收益）
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns: np.ndarray = np.diff(np.log(history), axis=0)
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+
+        covariance: np.ndarray = np.atleast_2d(np.cov(returns, rowvar=False))
+        variance: float = float(exposures @ covariance @ exposures)
+
+        z_score: float = NormalDist().inv_cdf(self.var_confidence)
+        self.portfolio_var = round(z_score * np.sqrt(max(variance, 0)), 2)
+
+        if self.portfolio_var <= self.var_limit:
+            self.publish({})
+            return
+
+        # 超限后只允许降低敞口的方向：多头合约禁止买入，空头合约禁止卖出，其余合约均禁止
+        flags: dict[tuple[str, Direction], bool] = {}
+        for vt_symbol, exposure in zip(symbols, exposures, strict=True):
+            if exposure > 0:
+                flags[(vt_symbol, Direction.SHORT)] = True
+                flags[(vt_symbol, Direction.LONG)] = False
+            elif exposure < 0:
+                flags[(vt_symbol, Direction.LONG)] = True
+                flags[(vt_symbol, Direction.SHORT)] = False
+
+        reason: str = f"组合VaR{self.portfolio_var}超过上限{self.var_limit}，只允许降低敞口的委托"
+        self.publish(flags, False, reason)
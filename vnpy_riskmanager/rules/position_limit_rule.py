@@ -0,0 +1,194 @@
+from collections import defaultdict
+
+from vnpy.trader.object import OrderRequest, OrderData, TradeData, PositionData, ContractData
+from vnpy.trader.constant import Direction, Offset
+
+from ..template import RuleTemplate
+
+
+class PositionLimitRule(RuleTemplate):
+    """持仓和敞口上限检查风控规则"""
+
+    name: str = "持仓上限检查"
+
+    parameters: dict[str, str] = {
+        "contract_position_limit": "合约净持仓上限",
+        "contract_exposure_limit": "合约敞口上限",
+        "total_exposure_limit": "汇总敞口上限"
+    }
+
+    variables: dict[str, str] = {
+        "contract_long_pos": "合约多头持仓",
+        "contract_short_pos": "合约空头持仓",
+        "contract_net_pos": "合约净持仓",
+        "contract_exposure": "合约敞口",
+        "total_exposure": "汇总敞口"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数
+        self.contract_position_limit: int = 200
+        self.contract_exposure_limit: float = 10_000_000
+        self.total_exposure_limit: float = 50_000_000
+
+        # 持仓统计
+        self.contract_long_pos: dict[str, float] = defaultdict(float)
+        self.contract_short_pos: dict[str, float] = defaultdict(float)
+        self.contract_net_pos: dict[str, float] = defaultdict(float)
+
+        # 敞口统计（净持仓名义价值）
+        self.contract_exposure: dict[str, float] = defaultdict(float)
+        self.total_exposure: float = 0
+
+        # 计算敞口使用的最新价格
+        self.contract_prices: dict[str, float] = {}
+
+        # 活动委托的剩余数量：vt_orderid -> (vt_symbol, direction, remaining)
+        self.pending_orders: dict[str, tuple[str, Direction | None, float]] = {}
+        self.pending_long: dict[str, float] = defaultdict(float)
+        self.pending_short: dict[str, float] = defaultdict(float)
+
+        # 已完成初始化的持仓号（只从持仓数据初始化一次，后续基于成交增量更新）
+        self.seeded_positionids: set[str] = set()
+
+        for position in self.get_all_positions():
+            self.seed_position(position)
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        vt_symbol: str = req.vt_symbol
+        net_pos: float = self.contract_net_pos.get(vt_symbol, 0)
+
+        # 计算委托全部成交后（含已挂出活动委托）的最不利净持仓
+        if req.direction == Direction.LONG:
+            projected_pos: float = net_pos + self.pending_long.get(vt_symbol, 0) + req.volume
+        else:
+            projected_pos = net_pos - self.pending_short.get(vt_symbol, 0) - req.volume
+
+        # 只拦截会导致净持仓绝对值增加的委托
+        if abs(projected_pos) <= abs(net_pos):
+            return True
+
+        if abs(projected_pos) > self.contract_position_limit:
+            self.write_log(f"合约预计净持仓{projected_pos}超过上限{self.contract_position_limit}：{req}")
+            return False
+
+        price: float = req.price or self.contract_prices.get(vt_symbol, 0)
+        contract: ContractData | None = self.get_contract(vt_symbol)
+        if not price or not contract:
+            return True
+
+        projected_exposure: float = abs(projected_pos) * price * contract.size
+        if projected_exposure > self.contract_exposure_limit:
+            self.write_log(f"合约预计敞口{projected_exposure}超过上限{self.contract_exposure_limit}：{req}")
+            return False
+
+        total_exposure: float = self.total_exposure - self.contract_exposure.get(vt_symbol, 0) + projected_exposure
+        if total_exposure > self.total_exposure_limit:
+            self.write_log(f"汇总预计敞口{total_exposure}超过上限{self.total_exposure_limit}：{req}")
+            return False
+
+        return True
+
+    def on_order(self, order: OrderData) -> None:
+        """委托推送"""
+        vt_orderid: str = order.vt_orderid
+
+        if order.is_active():
+            remaining: float = order.volume - order.traded
+        else:
+            remaining = 0
+
+        # 根据剩余数量的变化增量更新挂单统计
+        previous: tuple[str, Direction | None, float] | None = self.pending_orders.get(vt_orderid, None)
+        if previous:
+            change: float = remaining - previous[2]
+        else:
+            change = remaining
+
+        if change:
+            if order.direction == Direction.LONG:
+                self.pending_long[order.vt_symbol] += change
+            else:
+                self.pending_short[order.vt_symbol] += change
+
+        if remaining:
+            self.pending_orders[vt_orderid] = (order.vt_symbol, order.direction, remaining)
+        elif previous:
+            self.pending_orders.pop(vt_orderid)
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送"""
+        vt_symbol: str = trade.vt_symbol
+
+        if trade.offset == Offset.NONE:
+            # 净持仓模式，只更新净持仓
+            if trade.direction == Direction.LONG:
+                net_pos: float = self.contract_net_pos[vt_symbol] + trade.volume
+            else:
+                net_pos = self.contract_net_pos[vt_symbol] - trade.volume
+
+            self.contract_long_pos[vt_symbol] = max(net_pos, 0)
+            self.contract_short_pos[vt_symbol] = max(-net_pos, 0)
+        elif trade.offset == Offset.OPEN:
+            if trade.direction == Direction.LONG:
+                self.contract_long_pos[vt_symbol] += trade.volume
+            else:
+                self.contract_short_pos[vt_symbol] += trade.volume
+        else:
+            # 平仓成交减少反方向持仓
+            if trade.direction == Direction.LONG:
+                self.contract_short_pos[vt_symbol] = max(self.contract_short_pos[vt_symbol] - trade.volume, 0)
+            else:
+                self.contract_long_pos[vt_symbol] = max(self.contract_long_pos[vt_symbol] - trade.volume, 0)
+
+        self.contract_prices[vt_symbol] = trade.price
+        self.update_exposure(vt_symbol)
+
+        self.put_event()
+
+    def on_position(self, position: PositionData) -> None:
+        """持仓推送"""
+        if position.vt_positionid in self.seeded_positionids:
+            return
+
+        self.seed_position(position)
+        self.put_event()
+
+    def seed_position(self, position: PositionData) -> None:
+        """基于持仓数据初始化持仓统计"""
+        self.seeded_positionids.add(position.vt_positionid)
+
+        vt_symbol: str = position.vt_symbol
+
+        if position.direction == Direction.LONG:
+            self.contract_long_pos[vt_symbol] = position.volume
+        elif position.direction == Direction.SHORT:
+            self.contract_short_pos[vt_symbol] = position.volume
+        else:
+            self.contract_long_pos[vt_symbol] = max(position.volume, 0)
+            self.contract_short_pos[vt_symbol] = max(-position.volume, 0)
+
+        if vt_symbol not in self.contract_prices and position.price:
+            self.contract_prices[vt_symbol] = position.price
+
+        self.update_exposure(vt_symbol)
+
+    def update_exposure(self, vt_symbol: str) -> None:
+        """更新合约净持仓和敞口"""
+        net_pos: float = self.contract_long_pos[vt_symbol] - self.contract_short_pos[vt_symbol]
+        self.contract_net_pos[vt_symbol] = net_pos
+
+        contract: ContractData | None = self.get_contract(vt_symbol)
+        price: float = self.contract_prices.get(vt_symbol, 0)
+        if contract:
+            exposure: float = abs(net_pos) * price * contract.size
+        else:
+            exposure = 0
+
+        self.total_exposure += exposure - self.contract_exposure[vt_symbol]
+        self.contract_exposure[vt_symbol] = exposure
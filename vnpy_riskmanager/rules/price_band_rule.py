@@ -0,0 +1,118 @@
+from vnpy.trader.object import OrderRequest, TickData, ContractData
+
+from ..template import RuleTemplate
+
+
+class PriceCache:
+    """合约行情价格缓存"""
+
+    __slots__ = ("last_price", "limit_up", "limit_down", "pricetick")
+
+    def __init__(self, pricetick: float) -> None:
+        """构造函数"""
+        self.last_price: float = 0
+        self.limit_up: float = 0
+        self.limit_down: float = 0
+        self.pricetick: float = pricetick
+
+
+class PriceBandRule(RuleTemplate):
+    """委托价格偏离检查风控规则"""
+
+    name: str = "价格偏离检查"
+
+    parameters: dict[str, str] = {
+        "price_band_percent": "价格偏离比例上限(%)",
+        "price_band_ticks": "价格偏离跳数上限",
+        "check_limit_price": "检查涨跌停价"
+    }
+
+    variables: dict[str, str] = {
+        "cache_count": "缓存合约数量"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数（为0时不检查）
+        self.price_band_percent: float = 5.0
+        self.price_band_ticks: int = 0
+        self.check_limit_price: bool = True
+
+        # 行情价格缓存
+        self.price_caches: dict[str, PriceCache] = {}
+
+        # 数量统计
+        self.cache_count: int = 0
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        # 只检查限价类委托，且需已收到行情
+        price: float = req.price
+        if not price:
+            return True
+
+        cache: PriceCache | None = self.price_caches.get(req.vt_symbol, None)
+        if not cache:
+            return True
+
+        if self.check_limit_price:
+            if cache.limit_up and price > cache.limit_up:
+                self.write_log(f"委托价格{price}高于涨停价{cache.limit_up}：{req}")
+                return False
+
+            if cache.limit_down and price < cache.limit_down:
+                self.write_log(f"委托价格{price}低于跌停价{cache.limit_down}：{req}")
+                return False
+
+        last_price: float = cache.last_price
+        if not last_price:
+            return True
+
+        deviation: float = abs(price - last_price)
+
+        if self.price_band_percent:
+            band: float = last_price * self.price_band_percent / 100
+            if deviation > band:
+                self.write_log(f"委托价格{price}偏离最新价{last_price}超过{self.price_band_percent}%：{req}")
+                return False
+
+        if self.price_band_ticks and cache.pricetick:
+            band = cache.pricetick * self.price_band_ticks
+            if deviation > band:
+                self.write_log(f"委托价格{price}偏离最新价{last_price}超过{self.price_band_ticks}跳：{req}")
+                return False
+
+        return True
+
+    def update_setting(self, rule_setting: dict) -> None:
+        """更新风控规则参数（停用期间不接收行情，停用时清空价格缓存，避免重新启用后使用过期价格）"""
+        super().update_setting(rule_setting)
+
+        if not self.active:
+            self.price_caches.clear()
+            self.cache_count = 0
+
+    def on_tick(self, tick: TickData) -> None:
+        """行情推送"""
+        cache: PriceCache | None = self.price_caches.get(tick.vt_symbol, None)
+
+        # 首次收到合约行情时创建缓存，后续原地更新
+        if not cache:
+            contract: ContractData | None = self.get_contract(tick.vt_symbol)
+            if contract:
+                pricetick: float = contract.pricetick
+            else:
+                pricetick = 0
+
+            cache = PriceCache(pricetick)
+            self.price_caches[tick.vt_symbol] = cache
+
+            self.cache_count = len(self.price_caches)
+            self.put_event()
+
+        cache.last_price = tick.last_price
+        cache.limit_up = tick.limit_up
+        cache.limit_down = tick.limit_down
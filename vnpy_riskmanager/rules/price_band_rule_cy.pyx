@@ -0,0 +1,139 @@
+# cython: language_level=3
+from vnpy_riskmanager.template cimport RuleTemplate
+
+
+cdef class PriceCache:
+    """合约行情价格缓存 (Cython 版本)"""
+
+    cdef public double last_price
+    cdef public double limit_up
+    cdef public double limit_down
+    cdef public double pricetick
+
+    def __init__(self, double pricetick) -> None:
+        """构造函数"""
+        self.last_price = 0
+        self.limit_up = 0
+        self.limit_down = 0
+        self.pricetick = pricetick
+
+
+cdef class PriceBandRuleCy(RuleTemplate):
+    """委托价格偏离检查风控规则 (Cython 版本)"""
+
+    cdef public double price_band_percent
+    cdef public int price_band_ticks
+    cdef public bint check_limit_price
+
+    cdef dict price_caches
+    cdef public int cache_count
+
+    cpdef void on_init(self):
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数（为0时不检查）
+        self.price_band_percent = 5.0
+        self.price_band_ticks = 0
+        self.check_limit_price = True
+
+        # 行情价格缓存
+        self.price_caches = {}
+
+        # 数量统计
+        self.cache_count = 0
+
+    cpdef bint check_allowed(self, object req, str gateway_name):
+        """检查是否允许委托"""
+        cdef double price = req.price
+        cdef PriceCache cache
+        cdef double last_price
+        cdef double deviation
+        cdef double band
+
+        # 只检查限价类委托，且需已收到行情
+        if not price:
+            return True
+
+        cache = self.price_caches.get(req.vt_symbol, None)
+        if cache is None:
+            return True
+
+        if self.check_limit_price:
+            if cache.limit_up and price > cache.limit_up:
+                self.write_log(f"委托价格{price}高于涨停价{cache.limit_up}：{req}")
+                return False
+
+            if cache.limit_down and price < cache.limit_down:
+                self.write_log(f"委托价格{price}低于跌停价{cache.limit_down}：{req}")
+                return False
+
+        last_price = cache.last_price
+        if not last_price:
+            return True
+
+        deviation = abs(price - last_price)
+
+        if self.price_band_percent:
+            band = last_price * self.price_band_percent / 100
+            if deviation > band:
+                self.write_log(f"委托价格{price}偏离最新价{last_price}超过{self.price_band_percent}%：{req}")
+                return False
+
+        if self.price_band_ticks and cache.pricetick:
+            band = cache.pricetick * self.price_band_ticks
+            if deviation > band:
+                self.write_log(f"委托价格{price}偏离最新价{last_price}超过{self.price_band_ticks}跳：{req}")
+                return False
+
+        return True
+
+    cpdef void update_setting(self, dict rule_setting):
+        """更新风控规则参数（停用期间不接收行情，停用时清空价格缓存，避免重新启用后使用过期价格）"""
+        RuleTemplate.update_setting(self, rule_setting)
+
+        if not self.active:
+            self.price_caches.clear()
+            self.cache_count = 0
+
+    cpdef void on_tick(self, object tick):
+        """行情推送"""
+        cdef str vt_symbol = tick.vt_symbol
+        cdef PriceCache cache = self.price_caches.get(vt_symbol, None)
+        cdef object contract
+        cdef double pricetick
+
+        # 首次收到合约行情时创建缓存，后续原地更新
+        if cache is None:
+            contract = self.get_contract(vt_symbol)
+            if contract:
+                pricetick = contract.pricetick
+            else:
+                pricetick = 0
+
+            cache = PriceCache(pricetick)
+            self.price_caches[vt_symbol] = cache
+
+            self.cache_count = len(self.price_caches)
+            self.put_event()
+
+        cache.last_price = tick.last_price
+        cache.limit_up = tick.limit_up
+        cache.limit_down = tick.limit_down
+
+
+class PriceBandRule(PriceBandRuleCy):
+    """价格偏离检查规则的Python包装类"""
+
+    name: str = "价格偏离检查"
+
+    parameters: dict[str, str] = {
+        "price_band_percent": "价格偏离比例上限(%)",
+        "price_band_ticks": "价格偏离跳数上限",
+        "check_limit_price": "检查涨跌停价"
+    }
+
+    variables: dict[str, str] = {
+        "cache_count": "缓存合约数量"
+    }
@@ -0,0 +1,244 @@
+from collections import defaultdict
+
+import numpy as np
+
+from vnpy.trader.object import OrderRequest, TickData, TradeData, PositionData, ContractData
+from vnpy.trader.constant import Direction, Offset
+
+from ..template import RuleTemplate
+
+
+class ScenarioStressRule(RuleTemplate):
+    """情景压力测试检查风控规则"""
+
+    name: str = "压力测试检查"
+
+    # 情景数量
+    scenario_count: int = 50
+
+    parameters: dict[str, str] = {
+        "loss_limit": "情景亏损上限",
+        "shock_range": "默认冲击幅度",
+        "reprice_threshold": "重估价格变动阈值"
+    }
+
+    variables: dict[str, str] = {
+        "worst_loss": "最差情景亏损",
+        "symbol_count": "合约数量"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数
+        self.loss_limit: float = 5_000_000
+        self.shock_range: float = 0.1
+        self.reprice_threshold: float = 0.005
+
+        # 合约索引（只包含有持仓或成交的合约）
+        self.symbols: list[str] = []
+        self.symbol_index: dict[str, int] = {}
+        self.symbol_count: int = 0
+
+        # 已按涨跌停幅度生成情景冲击的合约
+        self.limit_symbols: set[str] = set()
+
+        # 持仓（多空分别维护，用于持仓推送的绝对值更新）
+        self.long_pos: dict[str, float] = defaultdict(float)
+        self.short_pos: dict[str, float] = defaultdict(float)
+
+        # 按合约索引的数组
+        capacity: int = 64
+        self.positions: np.ndarray = np.zeros(capacity)
+        self.prices: np.ndarray = np.zeros(capacity)
+        self.sizes: np.ndarray = np.zeros(capacity)
+
+        # 情景冲击矩阵（合约 x 情景，相对价格变动）和情景盈亏矩阵
+        self.shocks: np.ndarray = np.zeros((capacity, self.scenario_count))
+        self.pnl: np.ndarray = np.zeros((capacity, self.scenario_count))
+
+        # 各合约的最大冲击幅度（用于检查时的快速上界判断）
+        self.max_shocks: list[float] = []
+
+        # 各情景的组合盈亏汇总（增量维护）
+        self.scenario_pnl: np.ndarray = np.zeros(self.scenario_count)
+        self.worst_loss: float = 0
+
+        # 定时全量校准计数
+        self.timer_count: int = 0
+
+        for position in self.get_all_positions():
+            self.on_position(position)
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        ix: int | None = self.symbol_index.get(req.vt_symbol, None)
+        if ix is None:
+            return True
+
+        price: float = req.price or self.prices[ix]
+        if not price:
+            return True
+
+        if req.direction == Direction.LONG:
+            volume: float = req.volume
+        else:
+            volume = -req.volume
+
+        # 快速路径：委托在任何情景下的亏损上界都不会导致超限
+        value: float = volume * price * self.get_size(ix)
+        if self.worst_loss + abs(value) * self.max_shocks[ix] <= self.loss_limit:
+            return True
+
+        # 委托全部成交后各情景的组合盈亏
+        delta: np.ndarray = value * self.shocks[ix]
+        worst_loss: float = -float((self.scenario_pnl + delta).min())
+
+        if worst_loss > self.loss_limit and worst_loss > self.worst_loss:
+            self.write_log(f"委托成交后最差情景亏损{worst_loss:.0f}超过上限{self.loss_limit}：{req}")
+            return False
+
+        return True
+
+    def on_tick(self, tick: TickData) -> None:
+        """行情推送（停用时，或合约没有持仓时忽略）"""
+        if not self.active:
+            return
+
+        ix: int | None = self.symbol_index.get(tick.vt_symbol, None)
+        if ix is None:
+            return
+
+        # 首次收到带涨跌停价的行情时，按涨跌停幅度重新生成情景冲击
+        if tick.vt_symbol not in self.limit_symbols and self.update_shocks(ix, tick):
+            self.limit_symbols.add(tick.vt_symbol)
+            self.prices[ix] = tick.last_price
+            self.update_row(ix)
+            return
+
+        # 价格变动超过阈值时才重估
+        last_price: float = self.prices[ix]
+        if last_price and abs(tick.last_price / last_price - 1) < self.reprice_threshold:
+            return
+
+        self.prices[ix] = tick.last_price
+        if self.positions[ix]:
+            self.update_row(ix)
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送"""
+        vt_symbol: str = trade.vt_symbol
+
+        if trade.offset == Offset.OPEN or trade.offset == Offset.NONE:
+            if trade.direction == Direction.LONG:
+                self.long_pos[vt_symbol] += trade.volume
+            else:
+                self.short_pos[vt_symbol] += trade.volume
+        else:
+            if trade.direction == Direction.LONG:
+                self.short_pos[vt_symbol] -= trade.volume
+            else:
+                self.long_pos[vt_symbol] -= trade.volume
+
+        self.update_position(vt_symbol, trade.price)
+
+    def on_position(self, position: PositionData) -> None:
+        """持仓推送"""
+        vt_symbol: str = position.vt_symbol
+
+        if position.direction == Direction.LONG:
+            self.long_pos[vt_symbol] = position.volume
+        elif position.direction == Direction.SHORT:
+            self.short_pos[vt_symbol] = position.volume
+        else:
+            self.long_pos[vt_symbol] = position.volume
+            self.short_pos[vt_symbol] = 0
+
+        self.update_position(vt_symbol, position.price)
+
+    def on_timer(self) -> None:
+        """定时推送（每分钟全量校准一次，消除增量累加的浮点误差）"""
+        if not self.active:
+            return
+
+        self.timer_count += 1
+        if self.timer_count < 60:
+            return
+        self.timer_count = 0
+
+        self.scenario_pnl = self.pnl[:self.symbol_count].sum(axis=0)
+        self.worst_loss = max(-float(self.scenario_pnl.min()), 0)
+
+    def update_position(self, vt_symbol: str, price: float) -> None:
+        """更新合约持仓并重估该合约的情景盈亏"""
+        ix: int | None = self.symbol_index.get(vt_symbol, None)
+        if ix is None:
+            ix = self.add_symbol(vt_symbol)
+
+        if not self.prices[ix]:
+            self.prices[ix] = price
+
+        self.positions[ix] = self.long_pos[vt_symbol] - self.short_pos[vt_symbol]
+        self.update_row(ix)
+        self.put_event()
+
+    def update_row(self, ix: int) -> None:
+        """增量更新单个合约的情景盈亏"""
+        row: np.ndarray = (self.positions[ix] * self.prices[ix] * self.get_size(ix)) * self.shocks[ix]
+
+        self.scenario_pnl += row - self.pnl[ix]
+        self.pnl[ix] = row
+
+        self.worst_loss = max(-float(self.scenario_pnl.min()), 0)
+
+    def get_size(self, ix: int) -> float:
+        """获取合约乘数（添加合约时合约信息尚未推送的，在使用时补充查询）"""
+        size: float = self.sizes[ix]
+        if size:
+            return size
+
+        contract: ContractData | None = self.get_contract(self.symbols[ix])
+        if contract:
+            self.sizes[ix] = contract.size
+            return contract.size
+
+        return 0
+
+    def add_symbol(self, vt_symbol: str) -> int:
+        """添加合约，使用默认冲击幅度生成情景冲击（收到行情后按涨跌停幅度更新）"""
+        ix: int = self.symbol_count
+        if ix >= len(self.positions):
+            self.grow()
+
+        self.symbols.append(vt_symbol)
+        self.symbol_index[vt_symbol] = ix
+        self.symbol_count += 1
+
+        self.shocks[ix] = np.linspace(-self.shock_range, self.shock_range, self.scenario_count)
+        self.max_shocks.append(self.shock_range)
+
+        return ix
+
+    def update_shocks(self, ix: int, tick: TickData) -> bool:
+        """以涨跌停幅度作为冲击范围更新情景冲击，行情没有涨跌停价时返回False"""
+        if not (tick.last_price and tick.limit_up and tick.limit_down):
+            return False
+
+        shock_range: float = max(tick.limit_up / tick.last_price - 1, 1 - tick.limit_down / tick.last_price)
+
+        self.shocks[ix] = np.linspace(-shock_range, shock_range, self.scenario_count)
+        self.max_shocks[ix] = shock_range
+        return True
+
+    def grow(self) -> None:
+        """数组扩容"""
+        size: int = len(self.positions)
+
+        self.positions = np.concatenate([self.positions, np.zeros(size)])
+        self.prices = np.concatenate([self.prices, np.zeros(size)])
+        self.sizes = np.concatenate([self.sizes, np.zeros(size)])
+
+        self.shocks = np.vstack([self.shocks, np.zeros((size, self.scenario_count))])
+        self.pnl = np.vstack([self.pnl, np.zeros((size, self.scenario_count))])
@@ -0,0 +1,131 @@
+from bisect import bisect_left, insort
+
+from vnpy.trader.object import OrderRequest, OrderData
+from vnpy.trader.constant import Direction
+
+from ..template import RuleTemplate
+
+
+class PriceLevelIndex:
+    """单个合约的自有挂单价格档位索引"""
+
+    __slots__ = ("bid_prices", "ask_prices", "bid_counts", "ask_counts")
+
+    def __init__(self) -> None:
+        """构造函数"""
+        # 有序价格列表（升序）
+        self.bid_prices: list[float] = []
+        self.ask_prices: list[float] = []
+
+        # 各价格档位上的挂单数量
+        self.bid_counts: dict[float, int] = {}
+        self.ask_counts: dict[float, int] = {}
+
+    def add(self, direction: Direction | None, price: float) -> None:
+        """添加挂单"""
+        if direction == Direction.LONG:
+            prices, counts = self.bid_prices, self.bid_counts
+        else:
+            prices, counts = self.ask_prices, self.ask_counts
+
+        count: int = counts.get(price, 0)
+        if not count:
+            insort(prices, price)
+        counts[price] = count + 1
+
+    def remove(self, direction: Direction | None, price: float) -> None:
+        """移除挂单"""
+        if direction == Direction.LONG:
+            prices, counts = self.bid_prices, self.bid_counts
+        else:
+            prices, counts = self.ask_prices, self.ask_counts
+
+        count: int = counts.get(price, 0) - 1
+        if count > 0:
+            counts[price] = count
+            return
+
+        counts.pop(price, None)
+        ix: int = bisect_left(prices, price)
+        if ix < len(prices) and prices[ix] == price:
+            prices.pop(ix)
+
+    def get_best_bid(self) -> float | None:
+        """最高自有买价"""
+        if self.bid_prices:
+            return self.bid_prices[-1]
+        return None
+
+    def get_best_ask(self) -> float | None:
+        """最低自有卖价"""
+        if self.ask_prices:
+            return self.ask_prices[0]
+        return None
+
+
+class SelfTradeRule(RuleTemplate):
+    """自成交检查风控规则"""
+
+    name: str = "自成交检查"
+
+    variables: dict[str, str] = {
+        "resting_order_count": "自有挂单数量"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 合约挂单价格索引
+        self.indexes: dict[str, PriceLevelIndex] = {}
+
+        # 已索引挂单：vt_orderid -> (vt_symbol, direction, price)
+        self.resting_orders: dict[str, tuple[str, Direction | None, float]] = {}
+
+        # 数量统计
+        self.resting_order_count: int = 0
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        index: PriceLevelIndex | None = self.indexes.get(req.vt_symbol, None)
+        if not index:
+            return True
+
+        # 市价类委托（价格为0）只要对手方向存在自有挂单即视为可能自成交
+        if req.direction == Direction.LONG:
+            best_ask: float | None = index.get_best_ask()
+            if best_ask is not None and (not req.price or req.price >= best_ask):
+                self.write_log(f"委托价格{req.price}可能与自有卖单{best_ask}成交：{req}")
+                return False
+        else:
+            best_bid: float | None = index.get_best_bid()
+            if best_bid is not None and (not req.price or req.price <= best_bid):
+                self.write_log(f"委托价格{req.price}可能与自有买单{best_bid}成交：{req}")
+                return False
+
+        return True
+
+    def on_order(self, order: OrderData) -> None:
+        """委托推送"""
+        vt_orderid: str = order.vt_orderid
+
+        if order.is_active():
+            if vt_orderid in self.resting_orders or not order.price:
+                return
+
+            index: PriceLevelIndex | None = self.indexes.get(order.vt_symbol, None)
+            if not index:
+                index = PriceLevelIndex()
+                self.indexes[order.vt_symbol] = index
+
+            index.add(order.direction, order.price)
+            self.resting_orders[vt_orderid] = (order.vt_symbol, order.direction, order.price)
+        elif vt_orderid in self.resting_orders:
+            vt_symbol, direction, price = self.resting_orders.pop(vt_orderid)
+            self.indexes[vt_symbol].remove(direction, price)
+        else:
+            return
+
+        self.resting_order_count = len(self.resting_orders)
+        self.put_event()
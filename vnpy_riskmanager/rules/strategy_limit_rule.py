@@ -0,0 +1,72 @@
+from vnpy.trader.object import OrderRequest, OrderData, TradeData
+
+from ..template import RuleTemplate
+
+
+class StrategyLimitRule(RuleTemplate):
+    """策略上限检查风控规则（按OrderRequest.reference区分策略）"""
+
+    name: str = "策略上限检查"
+
+    parameters: dict[str, str] = {
+        "strategy_order_limit": "策略委托上限",
+        "strategy_cancel_limit": "策略撤单上限",
+        "strategy_trade_limit": "策略成交上限",
+        "strategy_active_limit": "策略活动委托上限"
+    }
+
+    variables: dict[str, str] = {
+        "strategy_order_count": "策略委托笔数",
+        "strategy_cancel_count": "策略撤单笔数",
+        "strategy_trade_count": "策略成交笔数"
+    }
+
+    def on_init(self) -> None:
+        """初始化"""
+        # 默认停用，确认参数后在界面中启用
+        self.active = False
+
+        # 默认参数
+        self.strategy_order_limit: int = 5_000
+        self.strategy_cancel_limit: int = 2_500
+        self.strategy_trade_limit: int = 2_500
+        self.strategy_active_limit: int = 20
+
+        # 数量统计（直接引用风控引擎中的策略索引）
+        self.strategy_order_count: dict[str, int] = self.risk_engine.reference_order_count
+        self.strategy_cancel_count: dict[str, int] = self.risk_engine.reference_cancel_count
+        self.strategy_trade_count: dict[str, int] = self.risk_engine.reference_trade_count
+
+    def check_allowed(self, req: OrderRequest, gateway_name: str) -> bool:
+        """检查是否允许委托"""
+        reference: str = req.reference
+
+        order_count: int = self.strategy_order_count.get(reference, 0)
+        if order_count >= self.strategy_order_limit:
+            self.write_log(f"策略[{reference}]委托笔数{order_count}达到上限{self.strategy_order_limit}：{req}")
+            return False
+
+        cancel_count: int = self.strategy_cancel_count.get(reference, 0)
+        if cancel_count >= self.strategy_cancel_limit:
+            self.write_log(f"策略[{reference}]撤单笔数{cancel_count}达到上限{self.strategy_cancel_limit}：{req}")
+            return False
+
+        trade_count: int = self.strategy_trade_count.get(reference, 0)
+        if trade_count >= self.strategy_trade_limit:
+            self.write_log(f"策略[{reference}]成交笔数{trade_count}达到上限{self.strategy_trade_limit}：{req}")
+            return False
+
+        active_count: int = self.risk_engine.get_reference_active_count(reference)
+        if active_count >= self.strategy_active_limit:
+            self.write_log(f"策略[{reference}]活动委托数量{active_count}达到上限{self.strategy_active_limit}：{req}")
+            return False
+
+        return True
+
+    def on_order(self, order: OrderData) -> None:
+        """委托推送"""
+        self.put_event()
+
+    def on_trade(self, trade: TradeData) -> None:
+        """成交推送"""
+        self.put_event()
@@ -0,0 +1,783 @@
+import hmac
+import os
+import socket
+import struct
+import traceback
+from enum import Enum
+from math import isnan, nan
+from datetime import datetime
+from itertools import count
+from queue import Queue, Empty
+from threading import Thread, Event as ThreadEvent, Lock
+from collections.abc import Callable
+from typing import Any
+
+from vnpy.event import Event, EventEngine
+from vnpy.trader.event import (
+    EVENT_TICK,
+    EVENT_ORDER,
+    EVENT_TRADE,
+    EVENT_POSITION,
+    EVENT_ACCOUNT,
+    EVENT_CONTRACT,
+    EVENT_TIMER
+)
+from vnpy.trader.object import (
+    OrderRequest,
+    TickData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    ContractData
+)
+from vnpy.trader.constant import Direction, Exchange, Offset, OrderType, Status, Product
+from vnpy.trader.engine import BaseEngine, MainEngine
+from vnpy.trader.utility import load_json, save_json
+
+from .engine import RiskEngine
+from .base import APP_NAME
+
+
+# 消息帧头：类型、序号、数据长度
+HEADER: struct.Struct = struct.Struct("<BII")
+
+# 消息类型
+MSG_CHECK: int = 1          # 客户端 -> 服务端：委托检查请求
+MSG_RESULT: int = 2         # 服务端 -> 客户端：委托检查结果
+MSG_EVENT: int = 3          # 客户端 -> 服务端：交易事件转发
+MSG_SENT: int = 4           # 客户端 -> 服务端：通过检查的委托发单结果（委托号）
+MSG_AUTH: int = 5           # 双向：连接认证（服务端发送随机数，客户端返回签名，服务端确认）
+
+# 单个消息帧的最大数据长度，以及连接认证的超时秒数
+MAX_FRAME_SIZE: int = 1 << 20
+AUTH_TIMEOUT: float = 5
+NONCE_SIZE: int = 16
+
+# 委托请求编码：方向、类型、开平、数量、价格
+REQUEST: struct.Struct = struct.Struct("<BBBdd")
+STRING: struct.Struct = struct.Struct("<H")
+
+DIRECTIONS: list[Direction] = list(Direction)
+ORDER_TYPES: list[OrderType] = list(OrderType)
+OFFSETS: list[Offset] = list(Offset)
+
+# 枚举字段为空时的编码
+NONE_INDEX: int = 0xFFFF
+
+# 单次批量发送的最大消息数量
+BATCH_SIZE: int = 1000
+
+
+class DataCodec:
+    """
+    交易数据的固定二进制编码
+
+    只编码风控规则使用的字段：枚举、布尔和浮点字段打包为定长结构，
+    字符串和时间字段（ISO格式）依次以长度前缀编码，解码时只构造对应的数据类。
+    """
+
+    def __init__(
+        self,
+        data_class: type,
+        strings: tuple[str, ...],
+        enums: dict[str, type[Enum]],
+        floats: tuple[str, ...],
+        flags: tuple[str, ...] = (),
+        datetimes: tuple[str, ...] = (),
+        optionals: tuple[str, ...] = ()
+    ) -> None:
+        """构造函数"""
+        self.data_class: type = data_class
+        self.strings: tuple[str, ...] = strings
+        self.datetimes: tuple[str, ...] = datetimes
+        self.enum_names: tuple[str, ...] = tuple(enums)
+        self.enum_values: list[list[Enum]] = [list(enum_class) for enum_class in enums.values()]
+        self.flags: tuple[str, ...] = flags
+        self.floats: tuple[str, ...] = floats
+        self.optionals: tuple[str, ...] = optionals
+
+        self.numbers: struct.Struct = struct.Struct(
+            "<" + "H" * len(self.enum_names) + "?" * len(flags) + "d" * len(floats)
+        )
+
+    def encode(self, data: Any) -> bytes:
+        """编码数据对象"""
+        values: list = []
+
+        for name, members in zip(self.enum_names, self.enum_values, strict=True):
+            value: Enum | None = getattr(data, name)
+            values.append(NONE_INDEX if value is None else members.index(value))
+
+        for name in self.flags:
+            values.append(bool(getattr(data, name)))
+
+        for name in self.floats:
+            number: float | None = getattr(data, name)
+            values.append(nan if number is None else number)
+
+        buf: bytes = self.numbers.pack(*values)
+
+        texts: list[str] = [getattr(data, name) for name in self.strings]
+        for name in self.datetimes:
+            dt: datetime | None = getattr(data, name)
+            texts.append(dt.isoformat() if dt else "")
+
+        for text in texts:
+            raw: bytes = text.encode("utf-8")
+            buf += STRING.pack(len(raw)) + raw
+
+        return buf
+
+    def decode(self, data: bytes) -> Any:
+        """解码为数据对象"""
+        values: tuple = self.numbers.unpack_from(data)
+        kwargs: dict[str, Any] = {}
+
+        ix: int = 0
+        for name, members in zip(self.enum_names, self.enum_values, strict=True):
+            index: int = values[ix]
+            kwargs[name] = None if index == NONE_INDEX else members[index]
+            ix += 1
+
+        for name in self.flags:
+            kwargs[name] = values[ix]
+            ix += 1
+
+        for name in self.floats:
+            number: float = values[ix]
+            kwargs[name] = None if name in self.optionals and isnan(number) else number
+            ix += 1
+
+        texts: list[str] = []
+        pos: int = self.numbers.size
+        for _ in range(len(self.strings) + len(self.datetimes)):
+            size: int = STRING.unpack_from(data, pos)[0]
+            pos += STRING.size
+            texts.append(data[pos:pos + size].decode("utf-8"))
+            pos += size
+
+        for name, text in zip(self.strings, texts[:len(self.strings)], strict=True):
+            kwargs[name] = text
+
+        for name, text in zip(self.datetimes, texts[len(self.strings):], strict=True):
+            kwargs[name] = datetime.fromisoformat(text) if text else None
+
+        return self.data_class(**kwargs)
+
+
+TICK_PRICES: tuple[str, ...] = tuple(
+    f"{side}_{field}_{level}"
+    for field in ["price", "volume"]
+    for side in ["bid", "ask"]
+    for level in range(1, 6)
+)
+
+# 转发的事件类型及其编码（事件类型在消息中以列表下标编码）
+CODECS: dict[str, DataCodec] = {
+    EVENT_CONTRACT: DataCodec(
+        ContractData,
+        strings=("gateway_name", "symbol", "name"),
+        enums={"exchange": Exchange, "product": Product},
+        floats=("size", "pricetick", "min_volume", "max_volume"),
+        flags=("stop_supported", "net_position", "history_data"),
+        optionals=("max_volume",)
+    ),
+    EVENT_ORDER: DataCodec(
+        OrderData,
+        strings=("gateway_name", "symbol", "orderid", "reference"),
+        enums={
+            "exchange": Exchange,
+            "type": OrderType,
+            "direction": Direction,
+            "offset": Offset,
+            "status": Status
+        },
+        floats=("price", "volume", "traded"),
+        datetimes=("datetime",)
+    ),
+    EVENT_TRADE: DataCodec(
+        TradeData,
+        strings=("gateway_name", "symbol", "orderid", "tradeid"),
+        enums={"exchange": Exchange, "direction": Direction, "offset": Offset},
+        floats=("price", "volume"),
+        datetimes=("datetime",)
+    ),
+    EVENT_POSITION: DataCodec(
+        PositionData,
+        strings=("gateway_name", "symbol"),
+        enums={"exchange": Exchange, "direction": Direction},
+        floats=("volume", "frozen", "price", "pnl", "yd_volume")
+    ),
+    EVENT_ACCOUNT: DataCodec(
+        AccountData,
+        strings=("gateway_name", "accountid"),
+        enums={},
+        floats=("balance", "frozen")
+    ),
+    EVENT_TICK: DataCodec(
+        TickData,
+        strings=("gateway_name", "symbol", "name"),
+        enums={"exchange": Exchange},
+        floats=(
+            "volume", "turnover", "open_interest", "last_price", "last_volume",
+            "limit_up", "limit_down", "open_price", "high_price", "low_price", "pre_close",
+            *TICK_PRICES
+        ),
+        datetimes=("datetime",)
+    )
+}
+EVENT_TYPES: list[str] = list(CODECS)
+EVENT_INDEX: struct.Struct = struct.Struct("<B")
+
+
+def encode_event(event_type: str, data: Any) -> bytes:
+    """将交易事件编码为二进制数据"""
+    return EVENT_INDEX.pack(EVENT_TYPES.index(event_type)) + CODECS[event_type].encode(data)
+
+
+def decode_event(data: bytes) -> tuple[str, Any]:
+    """从二进制数据解码交易事件"""
+    event_type: str = EVENT_TYPES[EVENT_INDEX.unpack_from(data)[0]]
+    return event_type, CODECS[event_type].decode(data[EVENT_INDEX.size:])
+
+
+def sign_nonce(secret: str, nonce: bytes) -> bytes:
+    """使用共享密钥对随机数签名"""
+    return hmac.new(secret.encode("utf-8"), nonce, "sha256").digest()
+
+
+def encode_request(req: OrderRequest, gateway_name: str) -> bytes:
+    """将委托请求编码为二进制数据"""
+    data: bytes = REQUEST.pack(
+        DIRECTIONS.index(req.direction),
+        ORDER_TYPES.index(req.type),
+        OFFSETS.index(req.offset),
+        req.volume,
+        req.price
+    )
+
+    for text in [req.symbol, req.exchange.value, req.reference, gateway_name]:
+        buf: bytes = text.encode("utf-8")
+        data += STRING.pack(len(buf)) + buf
+
+    return data
+
+
+def decode_request(data: bytes) -> tuple[OrderRequest, str]:
+    """从二进制数据解码委托请求"""
+    direction, order_type, offset, volume, price = REQUEST.unpack_from(data)
+
+    texts: list[str] = []
+    pos: int = REQUEST.size
+    for _ in range(4):
+        size: int = STRING.unpack_from(data, pos)[0]
+        pos += STRING.size
+        texts.append(data[pos:pos + size].decode("utf-8"))
+        pos += size
+
+    symbol, exchange, reference, gateway_name = texts
+
+    req: OrderRequest = OrderRequest(
+        symbol=symbol,
+        exchange=Exchange(exchange),
+        direction=DIRECTIONS[direction],
+        type=ORDER_TYPES[order_type],
+        volume=volume,
+        price=price,
+        offset=OFFSETS[offset],
+        reference=reference
+    )
+    return req, gateway_name
+
+
+def read_frames(buf: bytearray) -> list[tuple[int, int, bytes]]:
+    """从缓冲区中取出所有完整的消息帧"""
+    frames: list[tuple[int, int, bytes]] = []
+    pos: int = 0
+
+    while len(buf) - pos >= HEADER.size:
+        msg_type, seq, size = HEADER.unpack_from(buf, pos)
+        if size > MAX_FRAME_SIZE:
+            raise ValueError(f"消息帧长度超过上限：{size}")
+
+        end: int = pos + HEADER.size + size
+        if len(buf) < end:
+            break
+
+        frames.append((msg_type, seq, bytes(buf[pos + HEADER.size:end])))
+        pos = end
+
+    del buf[:pos]
+    return frames
+
+
+def pack_frame(msg_type: int, seq: int, data: bytes) -> bytes:
+    """打包消息帧"""
+    return HEADER.pack(msg_type, seq, len(data)) + data
+
+
+def recv_frame(sock: socket.socket, buf: bytearray) -> tuple[int, int, bytes]:
+    """阻塞读取一个消息帧（仅用于连接认证，此时对端不会连续发送多个消息）"""
+    while True:
+        frames: list[tuple[int, int, bytes]] = read_frames(buf)
+        if frames:
+            return frames[0]
+
+        data: bytes = sock.recv(65536)
+        if not data:
+            raise ConnectionError("连接已关闭")
+        buf.extend(data)
+
+
+class RiskServer:
+    """
+    风控服务端
+
+    托管一个完整的风控引擎（规则和状态），接收多个客户端转发的交易事件，
+    并对客户端的委托检查请求返回结果。每个连接由独立线程处理，同一次读取
+    到的多个检查请求批量返回结果。
+
+    客户端连接后须先通过共享密钥认证（对服务端随机数的HMAC签名），认证前
+    除认证消息外的任何消息都会导致连接关闭。通过检查的委托在服务端预占规则
+    计数，客户端发单后回传委托号（MSG_SENT）完成结算，连接断开时释放未结算的预占。
+    """
+
+    def __init__(
+        self,
+        risk_engine: RiskEngine,
+        host: str = "127.0.0.1",
+        port: int = 20555,
+        secret: str = ""
+    ) -> None:
+        """构造函数"""
+        self.risk_engine: RiskEngine = risk_engine
+        self.event_engine: EventEngine = risk_engine.event_engine
+        self.address: tuple[str, int] = (host, port)
+        self.secret: str = secret
+
+        self.server_socket: socket.socket | None = None
+        self.client_sockets: set[socket.socket] = set()
+        self.active: bool = False
+
+    def start(self) -> None:
+        """启动服务"""
+        if not self.secret:
+            self.write_log("风控服务启动失败，未配置共享密钥")
+            return
+
+        self.server_socket = socket.create_server(self.address)
+        self.address = self.server_socket.getsockname()[:2]
+        self.active = True
+
+        Thread(target=self.run_accept, daemon=True).start()
+
+        self.write_log(f"风控服务启动成功，监听地址：{self.address[0]}:{self.address[1]}")
+
+    def stop(self) -> None:
+        """停止服务"""
+        self.active = False
+
+        if self.server_socket:
+            self.server_socket.close()
+
+        for sock in list(self.client_sockets):
+            sock.close()
+
+    def run_accept(self) -> None:
+        """接受客户端连接"""
+        while self.active and self.server_socket:
+            try:
+                sock, address = self.server_socket.accept()
+            except OSError:
+                break
+
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.client_sockets.add(sock)
+
+            Thread(target=self.run_client, args=(sock, address), daemon=True).start()
+
+    def authenticate(self, sock: socket.socket, buf: bytearray) -> bool:
+        """认证客户端：发送随机数并校验客户端返回的签名"""
+        nonce: bytes = os.urandom(NONCE_SIZE)
+
+        sock.settimeout(AUTH_TIMEOUT)
+        sock.sendall(pack_frame(MSG_AUTH, 0, nonce))
+
+        msg_type, _, payload = recv_frame(sock, buf)
+        if msg_type != MSG_AUTH or not hmac.compare_digest(payload, sign_nonce(self.secret, nonce)):
+            return False
+
+        sock.sendall(pack_frame(MSG_AUTH, 0, b"\x01"))
+        sock.settimeout(None)
+        return True
+
+    def run_client(self, sock: socket.socket, address: tuple) -> None:
+        """处理客户端消息"""
+        buf: bytearray = bytearray()
+
+        # 已通过检查、等待发单结果的预占：序号 -> (委托请求, 预占编号)
+        reservations: dict[int, tuple[OrderRequest, str]] = {}
+
+        try:
+            if not self.authenticate(sock, buf):
+                self.write_log(f"风控客户端认证失败：{address[0]}:{address[1]}")
+                return
+
+            self.write_log(f"风控客户端连接：{address[0]}:{address[1]}")
+
+            while self.active:
+                data: bytes = sock.recv(65536)
+                if not data:
+                    break
+                buf.extend(data)
+
+                replies: list[bytes] = []
+                for msg_type, seq, payload in read_frames(buf):
+                    if msg_type == MSG_CHECK:
+                        result: bool = self.check_order(payload, seq, reservations)
+                        replies.append(pack_frame(MSG_RESULT, seq, b"\x01" if result else b"\x00"))
+                    elif msg_type == MSG_SENT:
+                        self.settle_order(reservations.pop(seq, None), payload.decode("utf-8"))
+                    elif msg_type == MSG_EVENT:
+                        event_type, event_data = decode_event(payload)
+                        self.event_engine.put(Event(event_type, event_data))
+
+                if replies:
+                    sock.sendall(b"".join(replies))
+        except OSError:
+            pass
+        except Exception:
+            self.write_log(f"风控客户端消息处理出错：{traceback.format_exc()}")
+        finally:
+            self.client_sockets.discard(sock)
+            sock.close()
+
+            # 客户端断开时未回传发单结果的委托视为发单失败
+            for reservation in reservations.values():
+                self.settle_order(reservation, "")
+
+        self.write_log(f"风控客户端断开：{address[0]}:{address[1]}")
+
+    def check_order(self, payload: bytes, seq: int, reservations: dict[int, tuple[OrderRequest, str]]) -> bool:
+        """检查委托请求，通过时预占规则计数"""
+        req, gateway_name = decode_request(payload)
+
+        with self.risk_engine.lock:
+            if not self.risk_engine.check_order(req, gateway_name):
+                return False
+
+            reservations[seq] = (req, self.risk_engine.reserve_order(req))
+
+        return True
+
+    def settle_order(self, reservation: tuple[OrderRequest, str] | None, vt_orderid: str) -> None:
+        """根据客户端回传的委托号结算预占"""
+        if not reservation:
+            return
+
+        req, reserve_id = reservation
+        with self.risk_engine.lock:
+            self.risk_engine.settle_order(req, reserve_id, vt_orderid)
+
+    def write_log(self, msg: str) -> None:
+        """输出日志"""
+        self.risk_engine.main_engine.write_log(msg, source="RiskServer")
+
+
+class RiskClientEngine(BaseEngine):
+    """
+    风控客户端引擎
+
+    替换主引擎的send_order函数，将委托检查请求发送到风控服务端，
+    发单后回传委托号，同时转发交易事件供服务端维护风控状态。多个线程
+    的请求通过序号流水线并发等待结果，待发送消息由后台线程批量写入。
+    """
+
+    setting_filename: str = "risk_client_setting.json"
+
+    def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
+        """构造函数"""
+        super().__init__(main_engine, event_engine, APP_NAME)
+
+        # 默认配置：超时秒数，以及超时或断线时是否放行委托
+        self.host: str = "127.0.0.1"
+        self.port: int = 20555
+        self.timeout: float = 0.5
+        self.fail_open: bool = False
+        self.forward_tick: bool = True
+        self.secret: str = ""
+
+        self.load_setting()
+
+        # 连接状态
+        self.sock: socket.socket | None = None
+        self.connected: bool = False
+        self.connecting: bool = False
+        self.reconnect_count: int = 0
+
+        # 待发送消息队列
+        self.queue: Queue = Queue()
+
+        # 等待结果的请求：序号 -> (通知对象, 结果列表)
+        self.seq_count: count = count(1)
+        self.waiters: dict[int, tuple[ThreadEvent, list[bool]]] = {}
+        self.waiters_lock: Lock = Lock()
+
+        # 检查统计
+        self.check_count: int = 0
+        self.reject_count: int = 0
+        self.timeout_count: int = 0
+
+        Thread(target=self.run_write, daemon=True).start()
+
+        self.connect()
+        self.register_events()
+        self.patch_functions()
+
+    def load_setting(self) -> None:
+        """加载客户端配置"""
+        setting: dict = load_json(self.setting_filename)
+
+        if not setting:
+            setting = {
+                "host": self.host,
+                "port": self.port,
+                "timeout": self.timeout,
+                "fail_open": self.fail_open,
+                "forward_tick": self.forward_tick,
+                "secret": self.secret
+            }
+            save_json(self.setting_filename, setting)
+
+        self.host = setting.get("host", self.host)
+        self.port = setting.get("port", self.port)
+        self.timeout = setting.get("timeout", self.timeout)
+        self.fail_open = setting.get("fail_open", self.fail_open)
+        self.forward_tick = setting.get("forward_tick", self.forward_tick)
+        self.secret = setting.get("secret", self.secret)
+
+    def patch_functions(self) -> None:
+        """动态替换主引擎函数"""
+        self._send_order: Callable[[OrderRequest, str], str] = self.main_engine.send_order
+        self.main_engine.send_order = self.send_order     # type: ignore
+
+    def register_events(self) -> None:
+        """注册需要转发的事件"""
+        event_types: list[str] = [EVENT_CONTRACT, EVENT_ORDER, EVENT_TRADE, EVENT_POSITION, EVENT_ACCOUNT]
+        if self.forward_tick:
+            event_types.append(EVENT_TICK)
+
+        for event_type in event_types:
+            self.event_engine.register(event_type, self.process_forward_event)
+
+        self.event_engine.register(EVENT_TIMER, self.process_timer_event)
+
+    def connect(self) -> bool:
+        """连接风控服务端"""
+        try:
+            sock: socket.socket = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        except OSError:
+            self.main_engine.write_log(f"风控服务连接失败：{self.host}:{self.port}", source="RiskClient")
+            return False
+
+        if not self.authenticate(sock):
+            sock.close()
+            self.main_engine.write_log(f"风控服务认证失败：{self.host}:{self.port}", source="RiskClient")
+            return False
+
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        self.connected = True
+
+        # 连接后先同步全部合约信息
+        for contract in self.main_engine.get_all_contracts():
+            self.forward_event(EVENT_CONTRACT, contract)
+
+        Thread(target=self.run_read, args=(sock,), daemon=True).start()
+
+        self.main_engine.write_log(f"风控服务连接成功：{self.host}:{self.port}", source="RiskClient")
+        return True
+
+    def authenticate(self, sock: socket.socket) -> bool:
+        """使用共享密钥响应服务端的认证请求"""
+        buf: bytearray = bytearray()
+
+        try:
+            msg_type, _, nonce = recv_frame(sock, buf)
+            if msg_type != MSG_AUTH:
+                return False
+
+            sock.sendall(pack_frame(MSG_AUTH, 0, sign_nonce(self.secret, nonce)))
+
+            msg_type, _, payload = recv_frame(sock, buf)
+        except (OSError, ValueError):
+            return False
+
+        return msg_type == MSG_AUTH and payload == b"\x01"
+
+    def send_order(self, req: OrderRequest, gateway_name: str) -> str:
+        """下单请求发送到风控服务检查"""
+        seq: int = next(self.seq_count)
+
+        result: bool = self.check_remote(req, gateway_name, seq)
+        if not result:
+            with self.waiters_lock:
+                self.reject_count += 1
+
+            # 超时或断线拦截时服务端可能已通过检查并预占，回传空委托号释放（服务端忽略没有预占的序号）
+            if self.connected:
+                self.queue.put(pack_frame(MSG_SENT, seq, b""))
+            return ""
+
+        # 回传发单结果，服务端据此将预占转到委托号（发单失败时为空，释放预占）
+        vt_orderid: str = ""
+        try:
+            vt_orderid = self._send_order(req, gateway_name)
+        finally:
+            if self.connected:
+                self.queue.put(pack_frame(MSG_SENT, seq, vt_orderid.encode("utf-8")))
+
+        return vt_orderid
+
+    def check_remote(self, req: OrderRequest, gateway_name: str, seq: int) -> bool:
+        """向风控服务端发送检查请求并等待结果"""
+        notify: ThreadEvent = ThreadEvent()
+        result: list[bool] = []
+
+        with self.waiters_lock:
+            self.check_count += 1
+
+            if not self.connected:
+                return self.on_failure(f"风控服务未连接：{req}")
+
+            self.waiters[seq] = (notify, result)
+
+        self.queue.put(pack_frame(MSG_CHECK, seq, encode_request(req, gateway_name)))
+
+        if not notify.wait(self.timeout):
+            with self.waiters_lock:
+                self.waiters.pop(seq, None)
+                self.timeout_count += 1
+
+            return self.on_failure(f"风控服务响应超时：{req}")
+
+        if not result:
+            return self.on_failure(f"风控服务连接断开：{req}")
+
+        if not result[0]:
+            self.main_engine.write_log(f"委托被风控服务拦截：{req}", source="RiskClient")
+            return False
+
+        return True
+
+    def on_failure(self, msg: str) -> bool:
+        """超时或断线时按配置放行或拦截"""
+        if self.fail_open:
+            self.main_engine.write_log(f"{msg}，按配置放行委托", source="RiskClient")
+            return True
+        else:
+            self.main_engine.write_log(f"{msg}，按配置拦截委托", source="RiskClient")
+            return False
+
+    def process_forward_event(self, event: Event) -> None:
+        """转发交易事件"""
+        self.forward_event(event.type, event.data)
+
+    def process_timer_event(self, event: Event) -> None:
+        """断线后定时重连（在后台线程中连接，不阻塞事件线程）"""
+        if self.connected or self.connecting:
+            return
+
+        self.reconnect_count += 1
+        if self.reconnect_count >= 5:
+            self.reconnect_count = 0
+            self.connecting = True
+            Thread(target=self.run_reconnect, daemon=True).start()
+
+    def run_reconnect(self) -> None:
+        """重连风控服务端"""
+        try:
+            self.connect()
+        finally:
+            self.connecting = False
+
+    def forward_event(self, event_type: str, data: Any) -> None:
+        """将事件放入发送队列"""
+        if not self.connected:
+            return
+
+        self.queue.put(pack_frame(MSG_EVENT, 0, encode_event(event_type, data)))
+
+    def run_write(self) -> None:
+        """批量发送队列中的消息"""
+        while True:
+            frames: list[bytes] = [self.queue.get()]
+
+            while len(frames) < BATCH_SIZE:
+                try:
+                    frames.append(self.queue.get_nowait())
+                except Empty:
+                    break
+
+            sock: socket.socket | None = self.sock
+            if not sock or not self.connected:
+                continue
+
+            try:
+                sock.sendall(b"".join(frames))
+            except OSError:
+                self.disconnect(sock)
+
+    def run_read(self, sock: socket.socket) -> None:
+        """接收检查结果并唤醒等待中的请求"""
+        buf: bytearray = bytearray()
+
+        while True:
+            try:
+                data: bytes = sock.recv(65536)
+            except OSError:
+                data = b""
+
+            if not data:
+                self.disconnect(sock)
+                return
+
+            buf.extend(data)
+
+            for msg_type, seq, payload in read_frames(buf):
+                if msg_type != MSG_RESULT:
+                    continue
+
+                with self.waiters_lock:
+                    waiter: tuple[ThreadEvent, list[bool]] | None = self.waiters.pop(seq, None)
+
+                if waiter:
+                    notify, result = waiter
+                    result.append(payload == b"\x01")
+                    notify.set()
+
+    def disconnect(self, sock: socket.socket) -> None:
+        """断开连接"""
+        if self.sock is not sock:
+            return
+
+        self.connected = False
+        self.sock = None
+        sock.close()
+
+        # 唤醒所有等待中的请求（无结果时按断线处理）
+        with self.waiters_lock:
+            waiters: list[tuple[ThreadEvent, list[bool]]] = list(self.waiters.values())
+            self.waiters.clear()
+
+        for notify, _ in waiters:
+            notify.set()
+
+        self.main_engine.write_log("风控服务连接断开", source="RiskClient")
+
+    def close(self) -> None:
+        """关闭引擎"""
+        if self.sock:
+            self.disconnect(self.sock)
@@ -0,0 +1,233 @@
+import traceback
+from collections import deque
+from queue import SimpleQueue
+from threading import Thread, Event
+from typing import Any, TYPE_CHECKING, cast
+
+from vnpy.trader.object import OrderRequest
+
+from .template import RuleTemplate
+from .portfolio import PortfolioRuleTemplate
+
+if TYPE_CHECKING:
+    from .engine import RiskEngine
+
+
+class ShadowEngine:
+    """
+    影子规则使用的引擎代理
+
+    查询函数转发给风控引擎，拦截日志只记录不输出，数据更新事件和暂停交易请求被忽略，
+    不使用多进程共享计数器，保证影子规则不会影响实盘风控状态。
+    """
+
+    def __init__(self, risk_engine: "RiskEngine") -> None:
+        """构造函数"""
+        self.risk_engine: RiskEngine = risk_engine
+
+        self.last_msg: str = ""
+
+    def __getattr__(self, name: str) -> Any:
+        """其他属性和查询函数转发给风控引擎"""
+        return getattr(self.risk_engine, name)
+
+    def write_log(self, msg: str) -> None:
+        """记录拦截原因"""
+        self.last_msg = msg
+
+    def put_rule_event(self, rule: RuleTemplate) -> None:
+        """不推送数据更新事件"""
+        pass
+
+    def halt(self, reason: str, cancel_orders: bool = False) -> None:
+        """只记录暂停交易请求"""
+        self.last_msg = f"触发暂停交易：{reason}"
+
+    def get_shared_counter(self) -> Any:
+        """不使用多进程共享计数器"""
+        return None
+
+
+class ShadowRunner:
+    """
+    影子规则运行器
+
+    每个影子规则是实盘规则类的另一个实例（使用候选参数），引擎将回调和检查请求放入队列后立即返回，
+    由后台线程按顺序执行，记录影子规则的检查结果并统计与实盘规则决策的差异，不会拦截委托。
+    """
+
+    def __init__(self, risk_engine: "RiskEngine", max_size: int = 100_000, record_size: int = 100) -> None:
+        """构造函数"""
+        self.risk_engine: RiskEngine = risk_engine
+        self.shadow_engine: ShadowEngine = ShadowEngine(risk_engine)
+
+        self.max_size: int = max_size
+        self.record_size: int = record_size
+
+        # 以下数据只在后台线程中修改
+        self.rules: dict[str, RuleTemplate] = {}
+        self.stats: dict[str, dict[str, Any]] = {}
+
+        self.dropped_count: int = 0
+
+        self.queue: SimpleQueue = SimpleQueue()
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def put(self, *item: Any) -> None:
+        """添加任务（队列已满时丢弃检查任务并计数，不阻塞调用方；状态回调始终加入队列，保证影子规则状态完整）"""
+        if item[0] == "check" and self.queue.qsize() >= self.max_size:
+            self.dropped_count += 1
+            return
+        self.queue.put(item)
+
+    def add_rule(self, rule_name: str, rule_class: type[RuleTemplate], setting: dict) -> None:
+        """添加影子规则（已存在时替换），需要在引擎锁内调用，保证初始数据和后续回调的顺序一致"""
+        main_engine: Any = self.risk_engine.main_engine
+
+        data: list[tuple[str, Any]] = []
+        data.extend(("on_position", position) for position in main_engine.get_all_positions())
+        data.extend(("on_account", account) for account in main_engine.get_all_accounts())
+        data.extend(("on_order", order) for order in main_engine.get_all_active_orders())
+
+        self.queue.put(("add", rule_name, rule_class, setting, data))
+
+    def remove_rule(self, rule_name: str) -> None:
+        """移除影子规则"""
+        self.queue.put(("remove", rule_name))
+
+    def run(self) -> None:
+        """任务处理线程"""
+        while True:
+            item: tuple = self.queue.get()
+            if item[0] is None:
+                for rule in self.rules.values():
+                    close_rule(rule)
+                return
+
+            try:
+                self.process(item)
+            except Exception:
+                self.risk_engine.write_error(f"影子规则执行异常：{traceback.format_exc()}")
+
+    def process(self, item: tuple) -> None:
+        """处理任务"""
+        method: str = item[0]
+
+        if method == "check":
+            self.process_check(*item[1:])
+        elif method == "add":
+            self.process_add(*item[1:])
+        elif method == "remove":
+            rule: RuleTemplate | None = self.rules.pop(item[1], None)
+            if rule:
+                close_rule(rule)
+            self.stats.pop(item[1], None)
+        elif method == "report":
+            self.process_report(*item[1:])
+        else:
+            for rule in self.rules.values():
+                getattr(rule, method)(*item[1:])
+
+    def process_add(
+        self,
+        rule_name: str,
+        rule_class: type[RuleTemplate],
+        setting: dict,
+        data: list[tuple[str, Any]]
+    ) -> None:
+        """创建影子规则，并用添加时的持仓、资金和活动委托初始化"""
+        # 引擎代理实现了规则使用的全部引擎接口
+        rule: RuleTemplate = rule_class(cast("RiskEngine", self.shadow_engine), setting)
+
+        for method, obj in data:
+            getattr(rule, method)(obj)
+
+        previous: RuleTemplate | None = self.rules.get(rule_name, None)
+        if previous:
+            close_rule(previous)
+
+        self.rules[rule_name] = rule
+        self.stats[rule_name] = {
+            "setting": setting,
+            "check_count": 0,
+            "reject_count": 0,
+            "would_reject_count": 0,
+            "would_pass_count": 0,
+            "uncompared_count": 0,
+            "records": deque(maxlen=self.record_size),
+        }
+
+    def process_check(
+        self,
+        req: OrderRequest,
+        gateway_name: str,
+        result: bool,
+        reject_rule: str,
+        timestamp: float
+    ) -> None:
+        """执行影子检查并与实盘规则的决策对比"""
+        shadow_engine: ShadowEngine = self.shadow_engine
+
+        for rule_name, rule in self.rules.items():
+            shadow_engine.last_msg = ""
+            allowed: bool = not rule.active or rule.check_allowed(req, gateway_name)
+
+            stats: dict[str, Any] = self.stats[rule_name]
+            stats["check_count"] += 1
+            if not allowed:
+                stats["reject_count"] += 1
+
+            # 实盘规则的决策：被该规则拦截、委托通过，或者被其他规则拦截（该规则未执行，不参与对比）
+            live: bool | None
+            if reject_rule == rule_name:
+                live = False
+            elif result:
+                live = True
+            else:
+                live = None
+
+            if live is None:
+                stats["uncompared_count"] += 1
+            elif live and not allowed:
+                stats["would_reject_count"] += 1
+                stats["records"].append((timestamp, str(req), shadow_engine.last_msg))
+            elif not live and allowed:
+                stats["would_pass_count"] += 1
+
+    def process_report(self, report: dict[str, dict[str, Any]], event: Event) -> None:
+        """在后台线程中复制对比统计和影子规则变量"""
+        try:
+            for rule_name, stats in self.stats.items():
+                data: dict[str, Any] = dict(stats)
+                data["records"] = list(stats["records"])
+
+                variables: dict[str, Any] = self.rules[rule_name].get_data()["variables"]
+                data["variables"] = {
+                    name: dict(value) if isinstance(value, dict) else value for name, value in variables.items()
+                }
+
+                report[rule_name] = data
+        finally:
+            event.set()
+
+    def get_report(self, timeout: float = 5) -> dict[str, dict[str, Any]]:
+        """获取影子规则的对比统计（等待队列中已有的任务处理完成）"""
+        report: dict[str, dict[str, Any]] = {}
+        event: Event = Event()
+
+        self.queue.put(("report", report, event))
+        event.wait(timeout)
+
+        return report
+
+    def close(self) -> None:
+        """处理完队列中的任务后停止线程"""
+        self.queue.put((None,))
+        self.thread.join()
+
+
+def close_rule(rule: RuleTemplate) -> None:
+    """停止影子规则的后台线程（组合规则）"""
+    if isinstance(rule, PortfolioRuleTemplate):
+        rule.close()
@@ -0,0 +1,24 @@
+# cython: language_level=3
+
+cdef class SharedCounter:
+    """多进程共享计数器 C 接口声明"""
+
+    cdef readonly str name
+    cdef readonly Py_ssize_t capacity
+    cdef readonly Py_ssize_t owner_count
+    cdef readonly long long pid
+    cdef object shm
+    cdef long long* owners
+    cdef long long* keys
+    cdef long long* values
+    cdef dict slots
+    cdef dict owned_slots
+    cdef dict owner_slots
+
+    cpdef long long add(self, str key, long long delta)
+    cpdef long long get(self, str key)
+    cpdef long long add_owned(self, str key, long long delta)
+    cpdef long long get_owned(self, str key)
+    cpdef void register(self)
+    cpdef int reclaim(self)
+    cdef Py_ssize_t find_slot(self, str key, bint create) except -2
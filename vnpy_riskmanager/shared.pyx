@@ -0,0 +1,289 @@
+# cython: language_level=3
+import os
+import sys
+from multiprocessing import shared_memory, resource_tracker
+
+
+cdef extern from *:
+    """
+    #if defined(_MSC_VER)
+    #include <intrin.h>
+    static inline long long vn_atomic_add(long long* p, long long v) {
+        return _InterlockedExchangeAdd64((volatile long long*)p, v) + v;
+    }
+    static inline long long vn_atomic_load(long long* p) {
+        return _InterlockedCompareExchange64((volatile long long*)p, 0, 0);
+    }
+    static inline long long vn_atomic_cas(long long* p, long long expected, long long desired) {
+        return _InterlockedCompareExchange64((volatile long long*)p, desired, expected);
+    }
+    #else
+    static inline long long vn_atomic_add(long long* p, long long v) {
+        return __atomic_add_fetch(p, v, __ATOMIC_SEQ_CST);
+    }
+    static inline long long vn_atomic_load(long long* p) {
+        return __atomic_load_n(p, __ATOMIC_SEQ_CST);
+    }
+    static inline long long vn_atomic_cas(long long* p, long long expected, long long desired) {
+        __atomic_compare_exchange_n(p, &expected, desired, 0, __ATOMIC_SEQ_CST, __ATOMIC_SEQ_CST);
+        return expected;
+    }
+    #endif
+    """
+    long long vn_atomic_add(long long* p, long long v) nogil
+    long long vn_atomic_load(long long* p) nogil
+    long long vn_atomic_cas(long long* p, long long expected, long long desired) nogil
+
+
+# 持有者（进程号）登记表的槽位数量，位于共享内存段开头
+cdef Py_ssize_t MAX_OWNERS = 64
+
+# 本进程已使用过的持有计数（同一进程内的多个计数器对象共用，只在首次使用时清除遗留计数）
+cdef set owned_keys = set()
+
+
+cdef long long hash_key(str key):
+    """FNV-1a哈希（跨进程一致，不受Python哈希随机化影响）"""
+    cdef bytes data = key.encode("utf-8")
+    cdef unsigned long long h = 14695981039346656037ULL
+    cdef unsigned char c
+
+    for c in data:
+        h ^= c
+        h *= 1099511628211ULL
+
+    # 0用于标记空槽位
+    if h == 0:
+        h = 1
+    return <long long>h
+
+
+cdef class SharedCounter:
+    """
+    多进程共享计数器
+
+    计数存储在命名共享内存段中，同一主机上的多个进程打开同名计数器后，
+    通过原子操作对同一组计数进行增减和读取。
+
+    内存布局：开头为持有者进程号登记表，其后为开放寻址哈希表（前半部分为各槽位的键哈希，后半部分为计数值）。
+
+    普通计数（委托、撤单、成交笔数等）由所有进程共同累加；持有计数（活动委托数量等）按进程分别存放，
+    汇总时只计入登记表中的存活进程，进程异常退出后由其他进程定时回收登记，其遗留的计数不再计入。
+    """
+
+    def __init__(self, str name, Py_ssize_t capacity=16384) -> None:
+        """构造函数"""
+        self.name = name
+        self.shm = open_shared_memory(name, (MAX_OWNERS + capacity * 2) * 8)
+
+        # 以共享内存段实际大小计算槽位数量，保证各进程一致
+        cdef long long[::1] buffer = self.shm.buf.cast("q")
+        self.owner_count = MAX_OWNERS
+        self.owners = &buffer[0]
+        self.capacity = (buffer.shape[0] - MAX_OWNERS) // 2
+        self.keys = &buffer[MAX_OWNERS]
+        self.values = &buffer[MAX_OWNERS + self.capacity]
+
+        # 本进程内的键到槽位缓存
+        self.slots = {}
+
+        # 持有计数的槽位缓存：键 -> 本进程槽位，(键, 进程号) -> 槽位
+        self.owned_slots = {}
+        self.owner_slots = {}
+
+        self.pid = os.getpid()
+        self.register()
+
+    cpdef long long add(self, str key, long long delta):
+        """原子增减计数，返回增减后的值"""
+        cdef Py_ssize_t slot = self.find_slot(key, True)
+        return vn_atomic_add(&self.values[slot], delta)
+
+    cpdef long long get(self, str key):
+        """读取计数"""
+        cdef Py_ssize_t slot = self.find_slot(key, False)
+        if slot < 0:
+            return 0
+        return vn_atomic_load(&self.values[slot])
+
+    cpdef long long add_owned(self, str key, long long delta):
+        """原子增减本进程持有的计数，返回所有存活进程持有计数的汇总值"""
+        cdef Py_ssize_t slot
+        cached = self.owned_slots.get(key, None)
+
+        if cached is None:
+            slot = self.find_slot(f"{key}|{self.pid}", True)
+
+            # 进程号可能被复用，本进程首次使用时清除之前同号进程遗留的计数
+            owned_key = (self.name, key)
+            if owned_key not in owned_keys:
+                owned_keys.add(owned_key)
+                vn_atomic_add(&self.values[slot], -vn_atomic_load(&self.values[slot]))
+
+            self.owned_slots[key] = slot
+        else:
+            slot = cached
+
+        vn_atomic_add(&self.values[slot], delta)
+        return self.get_owned(key)
+
+    cpdef long long get_owned(self, str key):
+        """读取所有登记进程持有计数的汇总值"""
+        cdef long long total = 0
+        cdef long long pid
+        cdef Py_ssize_t i
+        cdef Py_ssize_t slot
+
+        for i in range(self.owner_count):
+            pid = vn_atomic_load(&self.owners[i])
+            if not pid:
+                continue
+
+            cached = self.owner_slots.get((key, pid), None)
+            if cached is None:
+                slot = self.find_slot(f"{key}|{pid}", False)
+                if slot < 0:
+                    continue
+                self.owner_slots[(key, pid)] = slot
+            else:
+                slot = cached
+
+            total += vn_atomic_load(&self.values[slot])
+
+        return total
+
+    cpdef void register(self):
+        """在登记表中登记本进程（先回收已退出进程的登记）"""
+        cdef Py_ssize_t i
+
+        self.reclaim()
+
+        for i in range(self.owner_count):
+            if vn_atomic_load(&self.owners[i]) == self.pid:
+                return
+
+        for i in range(self.owner_count):
+            if vn_atomic_cas(&self.owners[i], 0, self.pid) == 0:
+                return
+
+        raise RuntimeError(f"共享计数器[{self.name}]登记进程已满，上限{self.owner_count}个")
+
+    cpdef int reclaim(self):
+        """回收已退出进程的登记，返回回收数量"""
+        cdef int count = 0
+        cdef long long pid
+        cdef Py_ssize_t i
+
+        if not self.capacity:
+            return 0
+
+        for i in range(self.owner_count):
+            pid = vn_atomic_load(&self.owners[i])
+            if not pid or pid == self.pid or is_process_alive(pid):
+                continue
+
+            if vn_atomic_cas(&self.owners[i], pid, 0) == pid:
+                count += 1
+
+        return count
+
+    cdef Py_ssize_t find_slot(self, str key, bint create) except -2:
+        """查找键所在槽位，不存在时按需分配"""
+        cached = self.slots.get(key, None)
+        if cached is not None:
+            return cached
+
+        if not self.capacity:
+            raise RuntimeError(f"共享计数器[{self.name}]已关闭")
+
+        cdef long long h = hash_key(key)
+        cdef Py_ssize_t slot = <Py_ssize_t>(<unsigned long long>h % <unsigned long long>self.capacity)
+        cdef Py_ssize_t i
+        cdef long long current
+
+        for i in range(self.capacity):
+            current = vn_atomic_load(&self.keys[slot])
+
+            if current == 0:
+                if not create:
+                    return -1
+
+                # 抢占空槽位，失败时说明已被其他进程占用，重新判断
+                current = vn_atomic_cas(&self.keys[slot], 0, h)
+                if current == 0:
+                    current = h
+
+            if current == h:
+                self.slots[key] = slot
+                return slot
+
+            slot = (slot + 1) % self.capacity
+
+        if not create:
+            return -1
+        raise RuntimeError(f"共享计数器[{self.name}]槽位已满，容量{self.capacity}")
+
+    def close(self) -> None:
+        """关闭共享内存（不删除，其他进程仍可使用）"""
+        self.capacity = 0
+        self.owner_count = 0
+        self.owners = NULL
+        self.keys = NULL
+        self.values = NULL
+        self.slots.clear()
+        self.owned_slots.clear()
+        self.owner_slots.clear()
+        self.shm.close()
+
+    def unlink(self) -> None:
+        """删除共享内存段"""
+        # 创建时已从resource_tracker注销，删除前需重新注册
+        if os.name == "posix" and sys.version_info < (3, 13):
+            resource_tracker.register(self.shm._name, "shared_memory")
+        self.shm.unlink()
+
+
+def is_process_alive(long long pid) -> bool:
+    """检查进程是否存活"""
+    if os.name == "nt":
+        import ctypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+
+        # PROCESS_QUERY_LIMITED_INFORMATION，拒绝访问（ERROR_ACCESS_DENIED）说明进程存在
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return ctypes.get_last_error() == 5
+
+        exit_code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+        kernel32.CloseHandle(handle)
+
+        # STILL_ACTIVE
+        return exit_code.value == 259
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def open_shared_memory(str name, Py_ssize_t size) -> shared_memory.SharedMemory:
+    """创建或打开命名共享内存段"""
+    kwargs: dict = {}
+    if sys.version_info >= (3, 13):
+        kwargs["track"] = False
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size, **kwargs)
+    except FileExistsError:
+        shm = shared_memory.SharedMemory(name=name, **kwargs)
+
+    # 避免进程退出时共享内存段被resource_tracker删除，导致其他进程的计数丢失
+    if os.name == "posix" and sys.version_info < (3, 13):
+        resource_tracker.unregister(shm._name, "shared_memory")
+
+    return shm
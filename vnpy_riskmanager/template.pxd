@@ -5,6 +5,7 @@ cdef class RuleTemplate:
 
     cdef readonly object risk_engine
     cdef public bint active
+    cdef public bint pure
     cdef public str name
     cdef public dict parameters
     cdef public dict variables
@@ -12,11 +13,20 @@ cdef class RuleTemplate:
     cpdef void write_log(self, str msg)
     cpdef void update_setting(self, dict rule_setting)
     cpdef bint check_allowed(self, object req, str gateway_name)
+    cpdef object compile_check(self, str vt_symbol)
     cpdef void on_init(self)
+    cpdef void on_send_order(self, object req, str vt_orderid)
+    cpdef void on_send_result(self, object req, str reserve_id, str vt_orderid)
     cpdef void on_tick(self, object tick)
     cpdef void on_order(self, object order)
     cpdef void on_trade(self, object trade)
+    cpdef void on_position(self, object position)
+    cpdef void on_account(self, object account)
     cpdef void on_timer(self)
+    cpdef double get_time(self)
     cpdef object get_contract(self, str vt_symbol)
+    cpdef list get_all_positions(self)
+    cpdef list get_all_accounts(self)
+    cpdef object get_shared_counter(self)
     cpdef void put_event(self)
     cpdef dict get_data(self)
@@ -1,6 +1,15 @@
+from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
-from vnpy.trader.object import OrderRequest, TickData, OrderData, TradeData, ContractData
+from vnpy.trader.object import (
+    OrderRequest,
+    TickData,
+    OrderData,
+    TradeData,
+    PositionData,
+    AccountData,
+    ContractData
+)
 
 if TYPE_CHECKING:
     from .engine import RiskEngine
@@ -18,6 +27,9 @@ class RuleTemplate:
     # 变量字段和名称
     variables: dict[str, str] = {}
 
+    # 纯函数检查：结果只取决于委托请求、合约信息和规则参数（引擎会缓存通过的检查结果）
+    pure: bool = False
+
     def __init__(self, risk_engine: "RiskEngine", setting: dict) -> None:
         """构造函数"""
         # 绑定风控引擎对象
@@ -53,10 +65,22 @@ class RuleTemplate:
         """检查是否允许委托"""
         return True
 
+    def compile_check(self, vt_symbol: str) -> Callable[[OrderRequest, str], bool] | None:
+        """编译合约专用的检查函数（折叠合约常量和规则参数），返回None时使用check_allowed"""
+        return None
+
     def on_init(self) -> None:
         """初始化"""
         pass
 
+    def on_send_order(self, req: OrderRequest, vt_orderid: str) -> None:
+        """委托发出（检查通过后、调用网关前调用，vt_orderid为临时预占编号，用于预占计数）"""
+        pass
+
+    def on_send_result(self, req: OrderRequest, reserve_id: str, vt_orderid: str) -> None:
+        """委托发出结果（预占转到委托号，收到委托推送后再核对；vt_orderid为空表示发单失败或已由推送计数，需释放预占）"""
+        pass
+
     def on_tick(self, tick: TickData) -> None:
         """行情推送"""
         pass
@@ -69,14 +93,38 @@ class RuleTemplate:
         """成交推送"""
         pass
 
+    def on_position(self, position: PositionData) -> None:
+        """持仓推送"""
+        pass
+
+    def on_account(self, account: AccountData) -> None:
+        """资金推送"""
+        pass
+
     def on_timer(self) -> None:
         """定时推送（每秒触发）"""
         pass
 
+    def get_time(self) -> float:
+        """获取当前时间戳（秒，使用风控引擎时钟，回放时为模拟时间）"""
+        return self.risk_engine.get_time()
+
     def get_contract(self, vt_symbol: str) -> ContractData | None:
         """查询合约信息"""
         return self.risk_engine.get_contract(vt_symbol)
 
+    def get_all_positions(self) -> list[PositionData]:
+        """查询所有持仓信息"""
+        return self.risk_engine.get_all_positions()
+
+    def get_all_accounts(self) -> list[AccountData]:
+        """查询所有资金信息"""
+        return self.risk_engine.get_all_accounts()
+
+    def get_shared_counter(self) -> Any:
+        """获取多进程共享计数器，未启用时返回None"""
+        return self.risk_engine.get_shared_counter()
+
     def put_event(self) -> None:
         """推送数据更新事件"""
         self.risk_engine.put_rule_event(self)
@@ -7,6 +7,8 @@ from vnpy.trader.object import (
     TickData,
     OrderData,
     TradeData,
+    PositionData,
+    AccountData,
     ContractData
 )
 
@@ -34,6 +36,9 @@ cdef class RuleTemplate:
         if hasattr(self.__class__, 'name') and isinstance(self.__class__.name, str):
             self.name = self.__class__.name
 
+        if hasattr(self.__class__, 'pure') and isinstance(self.__class__.pure, bool):
+            self.pure = self.__class__.pure
+
         if hasattr(self.__class__, 'parameters') and isinstance(self.__class__.parameters, dict):
             self.parameters.update(self.__class__.parameters)
 
@@ -71,10 +76,22 @@ cdef class RuleTemplate:
         """检查是否允许委托"""
         return True
 
+    cpdef object compile_check(self, str vt_symbol):
+        """编译合约专用的检查函数（折叠合约常量和规则参数），返回None时使用check_allowed"""
+        return None
+
     cpdef void on_init(self):
         """初始化（子类重写）"""
         pass
 
+    cpdef void on_send_order(self, object req, str vt_orderid):
+        """委托发出（检查通过后、调用网关前调用，vt_orderid为临时预占编号，用于预占计数）"""
+        pass
+
+    cpdef void on_send_result(self, object req, str reserve_id, str vt_orderid):
+        """委托发出结果（预占转到委托号，收到委托推送后再核对；vt_orderid为空表示发单失败或已由推送计数，需释放预占）"""
+        pass
+
     cpdef void on_tick(self, object tick):
         """行情推送"""
         pass
@@ -87,14 +104,38 @@ cdef class RuleTemplate:
         """成交推送"""
         pass
 
+    cpdef void on_position(self, object position):
+        """持仓推送"""
+        pass
+
+    cpdef void on_account(self, object account):
+        """资金推送"""
+        pass
+
     cpdef void on_timer(self):
         """定时推送（每秒触发）"""
         pass
 
+    cpdef double get_time(self):
+        """获取当前时间戳（秒，使用风控引擎时钟，回放时为模拟时间）"""
+        return self.risk_engine.get_time()
+
     cpdef object get_contract(self, str vt_symbol):
         """查询合约信息"""
         return self.risk_engine.get_contract(vt_symbol)
 
+    cpdef list get_all_positions(self):
+        """查询所有持仓信息"""
+        return self.risk_engine.get_all_positions()
+
+    cpdef list get_all_accounts(self):
+        """查询所有资金信息"""
+        return self.risk_engine.get_all_accounts()
+
+    cpdef object get_shared_counter(self):
+        """获取多进程共享计数器，未启用时返回None"""
+        return self.risk_engine.get_shared_counter()
+
     cpdef void put_event(self):
         """推送数据更新事件"""
         self.risk_engine.put_rule_event(self)
@@ -5,7 +5,244 @@ from vnpy.event import EventEngine, Event
 from vnpy.trader.engine import MainEngine
 from vnpy.trader.ui import QtWidgets, QtCore, QtGui
 
-from ..engine import RiskEngine, APP_NAME, EVENT_RISK_RULE, EVENT_RISK_NOTIFY
+from ..engine import RiskEngine, APP_NAME, EVENT_RISK_RULE, EVENT_RISK_NOTIFY, EVENT_RISK_HALT
+from ..utility import get_limit, get_utilization
+
+
+# 数据更新后重新排序的最小间隔（毫秒）
+SORT_INTERVAL: int = 1000
+
+
+class VariableModel(QtCore.QAbstractTableModel):
+    """
+    规则字典变量（按合约等分项统计）的表格模型
+
+    每个分项一行，更新时只对数值变化的行发出dataChanged信号，视图只绘制可见的行。
+    排序在模型内部用Python列表完成（代理模型只负责过滤），避免逐次比较都回调data函数；
+    数据更新只在排序列的数值变化或新增行时触发重新排序，并由定时器限制排序频率。
+    变量的上限参数按命名约定查找（见utility.get_limit），找到时计算使用率。
+    """
+
+    headers: list[str] = ["变量", "合约", "数值", "上限", "使用率"]
+
+    def __init__(self, risk_engine: RiskEngine) -> None:
+        """构造函数"""
+        super().__init__()
+
+        self.risk_engine: RiskEngine = risk_engine
+
+        # 每行数据：[变量名, 显示名称, 分项, 数值, 上限, 使用率]
+        self.rows: list[list] = []
+        self.row_map: dict[tuple[str, str], int] = {}
+
+        self.sort_column: int = -1
+        self.sort_order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder
+
+        self.sort_timer: QtCore.QTimer = QtCore.QTimer()
+        self.sort_timer.setSingleShot(True)
+        self.sort_timer.setInterval(SORT_INTERVAL)
+        self.sort_timer.timeout.connect(self.sort_rows)
+
+    def rowCount(self, parent: QtCore.QModelIndex | QtCore.QPersistentModelIndex | None = None) -> int:
+        """行数"""
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def columnCount(self, parent: QtCore.QModelIndex | QtCore.QPersistentModelIndex | None = None) -> int:
+        """列数"""
+        if parent is not None and parent.isValid():
+            return 0
+        return len(self.headers)
+
+    def headerData(
+        self,
+        section: int,
+        orientation: QtCore.Qt.Orientation,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        """表头"""
+        if orientation == QtCore.Qt.Orientation.Horizontal and role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(
+        self,
+        index: QtCore.QModelIndex | QtCore.QPersistentModelIndex,
+        role: int = QtCore.Qt.ItemDataRole.DisplayRole
+    ) -> Any:
+        """单元格数据（UserRole返回用于排序的原始值）"""
+        if not index.isValid():
+            return None
+
+        row: list = self.rows[index.row()]
+        column: int = index.column()
+
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            value: Any = row[column + 1]
+            if value is None:
+                return ""
+            elif column == 4:
+                return f"{value:.1%}"
+            elif isinstance(value, float):
+                return f"{value:,.2f}"
+            return str(value)
+        elif role == QtCore.Qt.ItemDataRole.ForegroundRole:
+            utilization: float | None = row[5]
+            if utilization is not None and utilization >= 0.8:
+                return QtGui.QColor("red")
+        elif role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
+            if column >= 2:
+                return QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
+
+        return None
+
+    def update_data(self, data: dict) -> None:
+        """更新规则数据（只通知变化的行）"""
+        parameters: dict = data["parameters"]
+
+        dict_variables: dict[str, dict] = {
+            field: value for field, value in data["variables"].items() if isinstance(value, dict)
+        }
+
+        # 分项被删除（如跨日清空）时重置模型
+        item_count: int = sum(len(value) for value in dict_variables.values())
+        if item_count < len(self.rows):
+            self.beginResetModel()
+            self.rows = []
+            self.row_map = {}
+            self.endResetModel()
+
+        new_rows: list[list] = []
+        changed: list[int] = []
+        resort: bool = False
+        sort_index: int = self.sort_column + 1
+
+        for field, value in dict_variables.items():
+            limit: Any = get_limit(field, parameters)
+
+            for key, v in value.items():
+                utilization: float | None = get_utilization(v, limit)
+
+                ix: int | None = self.row_map.get((field, key), None)
+                if ix is None:
+                    name: str = self.risk_engine.get_field_name(field)
+                    new_rows.append([field, name, str(key), v, limit, utilization])
+                    continue
+
+                row: list = self.rows[ix]
+                if row[3] != v or row[4] != limit:
+                    old_key: Any = row[sort_index]
+
+                    row[3] = v
+                    row[4] = limit
+                    row[5] = utilization
+
+                    changed.append(ix)
+                    resort = resort or row[sort_index] != old_key
+
+        # 按连续的行合并通知（使用率变化会影响整行颜色）
+        changed.sort()
+        start: int = 0
+        for i in range(1, len(changed) + 1):
+            if i == len(changed) or changed[i] != changed[i - 1] + 1:
+                self.dataChanged.emit(self.index(changed[start], 0), self.index(changed[i - 1], 4))
+                start = i
+
+        if new_rows:
+            count: int = len(self.rows)
+            self.beginInsertRows(QtCore.QModelIndex(), count, count + len(new_rows) - 1)
+
+            for i, row in enumerate(new_rows):
+                self.rows.append(row)
+                self.row_map[(row[0], row[2])] = count + i
+
+            self.endInsertRows()
+
+        if self.sort_column >= 0 and (new_rows or resort) and not self.sort_timer.isActive():
+            self.sort_timer.start()
+
+    def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder) -> None:
+        """设置排序列并排序"""
+        self.sort_column = column
+        self.sort_order = order
+
+        self.sort_timer.stop()
+        self.sort_rows()
+
+    def sort_rows(self) -> None:
+        """按排序列重排数据（顺序不变时不通知视图）"""
+        if self.sort_column < 0:
+            return
+
+        column: int = self.sort_column + 1
+        reverse: bool = self.sort_order == QtCore.Qt.SortOrder.DescendingOrder
+        rows: list[list] = sorted(self.rows, key=lambda row: get_sort_key(row[column]), reverse=reverse)
+
+        if all(a is b for a, b in zip(rows, self.rows, strict=True)):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+
+        old_indexes: list[QtCore.QModelIndex] = self.persistentIndexList()
+        old_keys: list[tuple[str, str]] = [(self.rows[ix.row()][0], self.rows[ix.row()][2]) for ix in old_indexes]
+
+        self.rows = rows
+        self.row_map = {(row[0], row[2]): i for i, row in enumerate(rows)}
+
+        new_indexes: list[QtCore.QModelIndex] = [
+            self.index(self.row_map[key], ix.column()) for key, ix in zip(old_keys, old_indexes, strict=True)
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+
+        self.layoutChanged.emit()
+
+
+class VariableFilterModel(QtCore.QSortFilterProxyModel):
+    """按变量、合约和最低使用率过滤的代理模型"""
+
+    def __init__(self, model: VariableModel) -> None:
+        """构造函数"""
+        super().__init__()
+
+        self.model: VariableModel = model
+        self.setSourceModel(model)
+
+        self.field: str = ""
+        self.symbol: str = ""
+        self.min_utilization: float = 0
+
+        self.setDynamicSortFilter(True)
+
+    def sort(self, column: int, order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder) -> None:
+        """排序交给源模型完成，代理模型保持源模型的顺序"""
+        self.model.sort(column, order)
+
+    def set_filter(self, field: str, symbol: str, min_utilization: float) -> None:
+        """设置过滤条件"""
+        self.field = field
+        self.symbol = symbol.lower()
+        self.min_utilization = min_utilization
+        self.invalidateRowsFilter()
+
+    def filterAcceptsRow(
+        self,
+        source_row: int,
+        source_parent: QtCore.QModelIndex | QtCore.QPersistentModelIndex
+    ) -> bool:
+        """过滤行"""
+        row: list = self.model.rows[source_row]
+
+        if self.field and row[0] != self.field:
+            return False
+
+        if self.symbol and self.symbol not in row[2].lower():
+            return False
+
+        if self.min_utilization and (row[5] is None or row[5] < self.min_utilization):
+            return False
+
+        return True
 
 
 class RuleWidget(QtWidgets.QGroupBox):
@@ -23,21 +260,62 @@ class RuleWidget(QtWidgets.QGroupBox):
         self.tree: QtWidgets.QTreeWidget = QtWidgets.QTreeWidget()
         self.items: dict[str, QtWidgets.QTreeWidgetItem] = {}
 
+        # 字典变量使用模型/视图显示（合约数量较多时只绘制可见的行）
+        self.model: VariableModel = VariableModel(risk_engine)
+        self.proxy: VariableFilterModel = VariableFilterModel(self.model)
+
         self.init_ui()
 
     def init_ui(self) -> None:
         """初始化UI界面"""
-        self.tree.setHeaderLabels(["分类", "名称", " ", " "])
+        self.tree.setHeaderLabels(["分类", "名称", " "])
         self.tree.setColumnWidth(0, 120)
         self.tree.setColumnWidth(1, 150)
         self.tree.setColumnWidth(2, 100)
-        self.tree.setColumnWidth(3, 100)
+
+        self.field_combo: QtWidgets.QComboBox = QtWidgets.QComboBox()
+        self.field_combo.addItem("全部变量", "")
+
+        self.symbol_line: QtWidgets.QLineEdit = QtWidgets.QLineEdit()
+        self.symbol_line.setPlaceholderText("合约过滤")
+
+        self.utilization_spin: QtWidgets.QDoubleSpinBox = QtWidgets.QDoubleSpinBox()
+        self.utilization_spin.setPrefix("使用率≥")
+        self.utilization_spin.setSuffix("%")
+        self.utilization_spin.setRange(0, 1000)
+        self.utilization_spin.setDecimals(0)
+
+        self.field_combo.currentIndexChanged.connect(self.update_filter)
+        self.symbol_line.textChanged.connect(self.update_filter)
+        self.utilization_spin.valueChanged.connect(self.update_filter)
+
+        self.view: QtWidgets.QTableView = QtWidgets.QTableView()
+        self.view.setModel(self.proxy)
+        self.view.setSortingEnabled(True)
+        self.view.sortByColumn(4, QtCore.Qt.SortOrder.DescendingOrder)
+        self.view.verticalHeader().setVisible(False)
+        self.view.verticalHeader().setDefaultSectionSize(20)
+        self.view.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.view.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+
+        filter_hbox: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
+        filter_hbox.addWidget(self.field_combo)
+        filter_hbox.addWidget(self.symbol_line)
+        filter_hbox.addWidget(self.utilization_spin)
+
+        self.variable_widget: QtWidgets.QWidget = QtWidgets.QWidget()
+        variable_vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
+        variable_vbox.setContentsMargins(0, 0, 0, 0)
+        variable_vbox.addLayout(filter_hbox)
+        variable_vbox.addWidget(self.view)
+        self.variable_widget.setLayout(variable_vbox)
 
         editor_button: QtWidgets.QPushButton = QtWidgets.QPushButton("修改风控参数")
         editor_button.clicked.connect(self.open_editor)
 
         vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
         vbox.addWidget(self.tree)
+        vbox.addWidget(self.variable_widget)
         vbox.addWidget(editor_button)
         self.setLayout(vbox)
 
@@ -51,22 +329,19 @@ class RuleWidget(QtWidgets.QGroupBox):
             item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(parameter_root, ["", name, str(value)])
             self.items[field] = item
 
-        # 变量部分
+        # 变量部分（字典变量只显示分项数量，明细在下方表格中显示）
         variable_root = QtWidgets.QTreeWidgetItem(self.tree, ["变量"])
         variables: dict = data["variables"]
         for field, value in variables.items():
             name = self.risk_engine.get_field_name(field)
+            item = QtWidgets.QTreeWidgetItem(variable_root, ["", name, format_variable(value)])
+            self.items[field] = item
 
             if isinstance(value, dict):
-                item = QtWidgets.QTreeWidgetItem(variable_root, ["", name])
-                self.items[field] = item
+                self.field_combo.addItem(name, field)
 
-                for k, v in value.items():
-                    sub_item: QtWidgets.QTreeWidgetItem = QtWidgets.QTreeWidgetItem(item, ["", "", k, str(v)])
-                    self.items[f"{field}.{k}"] = sub_item
-            else:
-                item = QtWidgets.QTreeWidgetItem(variable_root, ["", name, str(value)])
-                self.items[field] = item
+        self.tree.expandAll()
+        self.variable_widget.setVisible(self.field_combo.count() > 1)
 
     def update_data(self, data: dict) -> None:
         """更新规则数据"""
@@ -78,28 +353,25 @@ class RuleWidget(QtWidgets.QGroupBox):
         parameters: dict = data["parameters"]
 
         for field, value in parameters.items():
-            item: QtWidgets.QTreeWidgetItem = self.items.get(field)
+            item: QtWidgets.QTreeWidgetItem = self.items[field]
             item.setText(2, str(value))
 
         # 变量部分
         variables: dict = data["variables"]
 
         for field, value in variables.items():
-            if isinstance(value, dict):
-                item = self.items[field]
-
-                for k, v in value.items():
-                    sub_item: QtWidgets.QTreeWidgetItem = self.items.get(f"{field}.{k}")
-                    if sub_item:
-                        sub_item.setText(3, str(v))
-                    else:
-                        sub_item = QtWidgets.QTreeWidgetItem(item, ["", "", k, str(v)])
-                        self.items[f"{field}.{k}"] = sub_item
-            else:
-                item = self.items[field]
-                item.setText(2, str(value))
+            item = self.items[field]
+            item.setText(2, format_variable(value))
 
-        self.tree.expandAll()
+        self.model.update_data(data)
+
+    def update_filter(self) -> None:
+        """更新表格过滤条件"""
+        self.proxy.set_filter(
+            self.field_combo.currentData(),
+            self.symbol_line.text(),
+            self.utilization_spin.value() / 100
+        )
 
     def open_editor(self) -> None:
         """打开参数编辑对话框"""
@@ -112,7 +384,12 @@ class RuleWidget(QtWidgets.QGroupBox):
 
         if result == QtWidgets.QDialog.DialogCode.Accepted:
             rule_setting: dict = dialog.get_setting()
-            self.risk_engine.update_rule_setting(self.rule_name, rule_setting)
+
+            # 参数不合法时规则保留原参数，提示错误信息
+            try:
+                self.risk_engine.update_rule_setting(self.rule_name, rule_setting)
+            except ValueError as e:
+                QtWidgets.QMessageBox.warning(self, "参数错误", str(e))
 
 
 class RuleEditor(QtWidgets.QDialog):
@@ -205,6 +482,7 @@ class RiskManager(QtWidgets.QWidget):
 
     signal_rule: QtCore.Signal = QtCore.Signal(Event)
     signal_notify: QtCore.Signal = QtCore.Signal(Event)
+    signal_halt: QtCore.Signal = QtCore.Signal(Event)
 
     def __init__(self, main_engine: MainEngine, event_engine: EventEngine) -> None:
         """构造函数"""
@@ -242,8 +520,28 @@ class RiskManager(QtWidgets.QWidget):
         splitter.addWidget(self.list_widget)
         splitter.addWidget(self.stacked_widget)
 
+        self.halt_label: QtWidgets.QLabel = QtWidgets.QLabel()
+        self.update_halt_label(self.rm_engine.halted, self.rm_engine.halt_reason)
+
+        halt_button: QtWidgets.QPushButton = QtWidgets.QPushButton("暂停交易")
+        halt_button.clicked.connect(lambda: self.halt(False))
+
+        halt_cancel_button: QtWidgets.QPushButton = QtWidgets.QPushButton("暂停交易并全撤")
+        halt_cancel_button.clicked.connect(lambda: self.halt(True))
+
+        resume_button: QtWidgets.QPushButton = QtWidgets.QPushButton("恢复交易")
+        resume_button.clicked.connect(self.rm_engine.resume)
+
+        hbox: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
+        hbox.addWidget(self.halt_label)
+        hbox.addStretch()
+        hbox.addWidget(halt_button)
+        hbox.addWidget(halt_cancel_button)
+        hbox.addWidget(resume_button)
+
         vbox: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout()
         vbox.addWidget(splitter)
+        vbox.addLayout(hbox)
         self.setLayout(vbox)
 
         self.list_widget.currentRowChanged.connect(self.stacked_widget.setCurrentIndex)
@@ -262,9 +560,11 @@ class RiskManager(QtWidgets.QWidget):
         """注册事件监听"""
         self.signal_rule.connect(self.process_rule_event)
         self.signal_notify.connect(self.process_notify_event)
+        self.signal_halt.connect(self.process_halt_event)
 
         self.event_engine.register(EVENT_RISK_RULE, self.signal_rule.emit)
         self.event_engine.register(EVENT_RISK_NOTIFY, self.signal_notify.emit)
+        self.event_engine.register(EVENT_RISK_HALT, self.signal_halt.emit)
 
     def process_rule_event(self, event: Event) -> None:
         """定时更新所有规则控件的监控变量"""
@@ -285,3 +585,46 @@ class RiskManager(QtWidgets.QWidget):
             QtWidgets.QSystemTrayIcon.MessageIcon.Critical,
             30000    # 30秒
         )
+
+    def process_halt_event(self, event: Event) -> None:
+        """更新全局暂停交易状态"""
+        data: dict = event.data
+        self.update_halt_label(data["halted"], data["reason"])
+
+    def update_halt_label(self, halted: bool, reason: str) -> None:
+        """更新交易状态显示"""
+        if halted:
+            self.halt_label.setText(f"交易状态：已暂停（{reason}）")
+            self.halt_label.setStyleSheet("color:red")
+        else:
+            self.halt_label.setText("交易状态：正常")
+            self.halt_label.setStyleSheet("")
+
+    def halt(self, cancel_orders: bool) -> None:
+        """手动全局暂停交易"""
+        reply = QtWidgets.QMessageBox.question(
+            self,
+            "暂停交易",
+            "确认全局暂停交易？暂停后所有委托都将被拦截。",
+            QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No,
+            QtWidgets.QMessageBox.StandardButton.No
+        )
+
+        if reply == QtWidgets.QMessageBox.StandardButton.Yes:
+            self.rm_engine.halt("手动暂停", cancel_orders)
+
+
+def format_variable(value: Any) -> str:
+    """格式化树状图中的变量（字典变量显示分项数量）"""
+    if isinstance(value, dict):
+        return f"{len(value)}项"
+    return str(value)
+
+
+def get_sort_key(value: Any) -> tuple:
+    """排序键（空值排在最小，数值和文本分开比较）"""
+    if value is None:
+        return (0, 0)
+    elif isinstance(value, int | float):
+        return (1, value)
+    return (2, str(value))
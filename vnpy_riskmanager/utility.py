@@ -0,0 +1,115 @@
+import os
+import json
+import traceback
+from time import monotonic
+from pathlib import Path
+from threading import Thread, Condition
+from collections.abc import Callable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from vnpy.trader.utility import get_file_path
+
+
+class SettingWriter:
+    """
+    配置文件后台写入器
+
+    保存请求在后台线程中执行：一段时间内的多次保存合并为一次写入（只写入最新数据），
+    写入时先输出到临时文件再原子替换，避免写入中途退出导致配置文件损坏。
+    """
+
+    def __init__(self, delay: float = 0.5, on_error: Callable[[str], None] | None = None) -> None:
+        """构造函数（delay为最后一次保存请求后等待的秒数）"""
+        self.delay: float = delay
+        self.on_error: Callable[[str], None] | None = on_error
+
+        self.pending: dict[str, dict] = {}
+        self.last_time: float = 0
+        self.write_count: int = 0
+
+        self.active: bool = True
+        self.condition: Condition = Condition()
+
+        self.thread: Thread = Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def save(self, filename: str, data: dict) -> None:
+        """请求保存配置（立即返回，data在写入前不应再被修改）"""
+        with self.condition:
+            self.pending[filename] = data
+            self.last_time = monotonic()
+            self.condition.notify()
+
+    def run(self) -> None:
+        """写入线程"""
+        while True:
+            with self.condition:
+                while self.active and not self.pending:
+                    self.condition.wait()
+
+                # 等待保存请求停止一段时间后再写入（停止时立即写入）
+                while self.active:
+                    remaining: float = self.last_time + self.delay - monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+
+                pending: dict[str, dict] = self.pending
+                self.pending = {}
+
+                if not pending and not self.active:
+                    return
+
+            for filename, data in pending.items():
+                self.write(filename, data)
+
+    def write(self, filename: str, data: dict) -> None:
+        """写入到临时文件后原子替换目标文件"""
+        filepath: Path = get_file_path(filename)
+        temp_path: Path = filepath.with_name(filepath.name + ".tmp")
+
+        try:
+            with open(temp_path, mode="w", encoding="UTF-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(temp_path, filepath)
+            self.write_count += 1
+        except Exception:
+            if self.on_error:
+                self.on_error(f"配置文件{filename}保存失败：{traceback.format_exc()}")
+
+    def close(self) -> None:
+        """写入全部待保存的配置后停止线程"""
+        with self.condition:
+            self.active = False
+            self.condition.notify()
+
+        self.thread.join()
+
+
+def get_limit(field: str, parameters: dict) -> Any:
+    """按命名约定查找变量对应的上限参数（xxx_count对应xxx_limit，其他变量xxx对应xxx_limit），找不到时返回None"""
+    for name in [field.replace("_count", "_limit"), field + "_limit"]:
+        limit: Any = parameters.get(name, None)
+        if isinstance(limit, int | float) and not isinstance(limit, bool):
+            return limit
+    return None
+
+
+def get_utilization(value: Any, limit: Any) -> float | None:
+    """计算使用率（没有上限或上限不为正数时返回None）"""
+    if limit is None or limit <= 0 or not isinstance(value, int | float):
+        return None
+    return float(abs(value) / limit)
+
+
+def get_trading_day(dt: datetime) -> date:
+    """获取时间所属的交易日（20点后的夜盘归属下一交易日，周末顺延到周一）"""
+    if dt.hour >= 20:
+        dt += timedelta(days=1)
+    while dt.weekday() >= 5:
+        dt += timedelta(days=1)
+    return dt.date()
@@ -0,0 +1,86 @@
+from collections import deque
+from typing import Any
+
+
+# 降级策略
+POLICY_DISABLE: str = "disable"     # 停用规则（放行）
+POLICY_SHADOW: str = "shadow"       # 停用规则并转为影子规则继续评估（放行）
+POLICY_REJECT: str = "reject"       # 拦截该规则检查的所有委托
+
+POLICY_NAMES: dict[str, str] = {
+    POLICY_DISABLE: "停用",
+    POLICY_SHADOW: "转为影子规则",
+    POLICY_REJECT: "拦截委托",
+}
+
+POLICIES: set[str] = set(POLICY_NAMES)
+
+
+class LatencyWatchdog:
+    """
+    规则检查耗时看门狗
+
+    记录每个规则单次检查超出耗时预算的次数，同一规则在时间窗口内超时次数达到上限时判定需要降级。
+    只统计超时的检查，未超时时除计时外没有额外开销。
+    """
+
+    def __init__(self, budget: float, breach_limit: int, breach_window: float, policy: str) -> None:
+        """构造函数（budget为微秒，breach_window为秒）"""
+        if policy not in POLICIES:
+            raise ValueError(f"不支持的降级策略：{policy}")
+
+        self.budget: int = int(budget * 1000)
+        self.breach_limit: int = breach_limit
+        self.breach_window: float = breach_window
+        self.policy: str = policy
+
+        # 规则名称：最近的超时时间
+        self.breach_times: dict[str, deque[float]] = {}
+
+        # 统计数据
+        self.breach_counts: dict[str, int] = {}
+        self.max_latencies: dict[str, int] = {}
+
+        # 已降级规则：规则名称 -> 降级策略
+        self.demoted_rules: dict[str, str] = {}
+
+    def add_breach(self, rule_name: str, latency: int, timestamp: float) -> bool:
+        """记录一次超时（latency为纳秒，timestamp为秒），返回是否需要降级"""
+        self.breach_counts[rule_name] = self.breach_counts.get(rule_name, 0) + 1
+        self.max_latencies[rule_name] = max(self.max_latencies.get(rule_name, 0), latency)
+
+        if rule_name in self.demoted_rules:
+            return False
+
+        times: deque[float] | None = self.breach_times.get(rule_name, None)
+        if times is None:
+            times = deque(maxlen=self.breach_limit)
+            self.breach_times[rule_name] = times
+        times.append(timestamp)
+
+        return len(times) >= self.breach_limit and timestamp - times[0] <= self.breach_window
+
+    def demote(self, rule_name: str) -> str:
+        """标记规则已降级，返回降级策略"""
+        self.demoted_rules[rule_name] = self.policy
+        self.breach_times.pop(rule_name, None)
+        return self.policy
+
+    def restore(self, rule_name: str) -> str | None:
+        """取消规则的降级标记，返回原降级策略"""
+        self.breach_times.pop(rule_name, None)
+        return self.demoted_rules.pop(rule_name, None)
+
+    def is_rejected(self, rule_name: str) -> bool:
+        """规则是否已按拦截策略降级"""
+        return self.demoted_rules.get(rule_name, "") == POLICY_REJECT
+
+    def get_stats(self) -> dict[str, Any]:
+        """获取统计数据"""
+        return {
+            "budget": self.budget / 1000,
+            "policy": self.policy,
+            "breach_counts": dict(self.breach_counts),
+            "max_latencies": {name: latency / 1000 for name, latency in self.max_latencies.items()},
+            "demoted_rules": dict(self.demoted_rules),
+        }